@@ -0,0 +1,187 @@
+"""
+End-to-end mission benchmark, fully offline.
+
+    python3 -m benchmarks.missions --repeat 3 --workers 1
+    python3 -m benchmarks.missions --baseline benchmarks/results/<earlier>.json
+
+Starts local stand-ins for every external service (an OpenAI-compatible LLM
+with a fixed latency and token rate, the LocalRecall API and a page server
+for scraping), points Skyscope at them and drives SwarmOrchestrator through
+a set of representative missions via the batch runner. Reports per-phase
+p50/p95, throughput and peak memory, and saves the results as JSON under
+benchmarks/results/ (tagged with the git commit) so runs can be compared.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from skyscope.agents.batch import BatchRunner
+from skyscope.agents.orchestrator import SwarmOrchestrator
+from skyscope.utils.config import Config
+from skyscope.utils.telemetry import telemetry
+
+from .standins import StandInServer, make_llm_handler, make_recall_handler
+
+MIN_DELTA_S = 0.02 # Timing changes below this are noise, whatever the percentage
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+MISSIONS = [
+    "Assess the impact of new trade sanctions on the Eurozone",
+    "Generate a report based on the latest headlines from {pages}/news/red-sea-shipping and {pages}/news/energy-corridors",
+    "Analyze the geopolitical stability of the South China Sea using {pages}/analysis/naval-patrols?delay=0.3",
+    "Project freight insurance costs if convoy escorts are withdrawn",
+]
+
+INTEL_DOCS = {
+    "port_capacity.txt": "Port capacity utilisation across the corridor rose for the third quarter. " * 40,
+    "sanctions_memo.txt": "Secondary sanctions target insurers and re-flagged tankers. " * 40,
+    "convoy_log.txt": "Escort rotations were shortened as patrol coverage expanded. " * 40,
+}
+
+
+def configure(**settings):
+    """Sets Config values for this process and, via the environment, for spawned artifact workers."""
+    for key, value in settings.items():
+        setattr(Config, key, value)
+        os.environ[key] = str(int(value) if isinstance(value, bool) else value)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(RESULTS_DIR), check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def peak_rss_mb(who=resource.RUSAGE_SELF) -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(who).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run(args) -> dict:
+    llm = StandInServer(make_llm_handler(args.latency, args.tokens_per_second, args.completion_tokens))
+    recall = StandInServer(make_recall_handler(args.search_delay))
+    pages = StandInServer()
+    cwd = os.getcwd()
+    with llm, recall, pages, tempfile.TemporaryDirectory(prefix="skyscope-bench-") as work:
+        # Relative paths (caches, manifests, artifacts) all land in the scratch directory
+        os.chdir(work)
+        intel = os.path.join(work, "intel")
+        os.makedirs(intel)
+        for name, text in INTEL_DOCS.items():
+            with open(os.path.join(intel, name), "w") as f:
+                f.write(text)
+
+        configure(
+            ROUTER_PROVIDERS="localai", LOCALAI_BASE_URL=f"{llm.base_url}/v1", ROUTER_PROBE_INTERVAL=0,
+            RECALL_BACKEND="localrecall", LOCALRECALL_BASE_URL=f"{recall.base_url}/api",
+            LLM_CACHE_ENABLED=args.warm_caches, CONTENT_CACHE_TTL=Config.CONTENT_CACHE_TTL if args.warm_caches else 0,
+            ARTIFACTS_IN_BACKGROUND=True, TTS_WORKERS=1,
+        )
+        os.environ.pop("ELEVENLABS_API_KEY", None)
+
+        missions = [{"id": f"m{n}-r{r}", "instruction": text.format(pages=pages.base_url)}
+                    for r in range(args.repeat) for n, text in enumerate(MISSIONS)]
+        orchestrator = SwarmOrchestrator(docs_path=intel, generate_video=args.video)
+        if args.tracemalloc:
+            tracemalloc.start()
+        summary = BatchRunner(orchestrator, workers=args.workers,
+                              results_path=os.path.join(work, "records.jsonl")).run(missions)
+        python_peak = tracemalloc.get_traced_memory()[1] / 1e6 if args.tracemalloc else None
+        orchestrator.shutdown()
+        os.chdir(cwd)
+
+    snap = telemetry.snapshot()
+    return {
+        "benchmark": "missions",
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("baseline", "out")},
+        "summary": summary,
+        "peak_rss_mb": peak_rss_mb(),
+        "peak_worker_rss_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+        "python_heap_peak_mb": python_peak,
+        "tokens": {"prompt": snap["tokens_prompt"], "completion": snap["tokens_completion"]},
+        "bytes_fetched": snap["bytes_fetched"],
+    }
+
+
+def headline(result: dict) -> dict:
+    """Flat {metric: seconds or rate} used for printing and comparisons."""
+    summary = result["summary"]
+    metrics = {"mission p50": summary["mission_p50_s"], "mission p95": summary["mission_p95_s"]}
+    for phase, stats in summary["phases"].items():
+        metrics[f"{phase} p50"] = stats["p50"]
+        metrics[f"{phase} p95"] = stats["p95"]
+    metrics["missions/hour"] = summary["missions_per_hour"]
+    metrics["peak RSS MB"] = result["peak_rss_mb"]
+    return metrics
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> bool:
+    """Prints metric deltas against a baseline run. Returns False on any regression beyond `tolerance`."""
+    current, previous = headline(result), headline(baseline)
+    print(f"\nAgainst {baseline['commit']} ({baseline['timestamp']}):")
+    changed = {key for key, value in result["settings"].items() if baseline["settings"].get(key) != value}
+    if changed:
+        print(f"  [note] settings differ: {', '.join(sorted(changed))}")
+    ok = True
+    for metric, value in current.items():
+        before = previous.get(metric)
+        if not before:
+            continue
+        change = (value - before) / before
+        # Throughput regresses downwards; times and memory upwards
+        worse = -change if metric == "missions/hour" else change
+        timing = metric.endswith(("p50", "p95"))
+        flag = "  REGRESSION" if worse > tolerance and not (timing and abs(value - before) < MIN_DELTA_S) else ""
+        ok = ok and not flag
+        print(f"  {metric:<18} {before:10.3f} -> {value:10.3f}  ({change:+.1%}){flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2, help="passes over the mission set")
+    parser.add_argument("--workers", type=int, default=1, help="concurrent missions")
+    parser.add_argument("--latency", type=float, default=0.2, help="stand-in LLM time to first token (s)")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    parser.add_argument("--search-delay", type=float, default=0.05, help="stand-in LocalRecall search latency (s)")
+    parser.add_argument("--video", action="store_true", help="also render video briefings")
+    parser.add_argument("--warm-caches", action="store_true", help="keep the LLM and page caches enabled")
+    parser.add_argument("--tracemalloc", action="store_true", help="track the Python heap peak (slower)")
+    parser.add_argument("--out", help="results file (default: benchmarks/results/missions-<time>-<commit>.json)")
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown before flagging")
+    args = parser.parse_args()
+
+    result = run(args)
+    print(f"\nPeak RSS {result['peak_rss_mb']:.0f} MB (artifact workers {result['peak_worker_rss_mb']:.0f} MB); "
+          f"{result['tokens']['prompt']:.0f} prompt / {result['tokens']['completion']:.0f} completion tokens.")
+
+    out = args.out or os.path.join(RESULTS_DIR, f"missions-{time.strftime('%Y%m%d-%H%M%S')}-{result['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"Results saved to {out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            if not compare(result, json.load(f), args.tolerance):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Embedded model acquisition: concurrent vs. serial downloads, resume after an
+interrupted transfer, and the startup stamp check.
+
+    python3 -m benchmarks.model_download --size-mb 64 --mbps 200
+
+Two synthetic "models" are served from a throttled local stand-in that
+publishes their size and SHA-256 the way Hugging Face does.
+"""
+import argparse
+import hashlib
+import os
+import tempfile
+import time
+
+from benchmarks.standins import StandInServer, make_file_handler
+from skyscope.utils.model_loader import digest_of, ensure_models_exist, missing_models
+
+
+def models_for(base_url: str, count: int) -> dict:
+    return {
+        f"model{n}": {"url": f"{base_url}/resolve/main/model{n}.gguf",
+                      "filename": f"model{n}.gguf", "desc": f"Synthetic model {n}"}
+        for n in range(count)
+    }
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"  {label:<24} {time.perf_counter() - start:8.3f}s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=float, default=32)
+    parser.add_argument("--mbps", type=float, default=100, help="per-connection throttle (MB/s)")
+    parser.add_argument("--models", type=int, default=2)
+    args = parser.parse_args()
+
+    payload = os.urandom(int(args.size_mb * 1024 * 1024))
+    rate = args.mbps * 1024 * 1024
+    print(f"{args.models} model(s) of {args.size_mb:.0f} MB at {args.mbps:.0f} MB/s per connection:")
+
+    for label, workers in (("serial", 1), ("concurrent", args.models)):
+        with StandInServer(make_file_handler(payload, bytes_per_second=rate)) as server, \
+                tempfile.TemporaryDirectory(prefix="skyscope-bench-") as work:
+            results = timed(label, lambda: ensure_models_exist(models_for(server.base_url, args.models),
+                                                               work, workers=workers))
+            assert all(results.values()), results
+
+    # Interrupted halfway, then resumed from the .part file
+    with StandInServer(make_file_handler(payload, cut_after=len(payload) // 2, bytes_per_second=rate)) as server, \
+            tempfile.TemporaryDirectory(prefix="skyscope-bench-") as work:
+        models = models_for(server.base_url, 1)
+        first = timed("interrupted", lambda: ensure_models_exist(models, work))
+        part = os.path.join(work, "model0.gguf.part")
+        print(f"  {'':<24} ok={first['model0']}, .part holds {os.path.getsize(part) / 1e6:.1f} MB")
+        resumed = timed("resumed", lambda: ensure_models_exist(models, work))
+        assert resumed["model0"] and digest_of(os.path.join(work, "model0.gguf")) == hashlib.sha256(payload).hexdigest()
+
+        timed("startup stamp check", lambda: missing_models(models, work))
+        assert not missing_models(models, work)
+
+        # Corrupt in place: the stamp no longer matches, so it is re-verified and re-fetched
+        with open(os.path.join(work, "model0.gguf"), "r+b") as f:
+            f.truncate(len(payload) // 3)
+        assert missing_models(models, work) == ["model0"]
+        timed("repair truncated", lambda: ensure_models_exist(models, work))
+        assert not missing_models(models, work)
+
+
+if __name__ == "__main__":
+    main()
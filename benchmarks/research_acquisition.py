@@ -0,0 +1,64 @@
+"""
+Serial vs. concurrent source acquisition against a local page server.
+
+    python3 -m benchmarks.research_acquisition --sources 15 --max-delay 1.5
+
+Wall-clock for the concurrent stage should track the slowest source rather
+than the sum of all of them. All stand-in pages share one host, so the
+per-host limit defaults to the source count here; pass --per-host-limit to
+see the effect of politeness limits.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from skyscope.agents.researcher import ResearcherAgent
+from skyscope.utils.acquisition import SourceFetcher
+from skyscope.utils.content_cache import ContentCache
+from skyscope.utils.crawler import Crawler
+
+from .standins import StandInServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sources", type=int, default=15)
+    parser.add_argument("--max-delay", type=float, default=1.5)
+    parser.add_argument("--per-host-limit", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    delays = [round(rng.uniform(0.1, args.max_delay), 2) for _ in range(args.sources)]
+
+    with StandInServer() as server, tempfile.TemporaryDirectory(prefix="skyscope-bench-") as work:
+        urls = [f"{server.base_url}/article-{i}?delay={d}" for i, d in enumerate(delays)]
+        agent = ResearcherAgent(docs_path=None)
+
+        def fresh_cache(name: str):
+            # Each pass downloads every page: a shared (or persistent) cache would serve the second one
+            agent.cache = ContentCache(path=os.path.join(work, f"{name}.sqlite3"))
+            # One stand-in host: the crawler's per-host request spacing would serialize everything
+            agent.crawler = Crawler(cache=agent.cache, domain_delay=0,
+                                    per_host_limit=args.per_host_limit or args.sources)
+
+        fresh_cache("serial")
+        start = time.perf_counter()
+        serial = [agent._acquire_source(url) for url in urls]
+        serial_s = time.perf_counter() - start
+
+        fresh_cache("concurrent")
+        agent.fetcher = SourceFetcher(per_host_limit=args.per_host_limit or args.sources)
+        start = time.perf_counter()
+        concurrent = agent.fetcher.fetch_all(urls, agent._acquire_source)
+        concurrent_s = time.perf_counter() - start
+
+    print(f"sources={args.sources} sum(delays)={sum(delays):.2f}s max(delay)={max(delays):.2f}s")
+    print(f"serial:     {serial_s:6.2f}s  ({sum(1 for r in serial if r)} results)")
+    print(f"concurrent: {concurrent_s:6.2f}s  ({len(concurrent)} results)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Local stand-ins for the external services Skyscope talks to, so benchmarks
+can run offline and produce comparable numbers between commits.
+"""
+import hashlib
+import io
+import json
+import re
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+ARTICLE_TEMPLATE = """<html><head><title>{title}</title></head>
+<body><article><h1>{title}</h1>
+{paragraphs}
+</article></body></html>"""
+
+
+def make_article(title: str, paragraphs: int = 12) -> str:
+    body = "\n".join(
+        f"<p>{title}: paragraph {i} on trade corridors, sanctions, energy markets "
+        f"and regional security alignments observed over the reporting period.</p>"
+        for i in range(paragraphs)
+    )
+    return ARTICLE_TEMPLATE.format(title=title, paragraphs=body)
+
+
+class _PageHandler(BaseHTTPRequestHandler):
+    """Serves synthetic articles. `?delay=<seconds>` simulates a slow origin."""
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        try:
+            delay = float(parse_qs(parts.query).get("delay", ["0"])[0])
+        except ValueError:
+            delay = 0.0
+        if delay:
+            time.sleep(delay)
+        payload = make_article(parts.path.strip("/") or "index").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """Runs a handler on an ephemeral localhost port in a daemon thread."""
+
+    def __init__(self, handler_cls=_PageHandler):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler_cls)
+        self.httpd.daemon_threads = True
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def make_file_handler(payload: bytes, cut_after: int = None, bytes_per_second: float = None):
+    """
+    Serves `payload` at any path like a Hugging Face `resolve/` URL: HEAD
+    answers with X-Linked-Size / X-Linked-Etag (the SHA-256), GET honours
+    `Range: bytes=N-`. `cut_after` drops the first full download after that
+    many bytes (an interrupted fetch); `bytes_per_second` throttles the link.
+    """
+    sha256 = hashlib.sha256(payload).hexdigest()
+    state = {"cut": cut_after}
+
+    class _FileHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_HEAD(self):
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.send_header("X-Linked-Size", str(len(payload)))
+            self.send_header("X-Linked-Etag", f'"{sha256}"')
+            self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+
+        def do_GET(self):
+            start = 0
+            ranged = self.headers.get("Range", "")
+            if ranged.startswith("bytes="):
+                start = int(ranged[len("bytes="):].split("-")[0])
+                if start >= len(payload):
+                    self.send_response(416)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{len(payload) - 1}/{len(payload)}")
+            else:
+                self.send_response(200)
+            body = payload[start:]
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+
+            limit, state["cut"] = state["cut"], None
+            step = 256 * 1024
+            for offset in range(0, len(body), step):
+                piece = body[offset:offset + step]
+                if limit is not None and offset + len(piece) > limit:
+                    self.wfile.write(piece[:max(0, limit - offset)])
+                    self.close_connection = True
+                    return
+                self.wfile.write(piece)
+                if bytes_per_second:
+                    time.sleep(len(piece) / bytes_per_second)
+
+        def log_message(self, format, *args):
+            pass
+
+    return _FileHandler
+
+
+FILLER = ("corridor sanctions freight insurers tariffs alignment escalation reserves pipeline "
+          "convoy deterrence liquidity embargo shipping treaty mobilization").split()
+URL_PATTERN = re.compile(r"https?://[^\s\"'<>)]+")
+
+
+def make_llm_handler(latency: float = 0.2, tokens_per_second: float = 200.0, completion_tokens: int = 120):
+    """
+    OpenAI-compatible chat endpoint (`/v1/chat/completions`, streaming and
+    not) with a fixed time to first token and a steady token rate. Planner
+    prompts get a JSON blueprint that carries any URLs in the prompt through
+    to the research directives; everything else gets filler prose.
+    `/v1/audio/speech` returns silent WAV narration (~15 characters/second).
+    """
+
+    class _LLMHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self._send_json({"object": "list", "data": [{"id": "stand-in", "object": "model"}]})
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if self.path.endswith("/audio/speech"):
+                return self._send(200, "audio/wav", silent_wav(min(60.0, len(body.get("input", "")) / 15.0)))
+
+            messages = body.get("messages", [])
+            prompt = " ".join(str(m.get("content", "")) for m in messages)
+            tokens = self._completion(messages, prompt)
+            time.sleep(latency)
+            if not body.get("stream"):
+                time.sleep(len(tokens) / tokens_per_second)
+                return self._send_json({"choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)}}],
+                                        "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(tokens)}})
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            try:
+                for token in tokens:
+                    chunk = {"choices": [{"index": 0, "delta": {"content": token}}]}
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    time.sleep(1.0 / tokens_per_second)
+                self.wfile.write(b"data: [DONE]\n\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass # Client stopped reading (a cancelled mission)
+
+        def _completion(self, messages, prompt):
+            if any("JSON" in str(m.get("content", "")) for m in messages if m.get("role") == "system"):
+                blueprint = {"mission_name": "Stand-in Directive",
+                             "research_directives": " ".join(["regional shipping risk"] + URL_PATTERN.findall(prompt)),
+                             "simulation_focus": "freight costs"}
+                return [json.dumps(blueprint)]
+            return [f"{FILLER[i % len(FILLER)]}{'.' if i % 12 == 11 else ''} " for i in range(completion_tokens)]
+
+        def _send_json(self, payload):
+            self._send(200, "application/json", json.dumps(payload).encode("utf-8"))
+
+        def _send(self, status, content_type, payload: bytes):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return _LLMHandler
+
+
+def silent_wav(seconds: float, rate: int = 16000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\x00\x00" * int(max(0.5, seconds) * rate))
+    return buffer.getvalue()
+
+
+def make_recall_handler(search_delay: float = 0.05, passage_words: int = 80):
+    """
+    LocalRecall API stand-in: collections, multipart uploads (only the file
+    name and size are kept), entry deletes and a search that returns
+    synthetic passages naming the uploaded files.
+    """
+    collections = {}
+    lock = threading.Lock()
+
+    class _RecallHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            with lock:
+                self._send_json(sorted(collections))
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            parts = self.path.rstrip("/").split("/")
+            if parts[-1] == "collections":
+                with lock:
+                    collections.setdefault(json.loads(body)["name"], {})
+                return self._send_json({"status": "created"}, 201)
+            name = parts[-2]
+            if parts[-1] == "upload":
+                match = re.search(rb'filename="([^"]+)"', body)
+                with lock:
+                    collections.setdefault(name, {})[(match.group(1) if match else b"upload").decode()] = len(body)
+                return self._send_json({"status": "uploaded"})
+            if parts[-1] == "search":
+                query = json.loads(body)
+                time.sleep(search_delay)
+                with lock:
+                    files = sorted(collections.get(name, {})) or ["archive.txt"]
+                results = [{"content": f"{query['query']}: " + " ".join(FILLER[(i + j) % len(FILLER)] for j in range(passage_words)),
+                            "metadata": {"source": files[i % len(files)]}}
+                           for i in range(query.get("max_results", 5))]
+                return self._send_json(results)
+            self._send_json({"error": "not found"}, 404)
+
+        def do_DELETE(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            with lock:
+                collections.get(self.path.split("/")[-3], {}).pop(body.get("entry"), None)
+            self._send_json({"status": "deleted"})
+
+        def _send_json(self, payload, status=200):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return _RecallHandler
@@ -0,0 +1,65 @@
+"""
+Video briefing encode time: still-frame slides vs. the per-frame moviepy path.
+
+    python3 -m benchmarks.video_encoding --seconds 180
+
+Both paths encode the same synthetic narration (a quiet tone, MP3) so only
+the video side differs. TTS is not involved.
+"""
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+
+from skyscope.video.generator import render_moviepy
+from skyscope.video.stills import encode_stills, ffmpeg_exe, render_slides
+
+TRAJECTORY = (
+    "Scenario {n}: Regional shipping insurers reprice risk as naval patrols expand, "
+    "pushing freight costs higher and accelerating alternative overland corridors. "
+)
+
+
+def synthetic_narration(path: str, seconds: float):
+    subprocess.run([ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y",
+                    "-f", "lavfi", "-i", f"sine=frequency=220:duration={seconds}",
+                    "-c:a", "libmp3lame", "-b:a", "64k", path], check=True)
+
+
+def timed(label: str, fn) -> float:
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<10} {elapsed:8.2f}s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=180)
+    parser.add_argument("--paragraphs", type=int, default=12)
+    parser.add_argument("--skip-moviepy", action="store_true", help="only time the stills path")
+    args = parser.parse_args()
+
+    text = "\n\n".join(TRAJECTORY.format(n=n) * 3 for n in range(1, args.paragraphs + 1))
+
+    with tempfile.TemporaryDirectory(prefix="skyscope-bench-") as work:
+        audio = os.path.join(work, "narration.mp3")
+        synthetic_narration(audio, args.seconds)
+        print(f"Encoding a {args.seconds:.0f}s briefing ({len(text)} chars of trajectory):")
+
+        slides_dir = os.path.join(work, "slides")
+        os.makedirs(slides_dir)
+        stills = timed("stills", lambda: encode_stills(render_slides(text, slides_dir), audio,
+                                                        os.path.join(work, "stills.mp4")))
+        print(f"  {'':<10} {os.path.getsize(os.path.join(work, 'stills.mp4')) / 1e6:8.2f} MB")
+
+        if not args.skip_moviepy:
+            legacy = timed("moviepy", lambda: render_moviepy(audio, os.path.join(work, "moviepy.mp4")))
+            print(f"  {'':<10} {os.path.getsize(os.path.join(work, 'moviepy.mp4')) / 1e6:8.2f} MB")
+            print(f"Speed-up: {legacy / stills:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
-import sys
-import time
+from skyscope.utils.startup import startup
+startup.track_imports()
+
+import argparse
+import threading
 from rich.console import Console
 from rich.layout import Layout
 from rich.panel import Panel
@@ -8,8 +11,11 @@ from rich.table import Table
 from rich.text import Text
 
 from skyscope.agents.orchestrator import SwarmOrchestrator
+from skyscope.agents.batch import BatchRunner, load_missions
+from skyscope.agents.watch import WatchRunner
 from skyscope.utils.config import Config
-from skyscope.utils.model_loader import ensure_models_exist
+from skyscope.utils.model_loader import ensure_models_exist, missing_models
+from skyscope.utils.telemetry import telemetry
 
 console = Console()
 
@@ -26,6 +32,32 @@ def make_layout() -> Layout:
     )
     return layout
 
+def seconds(value) -> str:
+    return "-" if value is None else f"{value:.1f}s"
+
+def collect_metrics(orchestrator, status: str) -> dict:
+    """Live values for the System Metrics panel, from telemetry and the router."""
+    snap = telemetry.snapshot()
+    router = orchestrator.client.router
+    health = router.snapshot()
+    built = [name for name in ("researcher", "analyst", "simulator") if name in orchestrator.built_agents()]
+    metrics = {
+        "Status": status,
+        "Missions": f"{snap['missions']}",
+        "Mission p50 / p95": f"{seconds(snap['mission_p50'])} / {seconds(snap['mission_p95'])}",
+    }
+    for phase, value in snap["phases"].items():
+        metrics[f"  {phase.title()}"] = seconds(value)
+    metrics["Tokens in / out"] = f"{snap['tokens_prompt']:,.0f} / {snap['tokens_completion']:,.0f}"
+    metrics["Fetched"] = f"{snap['bytes_fetched'] / 1e6:.2f} MB"
+    for label, rate in (("Page cache hits", snap["content_hit_rate"]), ("LLM cache hits", snap["llm_hit_rate"])):
+        metrics[label] = "-" if rate is None else f"{rate:.0%}"
+    metrics["Providers"] = ", ".join(f"{name}:{health[name]['state']}" for name in health) or "none"
+    if snap["providers"]:
+        metrics["Calls"] = ", ".join(f"{name}:{count:.0f}" for name, count in snap["providers"].items())
+    metrics["Agents"] = f"{len(built)}/3 ready"
+    return metrics
+
 def update_metrics(layout, metrics_data):
     table = Table(expand=True, border_style="dim")
     table.add_column("Metric", style="cyan")
@@ -36,27 +68,99 @@ def update_metrics(layout, metrics_data):
         
     layout["metrics"].update(Panel(table, title="System Metrics", border_style="blue"))
 
+def update_feed(layout, instruction, phase, text, max_lines=18):
+    # Show the tail of the streaming output so the newest tokens stay visible
+    tail = "\n".join(text.splitlines()[-max_lines:])
+    body = Text(f"Executing: {instruction}\n", style="yellow")
+    body.append(f"[{phase}]\n", style="bold cyan")
+    body.append(tail)
+    layout["output"].update(Panel(body, title="Live Feed"))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Skyscope Sentinel Intelligence swarm.")
+    parser.add_argument("instruction", nargs="*", help="One-shot instruction (omit for the interactive dashboard).")
+    parser.add_argument("--batch", metavar="JSONL", help="Run every mission in a JSONL file.")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent missions in batch mode.")
+    parser.add_argument("--results", default="batch_results.jsonl", help="Per-mission result records (batch mode).")
+    parser.add_argument("--watch", metavar="JSONL",
+                        help="Poll standing missions (JSONL, optional \"sources\" and \"interval\") and "
+                             "re-assess only when their sources change materially.")
+    parser.add_argument("--interval", type=float, help="Watch mode: seconds between polls (default WATCH_INTERVAL).")
+    parser.add_argument("--cycles", type=int, help="Watch mode: stop after this many polls per mission.")
+    parser.add_argument("--resume", nargs="?", const="latest", metavar="MISSION_ID",
+                        help="Continue a checkpointed mission from its first incomplete phase (default: latest unfinished).")
+    parser.add_argument("--from", dest="rerun_from", metavar="PHASE",
+                        help="With --resume: re-run this phase and everything after it "
+                             "(blueprint, research, analysis, simulation, artifacts).")
+    parser.add_argument("--missions", action="store_true", help="List checkpointed missions.")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="Print per-subsystem startup and import timings (or set SKYSCOPE_STARTUP_REPORT=1).")
+    args = parser.parse_args()
+    if args.rerun_from and not args.resume:
+        parser.error("--from requires --resume")
+    return args
+
+def list_missions(orchestrator):
+    table = Table(title="Checkpointed Missions", border_style="dim")
+    for column in ("Mission ID", "Status", "Completed", "Instruction"):
+        table.add_column(column)
+    for mission in (orchestrator.missions.list() if orchestrator.missions else []):
+        status = mission["status"] if not mission["error"] else f"{mission['status']} ({mission['error'][:40]})"
+        table.add_row(mission["id"], status, ", ".join(mission["completed"]) or "-", mission["instruction"][:60])
+    console.print(table)
+
 def main():
+    startup.stop_tracking_imports()
+    startup.record("imports", startup.elapsed())
+    args = parse_args()
+
     # 0. Boot Sequence
     console.print(Panel("[bold cyan]INITIALIZING SKYSCOPE SENTINEL INTELLIGENCE CORE...[/bold cyan]", border_style="cyan"))
-    ensure_models_exist()
-    time.sleep(1)
-    
-    orchestrator = SwarmOrchestrator(docs_path="./intel", generate_video=True)
+    with startup.span("model check"):
+        if missing_models():
+            # Fetch in the background; Kokoro and the local LLM pick the files up once they land
+            console.print("[dim]Acquiring embedded models in the background...[/dim]")
+            threading.Thread(target=ensure_models_exist, name="skyscope-models", daemon=True).start()
+
+    with startup.span("orchestrator"):
+        orchestrator = SwarmOrchestrator(docs_path="./intel", generate_video=True)
+    if args.missions:
+        list_missions(orchestrator)
+        return
+    # Agents, tokenizer and artifact workers load while the operator types
+    orchestrator.warm_up()
+    port = telemetry.serve()
+    if port:
+        console.print(f"[dim]Prometheus metrics on http://127.0.0.1:{port}/metrics[/dim]")
+    startup.report(f"Startup Report (time to prompt: {startup.elapsed() * 1000:.0f} ms)")
     
+    # Resume a checkpointed mission (or re-render / re-run its later phases)
+    if args.resume:
+        orchestrator.resume(args.resume, rerun_from=args.rerun_from)
+        orchestrator.shutdown()
+        return
+
+    # Batch mode: one process, shared clients and caches, bounded parallelism
+    if args.batch:
+        BatchRunner(orchestrator, workers=args.workers, results_path=args.results).run(load_missions(args.batch))
+        orchestrator.shutdown()
+        return
+
+    # Watch mode: standing missions, re-assessed on material change only
+    if args.watch:
+        WatchRunner(orchestrator, workers=args.workers).run(load_missions(args.watch), interval=args.interval,
+                                                            cycles=args.cycles)
+        orchestrator.shutdown()
+        return
+
     # Check for one-shot command
-    if len(sys.argv) > 1:
-        instruction = " ".join(sys.argv[1:])
+    if args.instruction:
+        instruction = " ".join(args.instruction)
         orchestrator.process_instruction(instruction)
+        orchestrator.shutdown()
         return
 
     # Interactive Live Mode
-    metrics = {
-        "Status": "STANDBY",
-        "Missions": 0,
-        "Agents": 3,
-        "Embedded.AI": "ACTIVE"
-    }
 
     # Header
     header = Panel(
@@ -72,6 +176,7 @@ def main():
             
             if instruction.lower() in ['exit', 'quit']:
                 console.print("[red]Shutting down...[/red]")
+                orchestrator.shutdown()
                 break
             
             if not instruction.strip():
@@ -81,26 +186,28 @@ def main():
             layout = make_layout()
             layout["header"].update(header)
             
-            metrics["Status"] = "PROCESSING"
-            metrics["Missions"] += 1
-            
             with Live(layout, refresh_per_second=4, screen=False) as live:
                 # Update loop for visual feedback
-                update_metrics(layout, metrics)
+                update_metrics(layout, collect_metrics(orchestrator, "PROCESSING"))
                 
-                # Mock progress for UI demo (Real logs go to stdout which Rich captures)
                 layout["output"].update(Panel(f"[yellow]Executing: {instruction}[/yellow]\n[dim]Dispatching agents...[/dim]", title="Live Feed"))
                 live.refresh()
                 
-                # Run actual logic
-                # Note: The Orchestrator uses its own Console, so we might see mixed output
-                #Ideally we'd redirect orchestrator output to the panel, but for now we run it directly
-                # to ensure the user sees the detailed logs.
-                live.stop() 
-                
-                orchestrator.process_instruction(instruction)
+                # Run actual logic. Agent logs go to stdout, which Live renders above the dashboard;
+                # analysis and simulation tokens stream straight into the Live Feed panel.
+                streamed = {}
+
+                def on_token(phase, token):
+                    if phase not in streamed:
+                        # New phase: the previous ones have finished, so their timings are in
+                        update_metrics(layout, collect_metrics(orchestrator, f"PROCESSING ({phase})"))
+                    # Only the tail is displayed, so keep the buffer bounded
+                    streamed[phase] = (streamed.get(phase, "") + token)[-4000:]
+                    update_feed(layout, instruction, phase, streamed[phase])
+
+                orchestrator.process_instruction(instruction, on_token=on_token)
                 
-                metrics["Status"] = "STANDBY"
+                update_metrics(layout, collect_metrics(orchestrator, "STANDBY"))
 
         except KeyboardInterrupt:
             console.print("\n[red]Manual Override Disengaged.[/red]")
@@ -1,15 +1,32 @@
-from ..utils.openrouter_client import OpenRouterClient
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from ..utils.config import Config
+from ..utils.context_packer import ContextPacker
+from ..utils.openrouter_client import OpenRouterClient, is_failure
+from ..utils.telemetry import carry_context, telemetry
 
 class AnalystAgent:
     def __init__(self):
         self.client = OpenRouterClient()
+        self.packer = ContextPacker(model=self.client.model_name)
         
-    def analyze(self, query: str, raw_intelligence: list) -> str:
+    def analyze(self, query: str, raw_intelligence: list,
+                on_token: Optional[Callable[[str], None]] = None) -> str:
         """
         Synthesizes raw intelligence into a critical assessment.
+        Pass `on_token` to stream the assessment as it is generated.
+
+        When the intelligence doesn't fit the model's budget (ANALYSIS_MODE
+        "auto"), it is analyzed map-reduce style: batches of findings are
+        condensed into notes by concurrent completions, level after level
+        until the notes fit, and the assessment is written from the notes.
         """
-        # Format context
-        context_str = "\n".join([f"- {item.get('content', '')}" for item in raw_intelligence])
+        mode = Config.ANALYSIS_MODE
+        if mode == "mapreduce" or (mode == "auto" and self._total_tokens(raw_intelligence) > self.packer.budget):
+            raw_intelligence = self._condense(query, raw_intelligence)
+
+        # Most relevant passages first, within the model's token budget
+        context_str = self.packer.pack_text(query, raw_intelligence)
         
         system_prompt = """You are a Deep Insights Analyst for Skyscope Sentinel. 
         Your role is to apply critical theory and strategic analysis to raw intelligence.
@@ -34,4 +51,66 @@ class AnalystAgent:
         return self.client.chat_completion([
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
-        ])
+        ], on_token=on_token)
+
+    def _total_tokens(self, items: list) -> int:
+        return sum(self.packer.count(self.packer.format([item])) for item in items)
+
+    def _condense(self, query: str, items: List[Dict]) -> List[Dict]:
+        """Map levels: batches -> notes until the notes fit the budget. Returns the notes (or `items` on failure)."""
+        for level in range(1, Config.ANALYSIS_MAX_LEVELS + 1):
+            batches = self._batches(items)
+            if len(batches) <= 1 and level > 1:
+                break
+            print(f"  [Analyst] Map level {level}: {len(items)} finding(s) in {len(batches)} batch(es).")
+            with telemetry.span("analysis.map", level=level, batches=len(batches)), \
+                    ThreadPoolExecutor(max_workers=min(len(batches), Config.ANALYSIS_MAX_WORKERS),
+                                       thread_name_prefix="skyscope-map") as pool:
+                results = list(pool.map(carry_context(lambda batch: self._map(query, batch)), batches))
+
+            notes = [{"source": f"Notes L{level}.{n}", "content": text}
+                     for n, text in enumerate(results, 1) if not is_failure(text)]
+            if not notes:
+                print("  [Analyst] Map pass failed; packing the raw findings instead.")
+                return items
+            if len(notes) < len(results):
+                # Keep the raw findings of failed batches; the next level (or the packer) picks them up
+                notes += [item for batch, text in zip(batches, results) if is_failure(text) for item in batch]
+            items = notes
+            if self._total_tokens(items) <= self.packer.budget:
+                break
+        return items
+
+    def _batches(self, items: List[Dict]) -> List[List[Dict]]:
+        """Groups findings in order into batches of about ANALYSIS_BATCH_TOKENS, splitting oversized ones."""
+        limit = min(Config.ANALYSIS_BATCH_TOKENS, self.packer.budget)
+        batches, current, size = [], [], 0
+        for item in items:
+            source = item.get("source", "Unknown")
+            for text in self.packer.chunk(str(item.get("content", ""))):
+                entry = {"source": source, "content": text}
+                tokens = self.packer.count(self.packer.format([entry]))
+                if current and size + tokens > limit:
+                    batches.append(current)
+                    current, size = [], 0
+                current.append(entry)
+                size += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    def _map(self, query: str, batch: List[Dict]) -> str:
+        prompt = f"""
+        Extract structured analyst notes from the findings below, keeping only what bears on the query.
+        Use short bullet points grouped under: Facts, Actors, Economic vectors, Political signals, Contradictions.
+        Keep source names in brackets next to each point. At most {Config.ANALYSIS_NOTE_WORDS} words.
+
+        QUERY: {query}
+
+        FINDINGS:
+        {self.packer.format(batch)}
+        """
+        return self.client.chat_completion([
+            {"role": "system", "content": "You are an intelligence analyst condensing raw findings into notes."},
+            {"role": "user", "content": prompt}
+        ], temperature=0.2)
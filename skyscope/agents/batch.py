@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+from ..utils.mission_store import PHASES
+
+console = Console()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def load_missions(path: str) -> List[Dict]:
+    """
+    Reads a JSONL mission file. Each line is either an object with an
+    "instruction" (and optional "id") or a bare JSON string.
+    """
+    missions = []
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if isinstance(entry, str):
+                entry = {"instruction": entry}
+            if not entry.get("instruction"):
+                raise ValueError(f"{path}:{line_no}: mission has no 'instruction'")
+            entry.setdefault("id", f"mission-{line_no}")
+            missions.append(entry)
+    return missions
+
+
+class BatchRunner:
+    """
+    Runs many missions through one SwarmOrchestrator with bounded parallelism.
+
+    Workers share the orchestrator, so clients, connection pools, the provider
+    router and every cache are shared too. One result record per mission is
+    appended to `results_path` (JSONL, completion order) as soon as its
+    background artifacts are done, so an interrupted batch keeps what it
+    finished; `run` returns a throughput summary with per-phase p50/p95.
+    """
+
+    def __init__(self, orchestrator, workers: int = 4, results_path: str = "batch_results.jsonl"):
+        self.orchestrator = orchestrator
+        self.workers = max(1, workers)
+        self.results_path = results_path
+        self.records: List[Dict] = []
+        self._lock = threading.Lock()
+        self._artifacts_recorded: List[threading.Event] = []
+
+    def run(self, missions: List[Dict]) -> Dict:
+        console.print(f"[bold cyan]Batch:[/bold cyan] {len(missions)} mission(s), {self.workers} worker(s).")
+        # Ingest once up front; per-mission syncs are then manifest no-ops
+        self.orchestrator.researcher.ingestor.sync()
+        open(self.results_path, "w").close()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="skyscope-mission") as pool:
+            list(pool.map(self._run_mission, range(len(missions)), missions))
+        self.orchestrator.wait_for_artifacts()
+        # Futures wake waiters before running done-callbacks; let the records catch up
+        for recorded in self._artifacts_recorded:
+            recorded.wait()
+        wall = time.perf_counter() - start
+
+        summary = self.summarize(wall)
+        with open(f"{self.results_path}.summary.json", "w") as f:
+            json.dump(summary, f, indent=2)
+        self._print_summary(summary)
+        return summary
+
+    def _run_mission(self, index: int, mission: Dict):
+        record = {"index": index, "id": mission["id"], "instruction": mission["instruction"], "status": "ok",
+                  "started_at": time.time(), "timings": {}, "artifacts": []}
+        # The worker plus each background artifact must settle before the record is written
+        record["_pending"] = 1
+        start = time.perf_counter()
+        try:
+            result = self.orchestrator.process_instruction(mission["instruction"], show_progress=False)
+            record["mission_name"] = result["blueprint"].get("mission_name")
+            record["timings"] = dict(result["timings"])
+            self._track_artifacts(record, result["artifacts"])
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = str(e)
+            console.print(f"[red]Mission {mission['id']} failed: {e}[/red]")
+        record["total_s"] = time.perf_counter() - start
+        with self._lock:
+            self.records.append(record)
+        self._settle(record)
+
+    def _settle(self, record: Dict):
+        """Appends the record to the results file once nothing is pending on it."""
+        with self._lock:
+            record["_pending"] -= 1
+            if record["_pending"]:
+                return
+            del record["_pending"]
+            with open(self.results_path, "a") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+
+    def _track_artifacts(self, record: Dict, futures: List):
+        """Records when each background artifact finishes, without holding up the worker."""
+        dispatched = time.perf_counter()
+
+        def done(future, recorded):
+            elapsed = time.perf_counter() - dispatched
+            with self._lock:
+                record["timings"]["artifacts"] = max(record["timings"].get("artifacts", 0.0), elapsed)
+                if not future.exception() and future.result():
+                    record["artifacts"].append(future.result())
+            self._settle(record)
+            recorded.set()
+
+        with self._lock:
+            record["_pending"] += len(futures)
+        for future in futures:
+            recorded = threading.Event()
+            with self._lock:
+                self._artifacts_recorded.append(recorded)
+            future.add_done_callback(lambda f, recorded=recorded: done(f, recorded))
+
+    def summarize(self, wall: float) -> Dict:
+        ok = [r for r in self.records if r["status"] == "ok"]
+        phases = {}
+        for phase in PHASES:
+            samples = [r["timings"][phase] for r in ok if phase in r["timings"]]
+            if samples:
+                phases[phase] = {"p50": percentile(samples, 50), "p95": percentile(samples, 95)}
+        totals = [r["total_s"] for r in ok]
+        return {
+            "missions": len(self.records),
+            "succeeded": len(ok),
+            "failed": len(self.records) - len(ok),
+            "workers": self.workers,
+            "wall_s": wall,
+            "missions_per_hour": (len(ok) / wall * 3600) if wall else 0.0,
+            "mission_p50_s": percentile(totals, 50),
+            "mission_p95_s": percentile(totals, 95),
+            "phases": phases,
+        }
+
+    def _print_summary(self, summary: Dict):
+        table = Table(title="Batch Throughput", border_style="dim")
+        table.add_column("Phase", style="cyan")
+        table.add_column("p50 (s)", justify="right")
+        table.add_column("p95 (s)", justify="right")
+        for phase, stats in summary["phases"].items():
+            table.add_row(phase, f"{stats['p50']:.2f}", f"{stats['p95']:.2f}")
+        table.add_row("mission", f"{summary['mission_p50_s']:.2f}", f"{summary['mission_p95_s']:.2f}")
+        console.print(table)
+        console.print(
+            f"[bold green]{summary['succeeded']}/{summary['missions']} missions ok[/bold green] in "
+            f"{summary['wall_s']:.1f}s ({summary['missions_per_hour']:.1f} missions/hour). "
+            f"Records: {self.results_path}"
+        )
@@ -1,12 +1,14 @@
 import os
 from typing import List, Dict
-from ..utils.local_recall_client import LocalRecallClient
+from ..utils.local_recall_client import get_recall_client
+from ..utils.ingestion import DocumentIngestor
 
 class IntelligenceGatherer:
     def __init__(self, docs_path: str, collection_name="skyscope_intel"):
         self.docs_path = docs_path
         self.collection_name = collection_name
-        self.recall_client = LocalRecallClient()
+        self.recall_client = get_recall_client()
+        self.ingestor = DocumentIngestor(docs_path, collection_name, self.recall_client)
         self.sources = []
 
     def gather(self, query: str) -> List[Dict]:
@@ -14,9 +16,8 @@ class IntelligenceGatherer:
         Gathers intelligence by scanning local docs (ingesting to LocalRecall) 
         and searching for relevant context.
         """
-        # 1. Ingest local documents if they exist
+        # 1. Ingest new/changed local documents if they exist
         if self.docs_path and os.path.exists(self.docs_path):
-            self.recall_client.create_collection(self.collection_name)
             self._ingest_docs()
             
         # 2. Search LocalRecall for context
@@ -29,7 +30,7 @@ class IntelligenceGatherer:
                 # LocalRecall results structure extraction
                 text = item.get('text') or item.get('content') or str(item)
                 source = item.get('file') or item.get('metadata', {}).get('source', 'Unknown')
-                config_context.append({"source": source, "content": text[:500] + "..."})
+                config_context.append({"source": source, "content": text})
         else:
             # Fallback simulations if nothing found
             config_context = [
@@ -41,13 +42,7 @@ class IntelligenceGatherer:
 
     def _ingest_docs(self):
         """
-        Walks the doc path and uploads supported files to LocalRecall.
+        Syncs the doc path into LocalRecall. The ingestion manifest makes this
+        incremental: unchanged files are skipped, deleted files are removed.
         """
-        for root, _, files in os.walk(self.docs_path):
-            for file in files:
-                if file.lower().endswith(('.pdf', '.txt', '.md')):
-                    path = os.path.join(root, file)
-                    # We might want to avoid re-uploading every time in production,
-                    # but for this swarm session we ensure fresh intel.
-                    # LocalRecall likely handles dedup or overwrite.
-                    self.recall_client.upload_file(self.collection_name, path)
+        self.ingestor.sync()
@@ -1,91 +1,364 @@
+import asyncio
 import time
 import json
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Callable, List, Optional
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from ..utils.openrouter_client import OpenRouterClient
+from ..utils.openrouter_client import OpenRouterClient, is_failure as reply_failed
+from ..utils.provider_router import EmbeddedProvider
 from .researcher import ResearcherAgent
 from .analyst import AnalystAgent
 from .simulation import SimulationAgent
-from ..reporting.pdf_generator import PDFReportGenerator
-from ..video.generator import VideoGenerator
+from ..reporting.artifacts import render_pdf, render_video, warm_up as warm_up_artifacts
+from ..utils.cancellation import cancel_scope, check_cancel
+from ..utils.config import Config
+from ..utils.crawler import shutdown_extractors
+from ..utils.mission_store import MissionStore, PHASES as MISSION_PHASES
+from ..utils.startup import startup
+from ..utils.telemetry import carry_context, telemetry
 
 console = Console()
 
+
 class SwarmOrchestrator:
     def __init__(self, docs_path: str = None, generate_video: bool = True):
-        self.client = OpenRouterClient()
         self.docs_path = docs_path
         self.generate_video = generate_video
         
-        # Swarm Collective
-        self.researcher = ResearcherAgent(docs_path)
-        self.analyst = AnalystAgent()
-        self.simulator = SimulationAgent()
+        # Swarm Collective: built on first use, or ahead of time by warm_up()
+        self._agents = {}
+        self._agent_factories = {
+            "client": OpenRouterClient,
+            "researcher": self._make_researcher,
+            "analyst": AnalystAgent,
+            "simulator": SimulationAgent,
+        }
+        self._agent_locks = {name: threading.Lock() for name in self._agent_factories}
+        self._warmup = None
+        # Per-phase checkpoints, so failed missions resume instead of starting over
+        self.missions = MissionStore() if Config.MISSION_CHECKPOINTS else None
         
-        # Tools
-        self.pdf_generator = PDFReportGenerator()
-        self.video_generator = VideoGenerator()
+        # Tools: PDF and video render in a worker-process pool (see generate_artifacts)
+        self._artifact_pool = None
+        self._artifact_lock = threading.Lock()
+        self._mission_pool = None # Worker threads behind the async API (see run)
+        self._last_timestamp = 0
+        self.pending_artifacts = []
+        self.on_artifact: Optional[Callable[[str, Optional[str]], None]] = None
+
+    @property
+    def client(self) -> OpenRouterClient:
+        return self._agent("client")
+
+    @property
+    def researcher(self) -> ResearcherAgent:
+        return self._agent("researcher")
 
-    def process_instruction(self, instruction: str):
+    @property
+    def analyst(self) -> AnalystAgent:
+        return self._agent("analyst")
+
+    @property
+    def simulator(self) -> SimulationAgent:
+        return self._agent("simulator")
+
+    def warm_up(self) -> threading.Thread:
+        """
+        Builds the agents, loads the tokenizer and pre-spawns the artifact
+        workers on a daemon thread, so this work overlaps with the operator
+        typing (or with the first mission's blueprint call).
+        """
+        if self._warmup:
+            return self._warmup
+
+        def run():
+            try:
+                for name in self._agent_factories:
+                    with startup.span(name, group="warmup"):
+                        self._agent(name)
+                with startup.span("tokenizer", group="warmup"):
+                    self.analyst.packer.count("warm-up")
+                providers = self.client.router.providers
+                if providers and isinstance(providers[0], EmbeddedProvider) and providers[0].llm.available():
+                    # Offline setup: load the GGUF now rather than on the first blueprint call
+                    with startup.span("embedded llm", group="warmup"):
+                        providers[0].llm.load()
+                if Config.ARTIFACTS_IN_BACKGROUND:
+                    with startup.span("artifact workers", group="warmup"):
+                        self._get_artifact_pool().submit(warm_up_artifacts, ".", self.generate_video).result()
+            except Exception as e:
+                # Anything that failed here is retried (and reported) on first real use
+                console.print(f"[dim]Warm-up incomplete: {e}[/dim]")
+            startup.report("Background Warm-up", groups=("warmup",))
+
+        self._warmup = threading.Thread(target=run, name="skyscope-warmup", daemon=True)
+        self._warmup.start()
+        return self._warmup
+
+    def _agent(self, name: str):
+        agent = self._agents.get(name)
+        if agent is None:
+            # Per-agent locks: a slow researcher build doesn't hold up the LLM client
+            with self._agent_locks[name]:
+                agent = self._agents.get(name)
+                if agent is None:
+                    agent = self._agents[name] = self._agent_factories[name]()
+        return agent
+
+    def built_agents(self) -> List[str]:
+        """Names of the agents constructed so far (e.g. by warm_up), without building the rest."""
+        return [name for name in self._agent_factories if name in self._agents]
+
+    def _make_researcher(self) -> ResearcherAgent:
+        researcher = ResearcherAgent(self.docs_path)
+        researcher.start_ingestion()
+        return researcher
+
+    def process_instruction(self, instruction: str, on_token: Optional[Callable[[str, str], None]] = None,
+                            show_progress: bool = True, mission_id: str = None, rerun_from: str = None,
+                            cancel: threading.Event = None):
         """
         Main entry point for Natural Language Instructions.
         1. Parse instruction -> Blueprint
         2. Execute Blueprint (Research -> Analysis -> Sim -> Report)
+
+        `on_token(phase, token)` receives the analysis and simulation output as it
+        streams. A streaming caller owns the display (e.g. the dashboard's Live
+        panel), so the spinner is disabled: rich allows one live display at a time.
+        Concurrent callers (batch mode) pass `show_progress=False` for the same reason.
+
+        Each phase's output is checkpointed to the mission store. With `mission_id`,
+        a stored mission continues from its first incomplete phase; `rerun_from`
+        also re-runs that phase and every later one (e.g. "artifacts" re-renders
+        the PDF and video from the stored trajectory without any LLM calls).
+
+        Setting `cancel` raises MissionCancelled at the next phase boundary, LLM
+        call, streamed token or crawled page (LLM calls are always streamed when
+        `cancel` is given, so a long completion is cut short too); the mission is
+        checkpointed as failed. Pool work the mission submits sees the same event.
+
+        Returns the mission's outputs plus per-phase wall-clock `timings` (seconds).
+        The mission and each phase are also recorded as telemetry spans.
         """
+        timings = {}
+        mission = self._open_mission(instruction, mission_id, rerun_from)
         console.print(f"\n[bold green]Skyscope Swarm Active.[/bold green]")
-        console.print(f"[dim]Received Instruction: {instruction}[/dim]\n")
+        console.print(f"[dim]Received Instruction: {instruction}[/dim]")
+        if mission:
+            console.print(f"[dim]Mission ID: {mission['id']}[/dim]")
+        console.print()
+
+        def feed(phase):
+            if not on_token:
+                return None
+            def on_phase_token(token):
+                check_cancel() # Aborts the stream mid-phase
+                on_token(phase, token)
+            return on_phase_token
         
-        with Progress(
+        with cancel_scope(cancel), telemetry.span("mission"), Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             transient=True,
+            disable=on_token is not None or not show_progress,
         ) as progress:
+
+            degraded = [] # Phases whose output is an error text or fallback: nothing after them is checkpointed
+
+            def phase(name: str, description: str, run: Callable):
+                """Runs one phase (or restores its checkpoint) under a spinner task and a telemetry span."""
+                if mission and name in mission["phases"]:
+                    console.print(f"  [dim]- {name.title()} restored from checkpoint.[/dim]")
+                    return mission["phases"][name]["output"]
+                task = progress.add_task(description, total=None)
+                try:
+                    check_cancel()
+                    with telemetry.span(name) as span:
+                        output = run()
+                except Exception as e:
+                    if mission:
+                        self.missions.fail(mission, name, e)
+                    raise
+                finally:
+                    progress.remove_task(task)
+                timings[name] = span.duration
+                if mission and self.is_failure(output) and not degraded:
+                    degraded.append(name)
+                    self.missions.fail(mission, name, output[:200] if isinstance(output, str)
+                                       else "fallback output (planner reply was not valid JSON)")
+                if mission and not degraded:
+                    self.missions.checkpoint(mission, name, output, span.duration)
+                return output
             
+            # Blueprint-independent research (URLs, ingestion, a search on the raw instruction)
+            # starts now and overlaps the blueprint call; the research phase reconciles it
+            speculative = None
+            if Config.RESEARCH_SPECULATIVE and not (mission and "research" in mission["phases"]):
+                speculative = self._speculate(instruction)
+
             # Phase 1: Strategic Blueprinting (Orchestrator Logic)
-            task_plan = progress.add_task("[cyan]Orchestrator: Decomposing objectives...[/cyan]", total=None)
-            blueprint = self._create_blueprint(instruction)
-            progress.remove_task(task_plan)
+            blueprint = phase("blueprint", "[cyan]Orchestrator: Decomposing objectives...[/cyan]",
+                              lambda: self._create_blueprint(instruction))
             console.print(f"[bold cyan]Mission Blueprint:[/bold cyan] {blueprint.get('mission_name', 'Unknown')}")
             
             # Phase 2: Deep Research
-            task_res = progress.add_task("[yellow]Researcher: Executing deep search...[/yellow]", total=None)
-            raw_intel = self.researcher.conduct_research(blueprint.get('research_directives', instruction))
-            progress.remove_task(task_res)
+            raw_intel = phase("research", "[yellow]Researcher: Executing deep search...[/yellow]",
+                              lambda: self.researcher.conduct_research(blueprint.get('research_directives', instruction),
+                                                                       speculative=speculative))
             console.print(f"  [yellow]- Acquired {len(raw_intel)} verified intelligence vectors.[/yellow]")
             
             # Phase 3: Critical Analysis
-            task_ana = progress.add_task("[magenta]Analyst: Synthesizing insights...[/magenta]", total=None)
-            deep_insights = self.analyst.analyze(instruction, raw_intel)
-            progress.remove_task(task_ana)
+            deep_insights = phase("analysis", "[magenta]Analyst: Synthesizing insights...[/magenta]",
+                                  lambda: self.analyst.analyze(instruction, raw_intel, on_token=feed("Analysis")))
             console.print(f"  [magenta]- Critical assessment complete.[/magenta]")
 
             # Phase 4: Simulation & Projection
-            task_sim = progress.add_task("[blue]Simulator: Running trajectories...[/blue]", total=None)
             # Pass the insights as context to the simulation
-            trajectory = self.simulator.run_simulation(instruction, [{"content": deep_insights, "source": "Skyscope Analyst Swarm"}])
-            progress.remove_task(task_sim)
+            trajectory = phase("simulation", "[blue]Simulator: Running trajectories...[/blue]",
+                               lambda: self.simulator.run_simulation(
+                                   instruction, [{"content": deep_insights, "source": "Skyscope Analyst Swarm"}],
+                                   on_token=feed("Simulation")))
             console.print(f"  [blue]- Trajectory simulation finalized.[/blue]")
             
-            # Phase 5: Artifact Generation
-            task_art = progress.add_task("[green]Publishing classified artifacts...[/green]", total=None)
-            self._generate_artifacts(instruction, deep_insights, trajectory)
-            progress.remove_task(task_art)
+            # Phase 5: Artifact Generation (dispatched; PDF and video render concurrently in the background).
+            # Checkpointed by the render callbacks once every artifact exists.
+            if mission and "artifacts" in mission["phases"]:
+                console.print("  [dim]- Artifacts restored from checkpoint.[/dim]")
+                artifacts = []
+            else:
+                check_cancel()
+                task_art = progress.add_task("[green]Publishing classified artifacts...[/green]", total=None)
+                with telemetry.span("artifacts"):
+                    artifacts = self.generate_artifacts(instruction, deep_insights, trajectory,
+                                                         None if degraded else mission)
+                progress.remove_task(task_art)
             
+        telemetry.flush()
         console.print("\n[bold green]Mission Complete. Swarm entering standby.[/bold green]")
+        if artifacts:
+            console.print(f"[dim]{len(artifacts)} artifact(s) rendering in the background.[/dim]")
+        return {
+            "mission_id": mission["id"] if mission else None,
+            "instruction": instruction,
+            "blueprint": blueprint,
+            "insights": deep_insights,
+            "trajectory": trajectory,
+            "artifacts": artifacts,
+            "timings": timings,
+        }
+
+    def _speculate(self, instruction: str) -> Future:
+        """Runs `researcher.gather(instruction)` on a daemon thread; the future resolves to its state."""
+        future = Future()
+
+        def run():
+            future.set_running_or_notify_cancel()
+            try:
+                with telemetry.span("research.speculative"):
+                    future.set_result(self.researcher.gather(instruction))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=carry_context(run), name="skyscope-speculate", daemon=True).start()
+        return future
+
+    async def run(self, instruction: str, on_token: Optional[Callable[[str, str], None]] = None,
+                  timeout: float = None, mission_id: str = None, rerun_from: str = None,
+                  wait_for_artifacts: bool = False) -> dict:
+        """
+        Async entry point: `await orchestrator.run(instruction)`.
+
+        Many missions can be awaited concurrently on one event loop (e.g. with
+        asyncio.gather); they share this orchestrator's clients, connection
+        pools and caches, and run on up to ASYNC_MAX_MISSIONS worker threads.
+        `on_token(phase, token)` is called on the event loop. Cancelling the
+        task, or exceeding `timeout` seconds (asyncio.TimeoutError), stops the
+        mission at its next cancellation check (see process_instruction); it
+        stays checkpointed and can be resumed. With `wait_for_artifacts`, this
+        also awaits the background PDF/video renders within what is left of
+        `timeout`; if they run over, the result is returned with them still
+        rendering.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        cancel = threading.Event()
+        feed = None
+        if on_token:
+            feed = lambda phase, token: loop.call_soon_threadsafe(on_token, phase, token)
+        future = loop.run_in_executor(self._get_mission_pool(), carry_context(partial(
+            self.process_instruction, instruction, on_token=feed, show_progress=False,
+            mission_id=mission_id, rerun_from=rerun_from, cancel=cancel)))
+        try:
+            result = await asyncio.wait_for(future, timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            # The worker thread can't be interrupted; it stops at its next cancellation check
+            cancel.set()
+            raise
+        if wait_for_artifacts and result["artifacts"]:
+            renders = asyncio.gather(*(asyncio.wrap_future(f) for f in result["artifacts"]),
+                                     return_exceptions=True)
+            try:
+                # Shielded: running out of time stops the wait, not the renders
+                await asyncio.wait_for(asyncio.shield(renders),
+                                       None if deadline is None else max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                console.print(f"[dim]Artifacts still rendering after {timeout:g}s; returning without them.[/dim]")
+        return result
+
+    def resume(self, mission_id: str = "latest", rerun_from: str = None, **kwargs):
+        """Continues a stored mission ("latest" = most recent unfinished one). See process_instruction."""
+        state = self.missions.load(mission_id)
+        if state is None:
+            raise ValueError(f"No stored mission '{mission_id}'.")
+        return self.process_instruction(state["instruction"], mission_id=state["id"], rerun_from=rerun_from, **kwargs)
+
+    def _open_mission(self, instruction: str, mission_id: Optional[str], rerun_from: Optional[str]) -> Optional[dict]:
+        if not self.missions:
+            return None
+        if not mission_id:
+            return self.missions.new(instruction, self.docs_path)
+        mission = self.missions.load(mission_id)
+        if mission is None:
+            raise ValueError(f"No stored mission '{mission_id}'.")
+        if mission["input_hash"] != self.missions.input_hash(instruction, self.docs_path):
+            raise ValueError(f"Mission '{mission_id}' was started with a different instruction or docs path.")
+        if rerun_from and rerun_from not in MISSION_PHASES:
+            raise ValueError(f"Unknown phase '{rerun_from}' (expected one of {', '.join(MISSION_PHASES)}).")
+        # Without an explicit phase, continue from the first one without a checkpoint
+        rerun_from = rerun_from or next((name for name in MISSION_PHASES if name not in mission["phases"]), None)
+        if rerun_from:
+            # Everything downstream of a re-run phase depends on it, so it runs again too
+            self.missions.invalidate(mission, rerun_from)
+        return mission
+
+    @staticmethod
+    def is_failure(output) -> bool:
+        """
+        Whether a phase output must not be checkpointed: a failed LLM reply
+        (openrouter_client.is_failure: empty or error text) or a degraded fallback.
+        """
+        if isinstance(output, dict):
+            return bool(output.get("degraded"))
+        return isinstance(output, str) and reply_failed(output)
 
     def _create_blueprint(self, instruction: str) -> dict:
         """
         Uses the Orchestrator LLM to parse the raw instruction into structured directives.
         """
+        # Fixed instructions first, the command last: keeps the shared prompt prefix reusable
         prompt = f"""
         You are the Swarm Orchestrator. 
-        Analyze this incoming command: "{instruction}"
-        
-        Output a JSON blueprint with:
+        Analyze the incoming command below and output a JSON blueprint with:
         - "mission_name": Short title.
         - "research_directives": Specific search query for the Researcher.
         - "simulation_focus": Key variable to simulate.
+
+        Command: "{instruction}"
         """
         response = self.client.chat_completion([
              {"role": "system", "content": "You are a JSON-only planner."},
@@ -97,23 +370,100 @@ class SwarmOrchestrator:
             clean_json = response.replace("```json", "").replace("```", "").strip()
             return json.loads(clean_json)
         except:
+            # Marked so it is never checkpointed: a resumed mission asks the planner again
             return {
                 "mission_name": "General Directive",
                 "research_directives": instruction,
-                "simulation_focus": "General Outcome"
+                "simulation_focus": "General Outcome",
+                "degraded": True
             }
 
-    def _generate_artifacts(self, query, insights, trajectory):
-        timestamp = int(time.time())
+    def generate_artifacts(self, query, insights, trajectory, mission: dict = None) -> List:
+        """
+        Dispatches the PDF and video renders. In background mode they run concurrently
+        in a process pool and this returns their futures immediately; each artifact
+        is reported (and `on_artifact(label, path)` called) as it completes.
+        """
+        with self._artifact_lock:
+            # Unique per mission even when missions finish within the same second
+            timestamp = self._last_timestamp = max(int(time.time()), self._last_timestamp + 1)
         # PDF
         pdf_name = f"skyscope_report_{timestamp}.pdf"
         # We package insights as list of dicts for the existing PDF generator
         intel_context = [{"source": "Analyst Insight", "content": insights}]
-        self.pdf_generator.generate(pdf_name, query, trajectory, intel_context)
-        console.print(f"  [dim]- PDF Report: {pdf_name}[/dim]")
+        jobs = [("PDF Report", render_pdf, (pdf_name, query, trajectory, intel_context))]
         
         # Video
         if self.generate_video:
             vid_name = f"skyscope_briefing_{timestamp}.mp4"
-            self.video_generator.generate(vid_name, trajectory)
-            console.print(f"  [dim]- Video Briefing: {vid_name}[/dim]")
+            jobs.append(("Video Briefing", render_video, (vid_name, trajectory)))
+
+        if not Config.ARTIFACTS_IN_BACKGROUND:
+            for label, job, args in jobs:
+                start = time.perf_counter()
+                try:
+                    self._report_artifact(label, job(*args), started=start, mission=mission, expected=len(jobs))
+                except Exception as e:
+                    self._report_artifact(label, None, e, started=start, mission=mission, expected=len(jobs))
+            return []
+
+        futures = []
+        pool = self._get_artifact_pool()
+        for label, job, args in jobs:
+            start = time.perf_counter()
+            future = pool.submit(job, *args)
+            future.add_done_callback(lambda f, label=label, start=start: self._report_artifact(
+                label, None if f.exception() else f.result(), f.exception(), started=start,
+                mission=mission, expected=len(jobs)))
+            futures.append(future)
+        with self._artifact_lock:
+            self.pending_artifacts = [f for f in self.pending_artifacts if not f.done()] + futures
+        return futures
+
+    def wait_for_artifacts(self, timeout: float = None):
+        """Blocks until background artifacts have finished rendering."""
+        with self._artifact_lock:
+            pending = [f for f in self.pending_artifacts if not f.done()]
+        if pending:
+            console.print(f"[dim]Waiting for {len(pending)} artifact(s) to finish rendering...[/dim]")
+            wait(pending, timeout=timeout)
+
+    def shutdown(self):
+        self.wait_for_artifacts()
+        if self._artifact_pool:
+            self._artifact_pool.shutdown()
+        shutdown_extractors()
+        if self._mission_pool:
+            self._mission_pool.shutdown(cancel_futures=True)
+
+    def _get_mission_pool(self) -> ThreadPoolExecutor:
+        with self._artifact_lock:
+            if self._mission_pool is None:
+                self._mission_pool = ThreadPoolExecutor(max_workers=Config.ASYNC_MAX_MISSIONS,
+                                                        thread_name_prefix="skyscope-async")
+            return self._mission_pool
+
+    def _get_artifact_pool(self) -> ProcessPoolExecutor:
+        with self._artifact_lock:
+            if self._artifact_pool is None:
+                # The pool is started from background threads (warm-up, batch workers); forking there can
+                # copy locks held by other threads (e.g. stdin during input()) and hang the children
+                self._artifact_pool = ProcessPoolExecutor(max_workers=Config.ARTIFACT_WORKERS,
+                                                          mp_context=multiprocessing.get_context("spawn"))
+            return self._artifact_pool
+
+    def _report_artifact(self, label: str, path: Optional[str], error: Exception = None, started: float = None,
+                         mission: dict = None, expected: int = 0):
+        if started is not None:
+            # Dispatch to completion, including any wait for a free worker
+            telemetry.record("artifact", time.perf_counter() - started, kind=label,
+                             outcome="error" if error or not path else "ok")
+            telemetry.flush()
+        if error or not path:
+            console.print(f"  [red]- {label} failed: {error or 'no output'}[/red]")
+        else:
+            console.print(f"  [dim]- {label}: {path}[/dim]")
+        if mission:
+            self.missions.record_artifact(mission, label, path, expected, error)
+        if self.on_artifact:
+            self.on_artifact(label, path)
@@ -1,57 +1,71 @@
-import os
-from typing import List, Dict
-try:
-    import trafilatura
-except ImportError:
-    trafilatura = None
-try:
-    from youtube_transcript_api import YouTubeTranscriptApi
-except ImportError:
-    YouTubeTranscriptApi = None
-
-from ..utils.local_recall_client import LocalRecallClient
+import json
+from concurrent.futures import Future
+from typing import List, Dict, Optional
+
+from ..utils.local_recall_client import get_recall_client
+from ..utils.acquisition import SourceFetcher
+from ..utils.cancellation import check_cancel
+from ..utils.content_cache import ContentCache, normalize_url
+from ..utils.crawler import Crawler
+from ..utils.ingestion import DocumentIngestor
+from ..utils.config import Config
+from ..utils.telemetry import telemetry
+
+# Stripped from URLs written in prose: quotes, brackets and sentence punctuation
+URL_PUNCTUATION = "\"'<>()[]{},.;:!?"
+
+# Scrapers (trafilatura pulls in lxml & co.) are imported when the first agent is built
+trafilatura = None
+YouTubeTranscriptApi = None
+_scrapers_loaded = False
+
+
+def _load_scrapers():
+    global trafilatura, YouTubeTranscriptApi, _scrapers_loaded
+    if _scrapers_loaded:
+        return
+    try:
+        import trafilatura
+    except ImportError:
+        trafilatura = None
+    try:
+        from youtube_transcript_api import YouTubeTranscriptApi
+    except ImportError:
+        YouTubeTranscriptApi = None
+    _scrapers_loaded = True
+
 
 class ResearcherAgent:
     def __init__(self, docs_path: str = None, collection_name="skyscope_intel"):
+        _load_scrapers()
         self.docs_path = docs_path
         self.collection_name = collection_name
-        self.recall_client = LocalRecallClient()
+        self.recall_client = get_recall_client()
+        self.fetcher = SourceFetcher()
+        self.cache = ContentCache()
+        self.crawler = Crawler(cache=self.cache)
+        self.ingestor = DocumentIngestor(docs_path, collection_name, self.recall_client)
         self.sources = []
 
-    def conduct_research(self, instruction: str) -> List[Dict]:
+    def conduct_research(self, instruction: str, speculative: Optional[Future] = None) -> List[Dict]:
         """
         Executes a deep search. 
         Auto-detects URLs in the instruction effectively acting as a 'Browse' tool.
+
+        `speculative` is a pending `gather()` over the raw mission instruction,
+        started while the blueprint was being written. Its URLs, ingestion and
+        search are reused; only what the directives add on top still runs.
         """
         print(f"  [Researcher] Analyzing directives: {instruction[:50]}...")
-        findings = []
-
-        # 1. Autonomous Scraping (RT.com / News)
-        if "http" in instruction:
-            urls = [word for word in instruction.split() if word.startswith("http")]
-            for url in urls:
-                if "youtube.com" in url or "youtu.be" in url:
-                    video_data = self._get_youtube_transcript(url)
-                    if video_data:
-                        findings.append(video_data)
-                else:
-                    web_data = self._scrape_url(url)
-                    if web_data:
-                        findings.append(web_data)
-        
-        # 2. LocalRecall Search
-        # Ingest local documents if they exist
-        if self.docs_path and os.path.exists(self.docs_path):
-             self.recall_client.create_collection(self.collection_name)
-             self._ingest_docs()
-        
-        # Search existing knowledge
-        results = self.recall_client.search(self.collection_name, instruction, limit=5)
-        if results:
-            for item in results:
-                text = item.get('text') or item.get('content') or str(item)
-                source = item.get('file') or item.get('metadata', {}).get('source', 'Unknown')
-                findings.append({"source": f"LocalMemory ({source})", "content": text[:800]})
+        prior = None
+        if speculative is not None:
+            try:
+                prior = speculative.result(timeout=Config.RESEARCH_STAGE_TIMEOUT)
+                print(f"  [Researcher] Speculative pass reused: {len(prior['findings'])} finding(s), "
+                      f"{len(prior['urls'])} URL(s).")
+            except Exception as e:
+                print(f"  [Researcher] Speculative pass unavailable ({type(e).__name__}); searching from scratch.")
+        findings = self.gather(instruction, prior)["findings"]
         
         # 3. Fallback Simulation (if no real data found)
         if not findings:
@@ -63,42 +77,125 @@ class ResearcherAgent:
             
         return findings
 
+    def gather(self, query: str, prior: Optional[Dict] = None) -> Dict:
+        """
+        Fetches the URLs in `query`, syncs the docs and searches LocalRecall for it.
+        Work already done in `prior` (an earlier gather) is skipped and its findings kept.
+
+        Returns {"findings", "urls": fetched, "queries": searched}.
+        """
+        state = {"findings": list(prior["findings"]) if prior else [],
+                 "urls": list(prior["urls"]) if prior else [],
+                 "queries": list(prior["queries"]) if prior else []}
+        seen = {(item["source"], item["content"]) for item in state["findings"]}
+        check_cancel()
+
+        def add(items):
+            for item in items:
+                if (item["source"], item["content"]) not in seen:
+                    seen.add((item["source"], item["content"]))
+                    state["findings"].append(item)
+
+        # 1. Autonomous Scraping (RT.com / News): a bounded crawl from the URLs (pages and feeds),
+        # plus YouTube transcripts, fetched concurrently
+        # URLs as written in prose ("see <url>.", quoted, with tracking params) are fetched once:
+        # compared by cache key against what the earlier pass already fetched
+        fetched = {normalize_url(url) for url in state["urls"]}
+        urls = []
+        for word in query.split():
+            word = word.strip(URL_PUNCTUATION)
+            if word.startswith(("http://", "https://")) and normalize_url(word) not in fetched:
+                fetched.add(normalize_url(word))
+                urls.append(word)
+        if urls:
+            videos = [url for url in urls if "youtube.com" in url or "youtu.be" in url]
+            pages = [url for url in urls if url not in videos]
+            if pages and trafilatura:
+                add(self.crawler.crawl(pages, query))
+            elif pages:
+                add([{"source": "System", "content": "Trafilatura library not installed."}])
+            add(self.fetcher.fetch_all(videos, self._acquire_source))
+            check_cancel()
+            state["urls"].extend(urls)
+            stats = self.cache.stats()
+            print(f"  [Researcher] Content cache: {stats['hits']} hit(s), {stats['revalidated']} revalidated, "
+                  f"{stats['misses']} miss(es).")
+        
+        # 2. LocalRecall Search
+        # Ingest new/changed local documents (unless ingestion runs at startup or in the background)
+        if Config.INGEST_MODE == "mission" and not prior:
+             self._ingest_docs()
+        
+        # Search existing knowledge (once per distinct query)
+        normalized = " ".join(query.lower().split())
+        if normalized not in state["queries"]:
+            with telemetry.span("recall.search", kind=self.recall_client.backend):
+                results = self.recall_client.search(self.collection_name, query, limit=5)
+            state["queries"].append(normalized)
+            for item in results or []:
+                text = item.get('text') or item.get('content') or str(item)
+                source = item.get('file') or item.get('metadata', {}).get('source', 'Unknown')
+                add([{"source": f"LocalMemory ({source})", "content": text}])
+        return state
+
+    def _acquire_source(self, url: str) -> Dict:
+        """Routes a single URL to the matching extractor."""
+        if "youtube.com" in url or "youtu.be" in url:
+            return self._get_youtube_transcript(url)
+        return self._scrape_url(url)
+
     def _scrape_url(self, url: str) -> Dict:
-        """Uses Trafilatura to extract text from news sites."""
+        """
+        Extracts one page's text: served from the content cache when fresh,
+        revalidated with ETag/Last-Modified when stale, otherwise downloaded
+        (capped at CRAWL_MAX_PAGE_BYTES) and extracted in the crawler's process pool.
+        """
         if not trafilatura:
             return {"source": "System", "content": "Trafilatura library not installed."}
-        
-        print(f"  [Researcher] Scraping target: {url}")
         try:
-            downloaded = trafilatura.fetch_url(url)
-            if downloaded:
-                text = trafilatura.extract(downloaded)
-                if text:
-                    return {"source": f"WebScrape ({url})", "content": text[:2000]} # Limit context
+            return self._web_finding(url, self.crawler.page(url))
         except Exception as e:
             print(f"  [Researcher] Scraping failed: {e}")
         return None
 
+    def _web_finding(self, url: str, text: str) -> Dict:
+        if text:
+            return {"source": f"WebScrape ({url})", "content": text} # Sized by the analyst's context packer
+        return None
+
     def _get_youtube_transcript(self, url: str) -> Dict:
-        """Uses youtube-transcript-api to get video text."""
+        """Uses youtube-transcript-api to get video text (cached by video id)."""
         if not YouTubeTranscriptApi:
              return {"source": "System", "content": "YouTube Transcript API not installed."}
              
         try:
             video_id = url.split("v=")[-1].split("&")[0]
-            print(f"  [Researcher] Extracting transcript for Video ID: {video_id}")
-            transcript = YouTubeTranscriptApi.get_transcript(video_id)
-            full_text = " ".join([entry['text'] for entry in transcript])
-            return {"source": f"YouTube ({video_id})", "content": full_text[:2000]}
+            key = f"youtube:{video_id}"
+            cached = self.cache.get(key)
+            if cached and cached["fresh"]:
+                self.cache.record("hits")
+                full_text = cached["extracted"]
+            else:
+                print(f"  [Researcher] Extracting transcript for Video ID: {video_id}")
+                with telemetry.span("fetch", kind="youtube", video=video_id):
+                    transcript = YouTubeTranscriptApi.get_transcript(video_id)
+                telemetry.incr("fetched_bytes", len(json.dumps(transcript)), kind="youtube")
+                full_text = " ".join([entry['text'] for entry in transcript])
+                self.cache.record("misses")
+                self.cache.put(key, json.dumps(transcript), full_text)
+            return {"source": f"YouTube ({video_id})", "content": full_text}
         except Exception as e:
             print(f"  [Researcher] Transcript extraction failed: {e}")
         return None
 
+    def start_ingestion(self):
+        """Runs docs ingestion up front when INGEST_MODE is 'startup' or 'background'."""
+        if Config.INGEST_MODE == "startup":
+            self._ingest_docs()
+        elif Config.INGEST_MODE == "background":
+            self.ingestor.start_background()
+
     def _ingest_docs(self):
-        """Walks the doc path and uploads supported files to LocalRecall."""
+        """Syncs the doc path into LocalRecall, uploading only new or changed files."""
         if not self.docs_path: return
-        for root, _, files in os.walk(self.docs_path):
-            for file in files:
-                if file.lower().endswith(('.pdf', '.txt', '.md')):
-                    path = os.path.join(root, file)
-                    self.recall_client.upload_file(self.collection_name, path)
+        self.ingestor.sync()
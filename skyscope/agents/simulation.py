@@ -1,41 +1,58 @@
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
 from ..utils.config import Config
+from ..utils.context_packer import ContextPacker
+from ..utils.openrouter_client import OpenRouterClient, is_failure
+from ..utils.telemetry import carry_context, telemetry
+
+# Fan-out branches: (name, focus). "dimensions" splits the simulation by strategic
+# dimension, "perspectives" by geopolitical viewpoint (SIMULATION_FANOUT).
+DIMENSIONS = [
+    ("Economic & Financial", "trade routes, sanctions, benefits, land worth, capital and commodity flows"),
+    ("Technological", "technological supremacy, military and industrial capability, supply chains"),
+    ("Geographical & Historical", "geography, historical precedent, blood lost and sacrifices made"),
+    ("Political", "political posturing, alliances and alignments, domestic pressures"),
+]
+PERSPECTIVES = [
+    ("Western", "the United States, the EU and NATO members"),
+    ("Russian", "Russia and its close partners"),
+    ("Arabic", "the Gulf states and the wider Arab world"),
+    ("Asian", "China, India and other major Asian powers"),
+]
+
 
 class SimulationAgent:
     def __init__(self):
-        self.client = None
-        
-        # Priority: OpenRouter -> LocalAGI -> LocalAI -> None
-        if Config.OPENROUTER_API_KEY:
-             self.client = OpenAI(
-                base_url="https://openrouter.ai/api/v1",
-                api_key=Config.OPENROUTER_API_KEY,
-            )
-        elif Config.LOCALAGI_BASE_URL: # LocalAGI Fallback/Alternative
-             self.client = OpenAI(
-                base_url=f"{Config.LOCALAGI_BASE_URL}/v1",  # Assuming OpenAI compat endpoint
-                api_key="sk-localagi",
-            )
-             # Update model name for LocalAGI if needed, or rely on its default
-        elif Config.LOCALAI_BASE_URL:
-             self.client = OpenAI(
-                base_url=Config.LOCALAI_BASE_URL,
-                api_key="sk-localai",
-            )
-
-    def run_simulation(self, query: str, context: list) -> str:
+        # Provider priority (OpenRouter -> LocalAGI -> LocalAI), health tracking and
+        # failover now live in the shared provider router behind the client.
+        self.client = OpenRouterClient(model_name=Config.MODEL_NAME)
+        self.packer = ContextPacker(model=Config.MODEL_NAME)
+
+    def run_simulation(self, query: str, context: list,
+                       on_token: Optional[Callable[[str], None]] = None,
+                       use_cache: bool = True) -> str:
         """
         Runs the strategic simulation using the specified model.
+        Pass `on_token` to stream the trajectory as it is generated.
+        Identical simulations are answered from the shared response cache
+        unless `use_cache` is False.
+
+        SIMULATION_MODE "fanout" runs one focused completion per branch
+        concurrently, then a short merge pass assembles the report (only the
+        merge streams); "single" asks for everything in one prompt.
         """
-        if not self.client and not Config.LOCALAI_BASE_URL:
+        if not self.client.router.providers:
             return "Simulation skipped: No OpenRouter API Key and no LocalAI URL provided."
 
-        # Construct a prompt that enforces the persona and strict constraints
+        if Config.SIMULATION_MODE == "fanout":
+            return self._run_fanout(query, context, on_token, use_cache)
+
+        context_str = self.packer.pack_text(query, context)
+
+        # Construct a prompt that enforces the persona and strict constraints.
+        # The fixed instructions come first so a local model can reuse their KV prefix across missions.
         prompt = f"""
         You are SKYSCOPE SENTINEL INTELLIGENCE.
-        Query: {query}
-        Context: {context}
-        
         Perform a high-level strategic simulation considering:
         1. Economic & Financial Systems (Trade routes, benefits, land worth)
         2. Technological Supremacy
@@ -45,42 +62,89 @@ class SimulationAgent:
         Leverage multi-perspective analysis (Western, Russian, Arabic, etc.).
         
         Output a detailed strategic trajectory report.
+
+        Query: {query}
+        Context:
+        {context_str}
         """
         
-        try:
-            if self.client:
-                # Use OpenRouter
-                response = self.client.chat.completions.create(
-                    model=Config.MODEL_NAME,
-                    messages=[
-                        {"role": "system", "content": "You are a highly advanced strategic AI simulator."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    extra_headers={
-                        "HTTP-Referer": "https://skyscope.ai", # Required by OpenRouter
-                        "X-Title": "Skyscope",
-                    },
-                )
-            else:
-                # Use LocalAI
-                # LocalAI is compatible with OpenAI client but requires a different base URL
-                # We can instantitate a temporary client or allow self.client to be LocalAI if configured differently.
-                # Here we create a local client on the fly or used requests if preferred, 
-                # but better to use OpenAI client pointed to localhost.
-                
-                local_client = OpenAI(
-                    base_url=Config.LOCALAI_BASE_URL,
-                    api_key="sk-xxx" # LocalAI doesn't strictly need a real key unless secured
-                )
-                response = local_client.chat.completions.create(
-                    model=Config.LOCAL_MODEL_NAME,
-                    messages=[
-                        {"role": "system", "content": "You are a highly advanced strategic AI simulator."},
-                        {"role": "user", "content": prompt}
-                    ]
-                )
-            
-            return response.choices[0].message.content
-            return response.choices[0].message.content
-        except Exception as e:
-            return f"Simulation failed: {str(e)}"
+        messages = [
+            {"role": "system", "content": "You are a highly advanced strategic AI simulator."},
+            {"role": "user", "content": prompt}
+        ]
+
+        # temperature=None keeps each provider's default sampling, as before
+        return self.client.chat_completion(messages, temperature=None, on_token=on_token, use_cache=use_cache)
+
+    def _run_fanout(self, query: str, context: list, on_token: Optional[Callable[[str], None]],
+                    use_cache: bool) -> str:
+        branches = PERSPECTIVES if Config.SIMULATION_FANOUT == "perspectives" else DIMENSIONS
+        kind = "perspective" if branches is PERSPECTIVES else "dimension"
+        print(f"  [Simulator] Fan-out: {len(branches)} {kind} branch(es) in parallel.")
+
+        # Wall-clock ~ the slowest branch plus the merge
+        with ThreadPoolExecutor(max_workers=min(len(branches), Config.SIMULATION_MAX_WORKERS),
+                                thread_name_prefix="skyscope-sim") as pool:
+            run_branch = carry_context(self._run_branch) # Branch spans nest under the simulation
+            futures = [pool.submit(run_branch, query, context, kind, name, focus, use_cache)
+                       for name, focus in branches]
+            results: List[Tuple[str, str]] = []
+            for (name, _), future in zip(branches, futures):
+                results.append((name, future.result()))
+                if on_token:
+                    on_token(f"[{name} {kind} ready]\n")
+
+        notes = [(name, text) for name, text in results if not is_failure(text)]
+        if not notes:
+            # Every branch failed: surface the first error as the trajectory
+            return results[0][1]
+        if len(notes) < len(results):
+            print(f"  [Simulator] {len(results) - len(notes)} branch(es) failed; merging the rest.")
+
+        merged = self._merge(query, kind, notes, on_token, use_cache)
+        if is_failure(merged):
+            print("  [Simulator] Merge pass failed; returning the branch reports.")
+            return "\n\n".join(f"## {name}\n{text.strip()}" for name, text in notes)
+        return merged
+
+    def _run_branch(self, query: str, context: list, kind: str, name: str, focus: str, use_cache: bool) -> str:
+        # Rank the context for this branch's focus so each one sees its most relevant passages
+        context_str = self.packer.pack_text(f"{query} {focus}", context)
+        prompt = f"""
+        You are SKYSCOPE SENTINEL INTELLIGENCE.
+        Simulate how the situation below develops over the next 6-18 months, strictly from one {kind}.
+        Be concrete: actors, mechanisms, indicators to watch, and a likelihood for each development.
+        Keep it under 250 words.
+
+        {kind.title()}: {name} ({focus})
+        Query: {query}
+        Context:
+        {context_str}
+        """
+        with telemetry.span("simulation.branch", kind=kind, branch=name):
+            return self.client.chat_completion([
+                {"role": "system", "content": "You are a highly advanced strategic AI simulator."},
+                {"role": "user", "content": prompt}
+            ], temperature=None, use_cache=use_cache)
+
+    def _merge(self, query: str, kind: str, notes: List[Tuple[str, str]],
+               on_token: Optional[Callable[[str], None]], use_cache: bool) -> str:
+        sections = "\n\n".join(f"[{name}]\n{text.strip()}" for name, text in notes)
+        prompt = f"""
+        You are SKYSCOPE SENTINEL INTELLIGENCE.
+        Assemble the {kind} simulations below into one strategic trajectory report:
+        1. Executive summary (3-4 sentences).
+        2. Key findings per {kind}.
+        3. Cross-cutting interactions and contradictions between them.
+        4. Two or three trajectories with likelihoods and early-warning indicators.
+        Do not invent facts that are not in the simulations.
+
+        Query: {query}
+        Simulations:
+        {sections}
+        """
+        with telemetry.span("simulation.merge", kind=kind):
+            return self.client.chat_completion([
+                {"role": "system", "content": "You are a highly advanced strategic AI simulator."},
+                {"role": "user", "content": prompt}
+            ], temperature=None, on_token=on_token, use_cache=use_cache)
@@ -0,0 +1,160 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from rich.console import Console
+
+from ..utils.config import Config
+from ..utils.fingerprint import content_hash, novel_sentences, sentence_fingerprints
+from ..utils.telemetry import telemetry
+
+console = Console()
+
+
+class WatchRunner:
+    """
+    Standing missions re-polled on a schedule, re-analyzed only on material change.
+
+    Each poll gathers the mission's sources (URLs in the instruction or its
+    "sources" list, plus a LocalRecall search) and fingerprints every finding:
+    an exact content hash plus a SimHash per sentence. A sentence is new when no
+    earlier sentence of that source is within WATCH_SIMHASH_DISTANCE bits of it,
+    so churn like updated timestamps or counters doesn't count. A source has
+    changed materially when its new sentences reach WATCH_MIN_NEW_CHARS. Quiet
+    polls cost a revalidation per source and no LLM calls.
+
+    On change, the analyst sees only the new sentences plus the previous
+    assessment, and the simulation (and, with WATCH_ARTIFACTS, the PDF and
+    video) is re-run from the updated assessment. Per-mission state lives in
+    WATCH_DIR/<id>.json.
+    """
+
+    def __init__(self, orchestrator, workers: int = 4, state_dir: str = None):
+        self.orchestrator = orchestrator
+        self.workers = max(1, workers)
+        self.state_dir = state_dir or Config.WATCH_DIR
+        self._lock = threading.Lock()
+
+    def run(self, missions: List[Dict], interval: float = None, cycles: Optional[int] = None):
+        """Polls every mission each `interval` seconds (or its own "interval") until `cycles` polls or Ctrl+C."""
+        interval = interval or Config.WATCH_INTERVAL
+        console.print(f"[bold cyan]Watch:[/bold cyan] {len(missions)} standing mission(s), every {interval:.0f}s.")
+        due = {mission["id"]: 0.0 for mission in missions}
+        polls = {mission["id"]: 0 for mission in missions}
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="skyscope-watch") as pool:
+                while True:
+                    now = time.monotonic()
+                    ready = [m for m in missions if due[m["id"]] <= now
+                             and (cycles is None or polls[m["id"]] < cycles)]
+                    if ready:
+                        list(pool.map(self.poll, ready))
+                        for mission in ready:
+                            polls[mission["id"]] += 1
+                            due[mission["id"]] = time.monotonic() + float(mission.get("interval", interval))
+                    # Missions that used up their cycles no longer set the pace
+                    active = [due[m["id"]] for m in missions if cycles is None or polls[m["id"]] < cycles]
+                    if not active:
+                        break
+                    time.sleep(max(0.0, min(active) - time.monotonic()))
+        except KeyboardInterrupt:
+            console.print("[yellow]Watch stopped.[/yellow]")
+        self.orchestrator.wait_for_artifacts()
+
+    def poll(self, mission: Dict) -> Dict:
+        """One poll of one standing mission. Returns {"id", "changed", "delta": [findings]}."""
+        state = self._load(mission["id"]) or {"id": mission["id"], "instruction": mission["instruction"],
+                                              "fingerprints": {}, "assessment": None, "trajectory": None,
+                                              "runs": 0, "updated_at": None}
+        query = " ".join([mission["instruction"]] + list(mission.get("sources", [])))
+        with telemetry.span("watch.poll", mission=mission["id"]) as span:
+            try:
+                findings = self.orchestrator.researcher.gather(query)["findings"]
+            except Exception as e:
+                console.print(f"[red]Watch {mission['id']}: poll failed: {e}[/red]")
+                span.set(outcome="error")
+                return {"id": mission["id"], "changed": False, "delta": []}
+
+            delta, fingerprints = self._diff(state["fingerprints"], findings)
+            changed = bool(delta) or state["assessment"] is None
+            span.set(outcome="changed" if changed else "quiet", delta=len(delta))
+        telemetry.incr("watch_polls", outcome="changed" if changed else "quiet")
+
+        if not changed:
+            console.print(f"[dim]Watch {mission['id']}: no material change ({len(findings)} source(s)).[/dim]")
+            # The baseline stays put, so small additions accumulate until they are material
+            return {"id": mission["id"], "changed": False, "delta": []}
+
+        console.print(f"[bold cyan]Watch {mission['id']}:[/bold cyan] {len(delta)} changed source(s); re-assessing.")
+        if self._reassess(mission, state, findings if state["assessment"] is None else delta):
+            state["fingerprints"] = fingerprints
+            self._save(state)
+        return {"id": mission["id"], "changed": True, "delta": delta}
+
+    def _diff(self, previous: Dict, findings: List[Dict]):
+        """Returns (material delta findings with only their new sentences, new fingerprints)."""
+        delta, fingerprints = [], {}
+        for item in findings:
+            source, text = item.get("source", "Unknown"), str(item.get("content", ""))
+            # Several recall hits can share a file name
+            key, n = source, 1
+            while key in fingerprints:
+                n += 1
+                key = f"{source} #{n}"
+            before = previous.get(key)
+            digest = content_hash(text)
+            if before and before["hash"] == digest:
+                fingerprints[key] = before
+                continue
+            sentences = sentence_fingerprints(text)
+            fingerprints[key] = {"hash": digest, "sentences": [h for _, h in sentences]}
+            new_text = " ".join(novel_sentences(sentences, before["sentences"] if before else [],
+                                                Config.WATCH_SIMHASH_DISTANCE))
+            if len(new_text) >= Config.WATCH_MIN_NEW_CHARS:
+                delta.append({"source": source, "content": new_text})
+        return delta, fingerprints
+
+    def _reassess(self, mission: Dict, state: Dict, intel: List[Dict]) -> bool:
+        instruction = mission["instruction"]
+        if state["assessment"]:
+            # Delta plus the last assessment: the model revises rather than re-reads everything
+            intel = [{"source": f"Previous Assessment ({state['updated_at']})", "content": state["assessment"]}] + \
+                    [{"source": f"NEW {item['source']}", "content": item["content"]} for item in intel]
+        with telemetry.span("analysis", mission=mission["id"]):
+            insights = self.orchestrator.analyst.analyze(instruction, intel)
+        with telemetry.span("simulation", mission=mission["id"]):
+            trajectory = self.orchestrator.simulator.run_simulation(
+                instruction, [{"content": insights, "source": "Skyscope Analyst Swarm"}])
+        failure = next((text for text in (insights, trajectory) if self.orchestrator.is_failure(text)), None)
+        if failure:
+            # Keep the last good assessment and fingerprints; the same delta is retried on the next poll
+            console.print(f"[red]Watch {mission['id']}: re-assessment failed: {failure[:120]}[/red]")
+            return False
+        state["assessment"], state["trajectory"] = insights, trajectory
+        state["runs"] += 1
+        state["updated_at"] = time.strftime("%Y-%m-%d %H:%M")
+        if Config.WATCH_ARTIFACTS:
+            self.orchestrator.generate_artifacts(instruction, insights, trajectory)
+        telemetry.flush()
+        return True
+
+    def _load(self, mission_id: str) -> Optional[Dict]:
+        try:
+            with open(self._file(mission_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, state: Dict):
+        with self._lock:
+            os.makedirs(self.state_dir, exist_ok=True)
+            tmp_path = f"{self._file(state['id'])}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self._file(state["id"]))
+
+    def _file(self, mission_id: str) -> str:
+        return os.path.join(self.state_dir, f"{mission_id}.json")
@@ -0,0 +1,33 @@
+from typing import Dict
+
+# Artifact render jobs. The orchestrator runs these in worker processes, so they
+# must stay module-level (picklable) and build their generators inside the worker.
+# Generators are cached per process so models (e.g. TTS) stay warm between missions.
+_generators: Dict = {}
+
+
+def render_pdf(filename: str, query: str, trajectory: str, intel_context: list, output_dir: str = ".") -> str:
+    key = ("pdf", output_dir)
+    if key not in _generators:
+        from .pdf_generator import PDFReportGenerator
+        _generators[key] = PDFReportGenerator(output_dir)
+    return _generators[key].generate(filename, query, trajectory, intel_context)
+
+
+def render_video(filename: str, trajectory: str, output_dir: str = ".") -> str:
+    key = ("video", output_dir)
+    if key not in _generators:
+        from ..video.generator import VideoGenerator
+        _generators[key] = VideoGenerator(output_dir)
+    return _generators[key].generate(filename, trajectory)
+
+
+def warm_up(output_dir: str = ".", video: bool = True) -> bool:
+    """Imports the renderers and builds the generators in a worker ahead of the first mission."""
+    if ("pdf", output_dir) not in _generators:
+        from .pdf_generator import PDFReportGenerator
+        _generators[("pdf", output_dir)] = PDFReportGenerator(output_dir)
+    if video and ("video", output_dir) not in _generators:
+        from ..video.generator import VideoGenerator
+        _generators[("video", output_dir)] = VideoGenerator(output_dir)
+    return True
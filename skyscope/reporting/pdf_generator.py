@@ -1,8 +1,8 @@
 import time
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Frame, PageTemplate
-from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Frame, PageTemplate, PageBreak
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from .persona import Persona
 from reportlab.lib.enums import TA_JUSTIFY, TA_CENTER
 
@@ -35,7 +35,56 @@ class PDFReportGenerator:
             textColor=colors.gray
         ))
 
-        
+    def _watermark(self, canvas, doc):
+        """Top-right provenance watermark and footer on every page."""
+        canvas.saveState()
+        canvas.setFont('Helvetica', 7)
+        canvas.setFillColor(colors.gray)
+        width, height = A4
+        stamp = time.strftime("%Y-%m-%d - %H:%M:%S GMT", time.gmtime())
+        canvas.drawRightString(width - 20, height - 20, f"{Persona.TITLE} - Intelligence Report - {stamp}")
+        canvas.drawCentredString(width / 2, 20, f"{Persona.TITLE} | {Persona.EMAIL} | Page {doc.page}")
+        canvas.restoreState()
+
+    def generate(self, filename, query, simulation_content, intel_context):
+        """
+        Builds the watermarked trajectory report:
+        title page, intelligence summary, then the strategic simulation.
+        """
+        doc = SimpleDocTemplate(
+            f"{self.output_dir}/{filename}",
+            pagesize=A4,
+            rightMargin=72, leftMargin=72,
+            topMargin=72, bottomMargin=72
+        )
+        Story = []
+
+        # Title Page
+        Story.append(Spacer(1, 100))
+        Story.append(Paragraph("CLASSIFIED INTELLIGENCE<br/>TRAJECTORY REPORT", self.styles['ReportTitle']))
+        Story.append(Spacer(1, 40))
+        Story.append(Paragraph(f"SUBJECT: {query.upper()}", self.styles['Heading2']))
+        Story.append(Spacer(1, 12))
+        Story.append(Paragraph(f"DATE: {time.strftime('%Y-%m-%d %H:%M:%S')}", self.styles['Normal']))
+        Story.append(Spacer(1, 40))
+        Story.append(Paragraph(f"PREPARED BY: {Persona.NAME}", self.styles['Heading4']))
+        Story.append(Paragraph(Persona.TITLE, self.styles['Normal']))
+        Story.append(Paragraph(f"ABN: {Persona.ABN}", self.styles['Normal']))
+        Story.append(Paragraph(f"{Persona.ROLE} | {Persona.EMAIL}", self.styles['FooterData']))
+        Story.append(PageBreak())
+
+        # Intelligence Summary
+        Story.append(Paragraph("1. Intelligence Summary", self.styles['Heading1']))
+        Story.append(Paragraph(
+            f"The following analysis leverages {len(intel_context)} verified intelligence vectors "
+            f"including Russian, Western, and Independent sources.",
+            self.styles['Justify']
+        ))
+        Story.append(Spacer(1, 12))
+        for item in intel_context:
+            Story.append(Paragraph(f"<b>{item.get('source', 'Unknown')}:</b> {item.get('content', '')}", self.styles['Justify']))
+            Story.append(Spacer(1, 6))
+
         Story.append(PageBreak())
 
         # Strategic Simulation
@@ -50,5 +99,5 @@ class PDFReportGenerator:
                 Story.append(Spacer(1, 6))
 
         # Build
-        doc.build(Story)
+        doc.build(Story, onFirstPage=self._watermark, onLaterPages=self._watermark)
         return f"{self.output_dir}/{filename}"
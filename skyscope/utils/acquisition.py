@@ -0,0 +1,105 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from .cancellation import check_cancel
+from .config import Config
+from .telemetry import carry_context
+
+
+class SourceFetcher:
+    """
+    Bounded worker pool for acquiring research sources concurrently.
+
+    - At most `max_workers` sources are in flight at once.
+    - At most `per_host_limit` of those target the same host.
+    - Each source gets `source_timeout` seconds once it starts; the whole
+      stage gets `stage_timeout` seconds. Late sources are abandoned, not awaited.
+    - Results come back in the order the sources were given.
+    """
+
+    def __init__(self, max_workers: int = None, per_host_limit: int = None,
+                 source_timeout: float = None, stage_timeout: float = None):
+        self.max_workers = max_workers or Config.RESEARCH_MAX_WORKERS
+        self.per_host_limit = per_host_limit or Config.RESEARCH_PER_HOST_LIMIT
+        self.source_timeout = source_timeout or Config.RESEARCH_SOURCE_TIMEOUT
+        self.stage_timeout = stage_timeout or Config.RESEARCH_STAGE_TIMEOUT
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def fetch_all(self, sources: List[str], fetch_fn: Callable[[str], Optional[Dict]]) -> List[Dict]:
+        """
+        Runs `fetch_fn` over every source and returns the non-empty results
+        in source order. Duplicate sources are fetched once.
+        """
+        sources = list(dict.fromkeys(sources))
+        if not sources:
+            return []
+
+        results: Dict[int, Dict] = {}
+        started: Dict[int, float] = {}
+        stage_deadline = time.monotonic() + self.stage_timeout
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(sources)),
+                                      thread_name_prefix="skyscope-fetch")
+        run = carry_context(self._run) # Fetch spans nest under the caller's
+        try:
+            pending = {
+                executor.submit(run, index, source, fetch_fn, started): index
+                for index, source in enumerate(sources)
+            }
+            while pending:
+                check_cancel()
+                now = time.monotonic()
+                if now >= stage_deadline:
+                    break
+
+                # Abandon sources that have exceeded their own deadline
+                for future, index in list(pending.items()):
+                    if index in started and now - started[index] >= self.source_timeout:
+                        print(f"  [Researcher] Source deadline exceeded: {sources[index]}")
+                        del pending[future]
+
+                # Sleep until the next completion or the nearest deadline
+                deadlines = [stage_deadline] + [
+                    started[index] + self.source_timeout
+                    for index in pending.values() if index in started
+                ]
+                timeout = max(0.0, min(deadlines) - now)
+                # Queued sources have no start time yet; re-check periodically
+                if any(index not in started for index in pending.values()):
+                    timeout = min(timeout, 0.25)
+                done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"  [Researcher] Acquisition failed for {sources[index]}: {e}")
+                        continue
+                    if result:
+                        results[index] = result
+
+            if pending:
+                print(f"  [Researcher] Stage deadline reached; abandoning {len(pending)} source(s).")
+        finally:
+            # Do not block on abandoned sources; queued ones are cancelled outright
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return [results[index] for index in sorted(results)]
+
+    def _run(self, index: int, source: str, fetch_fn: Callable, started: Dict[int, float]):
+        with self._host_slot(source):
+            started[index] = time.monotonic()
+            return fetch_fn(source)
+
+    def _host_slot(self, source: str) -> threading.BoundedSemaphore:
+        host = (urlsplit(source).hostname or source).lower()
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return slot
@@ -0,0 +1,35 @@
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+# The running mission's cancel event. A context variable, so it follows the mission into
+# pool workers that run through telemetry.carry_context (router calls, branches, crawls)
+_cancel_event: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "skyscope_cancel", default=None)
+
+
+class MissionCancelled(Exception):
+    """Raised inside a mission whose `cancel` event was set (task cancelled or timed out)."""
+
+
+@contextmanager
+def cancel_scope(event: Optional[threading.Event]):
+    """Makes `event` the cancellation signal for everything run in this context."""
+    token = _cancel_event.set(event)
+    try:
+        yield
+    finally:
+        _cancel_event.reset(token)
+
+
+def cancellable() -> bool:
+    """Whether the current context belongs to a mission that can be cancelled."""
+    return _cancel_event.get() is not None
+
+
+def check_cancel():
+    """Raises MissionCancelled if the current mission has been cancelled; a no-op outside one."""
+    event = _cancel_event.get()
+    if event is not None and event.is_set():
+        raise MissionCancelled("Mission cancelled.")
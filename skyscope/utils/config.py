@@ -17,9 +17,147 @@ class Config:
     LOCALAGI_BASE_URL = os.getenv("LOCALAGI_BASE_URL", "http://localhost:3000")
 
     MCP_CONFIG_PATH = os.getenv("MCP_CONFIG_PATH", "./untitled.txt")
-    
+
+    # Shared HTTP transport: pool sizes, timeouts (seconds) and retry/backoff on 429/5xx
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+    HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+    HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+    HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+    HTTP_BACKOFF_JITTER = float(os.getenv("HTTP_BACKOFF_JITTER", "0.5"))
+
+    # Provider router: priority order, timeouts/hedging (seconds), circuit breaker and health probes
+    ROUTER_PROVIDERS = os.getenv("ROUTER_PROVIDERS", "openrouter,localagi,localai,embedded")
+    ROUTER_TIMEOUT = float(os.getenv("ROUTER_TIMEOUT", "60"))
+    ROUTER_HEDGE_DEFAULT = float(os.getenv("ROUTER_HEDGE_DEFAULT", "20"))  # used until enough samples for a p95
+    ROUTER_MIN_SAMPLES = int(os.getenv("ROUTER_MIN_SAMPLES", "5"))
+    ROUTER_WINDOW = int(os.getenv("ROUTER_WINDOW", "50"))
+    ROUTER_BREAKER_THRESHOLD = int(os.getenv("ROUTER_BREAKER_THRESHOLD", "3"))
+    ROUTER_BREAKER_COOLDOWN = float(os.getenv("ROUTER_BREAKER_COOLDOWN", "30"))
+    ROUTER_PROBE_INTERVAL = float(os.getenv("ROUTER_PROBE_INTERVAL", "30"))  # 0 disables probes
+    ROUTER_MAX_WORKERS = int(os.getenv("ROUTER_MAX_WORKERS", "16"))
+
+    # Embedded LLM (the bundled Qwen GGUF via llama-cpp-python): kept loaded for the process,
+    # with a RAM cache of prompt-prefix KV states. 0 threads lets llama.cpp pick.
+    EMBEDDED_LLM_PATH = os.getenv("EMBEDDED_LLM_PATH", "models/qwen2.5-0.5b-instruct.gguf")
+    EMBEDDED_LLM_CONTEXT = int(os.getenv("EMBEDDED_LLM_CONTEXT", "8192"))
+    EMBEDDED_LLM_BATCH = int(os.getenv("EMBEDDED_LLM_BATCH", "512"))
+    EMBEDDED_LLM_THREADS = int(os.getenv("EMBEDDED_LLM_THREADS", "0"))
+    EMBEDDED_LLM_BATCH_THREADS = int(os.getenv("EMBEDDED_LLM_BATCH_THREADS", "0"))
+    EMBEDDED_LLM_MAX_TOKENS = int(os.getenv("EMBEDDED_LLM_MAX_TOKENS", "1024"))
+    EMBEDDED_LLM_PREFIX_CACHE_MB = int(os.getenv("EMBEDDED_LLM_PREFIX_CACHE_MB", "512"))
+
+    # Research acquisition: concurrent source fetching limits (seconds for timeouts)
+    RESEARCH_MAX_WORKERS = int(os.getenv("RESEARCH_MAX_WORKERS", "8"))
+    RESEARCH_PER_HOST_LIMIT = int(os.getenv("RESEARCH_PER_HOST_LIMIT", "2"))
+    RESEARCH_SOURCE_TIMEOUT = float(os.getenv("RESEARCH_SOURCE_TIMEOUT", "20"))
+    RESEARCH_STAGE_TIMEOUT = float(os.getenv("RESEARCH_STAGE_TIMEOUT", "45"))
+    # Crawl from the instruction's URLs (and RSS/Atom/sitemap feeds): links on the same sites up to
+    # CRAWL_MAX_DEPTH, CRAWL_MAX_PAGES per mission, downloads capped at CRAWL_MAX_PAGE_BYTES,
+    # CRAWL_DOMAIN_DELAY seconds between requests to a host; extraction in CRAWL_EXTRACT_WORKERS processes
+    CRAWL_MAX_DEPTH = int(os.getenv("CRAWL_MAX_DEPTH", "1"))
+    CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", "12"))
+    CRAWL_MAX_PAGE_BYTES = int(os.getenv("CRAWL_MAX_PAGE_BYTES", str(2 * 1024 * 1024)))
+    CRAWL_DOMAIN_DELAY = float(os.getenv("CRAWL_DOMAIN_DELAY", "0.5"))
+    CRAWL_EXTRACT_WORKERS = int(os.getenv("CRAWL_EXTRACT_WORKERS", "2"))
+    CRAWL_RESPECT_ROBOTS = os.getenv("CRAWL_RESPECT_ROBOTS", "1") not in ("0", "false", "False")
+    # Start URL fetching, ingestion and a search on the raw instruction while the blueprint is written
+    RESEARCH_SPECULATIVE = os.getenv("RESEARCH_SPECULATIVE", "1") not in ("0", "false", "False")
+
+    # On-disk cache for scraped pages and transcripts (TTL in seconds)
+    CONTENT_CACHE_DIR = os.getenv("CONTENT_CACHE_DIR", "./.skyscope/cache")
+    CONTENT_CACHE_TTL = float(os.getenv("CONTENT_CACHE_TTL", "1800"))
+    CONTENT_CACHE_MAX_BYTES = int(os.getenv("CONTENT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+    # LLM response cache (shares CONTENT_CACHE_DIR); set LLM_CACHE_ENABLED=0 to bypass globally
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") not in ("0", "false", "False")
+    LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", str(24 * 3600)))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+
+    # Prompt context packing: sources are chunked, ranked against the query and
+    # packed into a per-model token budget (MODEL_CONTEXT_BUDGETS, else this default)
+    CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "6000"))
+    CONTEXT_CHUNK_TOKENS = int(os.getenv("CONTEXT_CHUNK_TOKENS", "256"))
+
+    # Retrieval backend: "localrecall" (Docker service), "embedded" (in-process index)
+    # or "auto" (LocalRecall when it answers, otherwise embedded)
+    RECALL_BACKEND = os.getenv("RECALL_BACKEND", "auto")
+    EMBEDDED_RECALL_DIR = os.getenv("EMBEDDED_RECALL_DIR", "./.skyscope/recall")
+    EMBEDDED_RECALL_MODE = os.getenv("EMBEDDED_RECALL_MODE", "hybrid") # "bm25", "dense" or "hybrid"
+    EMBEDDED_RECALL_DENSE_DIM = int(os.getenv("EMBEDDED_RECALL_DENSE_DIM", "256")) # 0 disables dense vectors
+    EMBEDDED_RECALL_CHUNK_TOKENS = int(os.getenv("EMBEDDED_RECALL_CHUNK_TOKENS", "200"))
+    EMBEDDED_RECALL_MAX_SEGMENTS = int(os.getenv("EMBEDDED_RECALL_MAX_SEGMENTS", "32"))
+    EMBEDDED_RECALL_MERGE_FACTOR = int(os.getenv("EMBEDDED_RECALL_MERGE_FACTOR", "4")) # segments per tiered merge
+
+    # Incremental ingestion of the intel docs directory into LocalRecall.
+    # INGEST_MODE: "mission" (before each search), "startup" (once, blocking) or "background" (once, async)
+    INGEST_MODE = os.getenv("INGEST_MODE", "mission")
+    INGEST_MANIFEST_DIR = os.getenv("INGEST_MANIFEST_DIR", "./.skyscope/ingest")
+    INGEST_MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", "4"))
+    INGEST_RETRIES = int(os.getenv("INGEST_RETRIES", "2"))
+
+    # Artifact rendering: PDF + video in a background process pool (0/false renders inline)
+    ARTIFACTS_IN_BACKGROUND = os.getenv("ARTIFACTS_IN_BACKGROUND", "1") not in ("0", "false", "False")
+    ARTIFACT_WORKERS = int(os.getenv("ARTIFACT_WORKERS", "2"))
+
+    # Analysis: "auto" condenses intel that overflows the model budget map-reduce style (batches of
+    # ANALYSIS_BATCH_TOKENS -> notes, up to ANALYSIS_MAX_LEVELS), "mapreduce" always does, "single" never
+    ANALYSIS_MODE = os.getenv("ANALYSIS_MODE", "auto")
+    ANALYSIS_BATCH_TOKENS = int(os.getenv("ANALYSIS_BATCH_TOKENS", "2000"))
+    ANALYSIS_NOTE_WORDS = int(os.getenv("ANALYSIS_NOTE_WORDS", "200"))
+    ANALYSIS_MAX_LEVELS = int(os.getenv("ANALYSIS_MAX_LEVELS", "3"))
+    ANALYSIS_MAX_WORKERS = int(os.getenv("ANALYSIS_MAX_WORKERS", "8"))
+
+    # Simulation: "fanout" (one concurrent completion per branch + a merge pass) or "single" (one prompt).
+    # SIMULATION_FANOUT picks the branches: "dimensions" (economic, technological, ...) or "perspectives"
+    SIMULATION_MODE = os.getenv("SIMULATION_MODE", "fanout")
+    SIMULATION_FANOUT = os.getenv("SIMULATION_FANOUT", "dimensions")
+    SIMULATION_MAX_WORKERS = int(os.getenv("SIMULATION_MAX_WORKERS", "4"))
+
+    # Async API (SwarmOrchestrator.run): missions in flight at once on one event loop
+    ASYNC_MAX_MISSIONS = int(os.getenv("ASYNC_MAX_MISSIONS", "16"))
+
+    # Mission checkpoints: each phase's output is stored so failed missions can resume
+    MISSION_CHECKPOINTS = os.getenv("MISSION_CHECKPOINTS", "1") not in ("0", "false", "False")
+    MISSION_STORE_DIR = os.getenv("MISSION_STORE_DIR", "./.skyscope/missions")
+
+    # Watch mode: standing missions polled every WATCH_INTERVAL seconds. A sentence is new when no earlier one
+    # is within WATCH_SIMHASH_DISTANCE bits (SimHash); a source changes once it has WATCH_MIN_NEW_CHARS of them
+    WATCH_INTERVAL = float(os.getenv("WATCH_INTERVAL", "3600"))
+    WATCH_DIR = os.getenv("WATCH_DIR", "./.skyscope/watch")
+    WATCH_SIMHASH_DISTANCE = int(os.getenv("WATCH_SIMHASH_DISTANCE", "16"))
+    WATCH_MIN_NEW_CHARS = int(os.getenv("WATCH_MIN_NEW_CHARS", "200"))
+    WATCH_ARTIFACTS = os.getenv("WATCH_ARTIFACTS", "1") not in ("0", "false", "False")
+
+    # Kokoro narration: sentences synthesized in parallel worker processes, cached per sentence
+    TTS_VOICE = os.getenv("TTS_VOICE", "af_sarah")
+    TTS_SPEED = float(os.getenv("TTS_SPEED", "1.0"))
+    TTS_WORKERS = int(os.getenv("TTS_WORKERS", str(min(4, os.cpu_count() or 1))))
+    TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "./.skyscope/tts")
+
+    # Telemetry: span/metric window for rolling quantiles, JSON-lines trace file,
+    # Prometheus textfile (rewritten after each mission) and /metrics port (empty/0 disables each)
+    TELEMETRY_WINDOW = int(os.getenv("TELEMETRY_WINDOW", "1000"))
+    TELEMETRY_JSONL_PATH = os.getenv("TELEMETRY_JSONL_PATH", "")
+    TELEMETRY_PROMETHEUS_PATH = os.getenv("TELEMETRY_PROMETHEUS_PATH", "")
+    TELEMETRY_PROMETHEUS_PORT = int(os.getenv("TELEMETRY_PROMETHEUS_PORT", "0"))
+
+    # Embedded model downloads (models/): concurrent, resumable, verified
+    MODEL_DOWNLOAD_WORKERS = int(os.getenv("MODEL_DOWNLOAD_WORKERS", "4"))
+    MODEL_DOWNLOAD_CHUNK = int(os.getenv("MODEL_DOWNLOAD_CHUNK", str(1024 * 1024)))
+
+    # Video briefings: "stills" (slides held over the narration, ffmpeg) or "moviepy" (per-frame composite)
+    VIDEO_RENDER_MODE = os.getenv("VIDEO_RENDER_MODE", "stills")
+    VIDEO_STILL_FPS = float(os.getenv("VIDEO_STILL_FPS", "2"))
+    VIDEO_PRESET = os.getenv("VIDEO_PRESET", "veryfast")
+
     MODEL_NAME = "nvidia/nemotron-nano-12b-v2-vl:free" # Remote
     LOCAL_MODEL_NAME = "gpt-4" # LocalAI often maps requests to loaded model regardless of name, or use specific local model name
+    MODEL_CONTEXT_BUDGETS = {
+        MODEL_NAME: CONTEXT_TOKEN_BUDGET,
+        LOCAL_MODEL_NAME: min(CONTEXT_TOKEN_BUDGET, 3000), # Local models usually run with a small context window
+    }
     
     @classmethod
     def validate(cls):
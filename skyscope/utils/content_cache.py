@@ -0,0 +1,130 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from .config import Config
+from .telemetry import telemetry
+
+# Query parameters that never change page content
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+# record() outcome -> telemetry label
+OUTCOMES = {"hits": "hit", "misses": "miss", "revalidated": "revalidated"}
+
+
+def normalize_url(url: str) -> str:
+    """Canonical cache key for a URL: lowercase host, no fragment, no tracking params, sorted query."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not ((scheme == "http" and parts.port == 80) or (scheme == "https" and parts.port == 443)):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+class ContentCache:
+    """
+    Persistent cache for acquired sources (scraped pages, transcripts).
+
+    Entries hold the raw download (zlib-compressed) plus the extracted text,
+    along with ETag/Last-Modified validators. Entries older than `ttl` are
+    stale: callers should revalidate them and call `touch` on a 304.
+    Total raw size is bounded by `max_bytes` with least-recently-used eviction.
+    """
+
+    def __init__(self, path: str = None, ttl: float = None, max_bytes: int = None):
+        self.path = path or os.path.join(Config.CONTENT_CACHE_DIR, "content.sqlite3")
+        self.ttl = ttl if ttl is not None else Config.CONTENT_CACHE_TTL
+        self.max_bytes = max_bytes if max_bytes is not None else Config.CONTENT_CACHE_MAX_BYTES
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "evictions": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                raw BLOB,
+                extracted TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                accessed_at REAL,
+                size INTEGER
+            )
+        """)
+        self._db.commit()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Returns the entry for `key` (fresh or stale) or None.
+        The entry's `fresh` flag tells callers whether revalidation is needed.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT raw, extracted, etag, last_modified, fetched_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+
+        raw, extracted, etag, last_modified, fetched_at = row
+        return {
+            "raw": zlib.decompress(raw).decode("utf-8", errors="replace") if raw else None,
+            "extracted": extracted,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fresh": now - fetched_at < self.ttl,
+        }
+
+    def put(self, key: str, raw: str, extracted: Optional[str], etag: str = None, last_modified: str = None):
+        """Stores a freshly downloaded source, then evicts down to the size bound."""
+        blob = zlib.compress(raw.encode("utf-8")) if raw else None
+        size = len(blob or b"") + len((extracted or "").encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, blob, extracted, etag, last_modified, now, now, size),
+            )
+            self._evict()
+            self._db.commit()
+
+    def touch(self, key: str):
+        """Marks a stale entry fresh again after a successful revalidation (HTTP 304)."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("UPDATE entries SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            self._db.commit()
+
+    def record(self, outcome: str):
+        """Counts a cache outcome: 'hits', 'misses' or 'revalidated'."""
+        with self._lock:
+            self._stats[outcome] += 1
+        telemetry.incr("cache_requests", cache="content", outcome=OUTCOMES[outcome])
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries, total = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+            return dict(self._stats, entries=entries, bytes=total)
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed_at ASC").fetchall():
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._stats["evictions"] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
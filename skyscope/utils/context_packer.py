@@ -0,0 +1,161 @@
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+from .config import Config
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
+WORD = re.compile(r"\w+", re.UNICODE)
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+@lru_cache(maxsize=None)
+def load_encoding(model: str):
+    """tiktoken encoding for `model`, or None when tiktoken or its BPE files are unavailable."""
+    if not tiktoken:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            # Non-OpenAI model names: cl100k is a close enough tokenizer for budgeting
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # First use downloads the BPE ranks; offline, fall back to the estimate
+        print(f"  [Context] tiktoken encoding unavailable ({type(e).__name__}); estimating tokens.")
+        return None
+
+
+def terms(text: str) -> List[str]:
+    return [t for t in WORD.findall(text.lower()) if t not in STOPWORDS]
+
+
+class ContextPacker:
+    """
+    Token-budgeted context builder for agent prompts.
+
+    Sources are split into sentence-aligned chunks of about `chunk_tokens`,
+    ranked against the query with BM25, and selected best-first (one chunk
+    per source before any source gets a second) until the model's budget is
+    full. Selected chunks are emitted in their original order so passages
+    still read naturally.
+    """
+
+    def __init__(self, model: str = None, budget: int = None, chunk_tokens: int = None):
+        self.model = model or Config.MODEL_NAME
+        self.budget = budget or Config.MODEL_CONTEXT_BUDGETS.get(self.model, Config.CONTEXT_TOKEN_BUDGET)
+        self.chunk_tokens = chunk_tokens or Config.CONTEXT_CHUNK_TOKENS
+
+    @property
+    def _encoding(self):
+        # Loading the BPE ranks takes ~100 ms (or a download), so it waits for the first count
+        return load_encoding(self.model)
+
+    def count(self, text: str) -> int:
+        if self._encoding:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        # Without tiktoken, ~4 characters per token is the usual English estimate
+        return max(1, math.ceil(len(text) / 4))
+
+    def chunk(self, text: str) -> List[str]:
+        """Splits text into chunks of at most ~chunk_tokens, breaking on sentence boundaries."""
+        chunks, current, size = [], [], 0
+        for sentence in SENTENCE_SPLIT.split(text):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            tokens = self.count(sentence)
+            if tokens > self.chunk_tokens:
+                # A single oversized sentence is cut into token windows
+                if current:
+                    chunks.append(" ".join(current))
+                    current, size = [], 0
+                chunks.extend(self._split_tokens(sentence))
+                continue
+            if size + tokens > self.chunk_tokens and current:
+                chunks.append(" ".join(current))
+                current, size = [], 0
+            current.append(sentence)
+            size += tokens
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+
+    def pack(self, query: str, sources: List[Dict], budget: int = None) -> List[Dict]:
+        """
+        Returns the selected chunks as [{"source", "content"}] within `budget`
+        tokens (formatted), in source order.
+        """
+        budget = budget or self.budget
+        candidates = []
+        for source_index, item in enumerate(sources):
+            for chunk_index, text in enumerate(self.chunk(str(item.get("content", "")))):
+                entry = {"source": item.get("source", "Unknown"), "content": text}
+                candidates.append({
+                    "key": (source_index, chunk_index),
+                    "entry": entry,
+                    "terms": terms(text),
+                    "tokens": self.count(self.format([entry])),
+                })
+        if not candidates:
+            return []
+
+        scores = self._bm25(terms(query), [c["terms"] for c in candidates])
+        ranked = sorted(range(len(candidates)), key=lambda i: (-scores[i], candidates[i]["key"]))
+
+        # Best chunk of every source first, then the remaining chunks by score
+        seen_sources, first, rest = set(), [], []
+        for i in ranked:
+            source_index = candidates[i]["key"][0]
+            (rest if source_index in seen_sources else first).append(i)
+            seen_sources.add(source_index)
+
+        selected, used = [], 0
+        for i in first + rest:
+            if used + candidates[i]["tokens"] <= budget:
+                selected.append(i)
+                used += candidates[i]["tokens"]
+
+        return [candidates[i]["entry"] for i in sorted(selected, key=lambda i: candidates[i]["key"])]
+
+    def pack_text(self, query: str, sources: List[Dict], budget: int = None) -> str:
+        return self.format(self.pack(query, sources, budget))
+
+    @staticmethod
+    def format(entries: List[Dict]) -> str:
+        return "\n".join(f"- [{entry['source']}] {entry['content']}" for entry in entries)
+
+    def _split_tokens(self, text: str) -> List[str]:
+        if self._encoding:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            return [self._encoding.decode(tokens[i:i + self.chunk_tokens])
+                    for i in range(0, len(tokens), self.chunk_tokens)]
+        width = self.chunk_tokens * 4
+        return [text[i:i + width] for i in range(0, len(text), width)]
+
+    @staticmethod
+    def _bm25(query_terms: List[str], docs: List[List[str]], k1: float = 1.5, b: float = 0.75) -> List[float]:
+        n = len(docs)
+        avg_len = (sum(len(d) for d in docs) / n) or 1.0
+        df = Counter(term for d in docs for term in set(d))
+        unique_query = set(query_terms)
+        scores = []
+        for d in docs:
+            tf = Counter(d)
+            score = 0.0
+            for term in unique_query:
+                if term not in tf:
+                    continue
+                idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+                score += idf * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * len(d) / avg_len))
+            scores.append(score)
+        return scores
@@ -0,0 +1,365 @@
+import heapq
+import multiprocessing
+import threading
+import time
+import xml.etree.ElementTree as ElementTree
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+from urllib.robotparser import RobotFileParser
+
+from .cancellation import check_cancel
+from .config import Config
+from .content_cache import ContentCache, normalize_url
+from .context_packer import terms
+from .telemetry import carry_context, telemetry
+from .transport import get_session, origin
+
+USER_AGENT = "Mozilla/5.0 (compatible; SkyscopeSentinel/1.0)"
+SKIP_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".pdf", ".zip", ".gz", ".mp3", ".mp4",
+                   ".css", ".js", ".ico", ".woff", ".woff2")
+FEED_HINTS = (".xml", ".rss", ".atom", "/feed", "/rss", "sitemap")
+
+trafilatura = None
+_trafilatura_loaded = False
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def is_feed(url: str) -> bool:
+    path = urlsplit(url).path.lower()
+    return any(hint in path for hint in FEED_HINTS)
+
+
+class _LinkParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links: List[List[str]] = []
+        self._anchor = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            href = dict(attrs).get("href")
+            self._anchor = [href, ""] if href else None
+            if self._anchor:
+                self.links.append(self._anchor)
+
+    def handle_endtag(self, tag):
+        if tag == "a":
+            self._anchor = None
+
+    def handle_data(self, data):
+        if self._anchor is not None:
+            self._anchor[1] += data
+
+
+def extract_page(raw: str, url: str, want_text: bool = True, want_links: bool = True):
+    """
+    Runs in an extraction worker process: main text (trafilatura) and
+    [(absolute url, anchor text)] links of one page.
+    """
+    global trafilatura, _trafilatura_loaded
+    text, links = None, []
+    if want_text:
+        if not _trafilatura_loaded:
+            try:
+                import trafilatura
+            except ImportError:
+                trafilatura = None
+            _trafilatura_loaded = True
+        text = trafilatura.extract(raw) if trafilatura else None
+    if want_links:
+        parser = _LinkParser()
+        try:
+            parser.feed(raw)
+        except Exception:
+            pass
+        links = [(urljoin(url, href.strip()), " ".join(anchor.split())) for href, anchor in parser.links]
+    return text, links
+
+
+def parse_feed(raw: str) -> List[str]:
+    """Entry URLs of an RSS/Atom feed or a sitemap."""
+    try:
+        root = ElementTree.fromstring(raw.encode("utf-8"))
+    except ElementTree.ParseError:
+        return []
+    urls = []
+    for element in root.iter():
+        tag = element.tag.rsplit("}", 1)[-1]
+        if tag == "loc" and element.text:
+            urls.append(element.text.strip())
+        elif tag == "link":
+            # RSS: <link>url</link>; Atom: <link href="url" rel="alternate"/>
+            href = element.get("href") if element.get("rel", "alternate") == "alternate" else None
+            if href or (element.text and element.text.strip()):
+                urls.append((href or element.text).strip())
+    return urls
+
+
+def _extraction_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if Config.CRAWL_EXTRACT_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn, as for the artifact pool: crawls start from worker threads
+            _pool = ProcessPoolExecutor(max_workers=Config.CRAWL_EXTRACT_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_extractors():
+    global _pool
+    with _pool_lock:
+        if _pool:
+            _pool.shutdown(cancel_futures=True)
+            _pool = None
+
+
+class Crawler:
+    """
+    Bounded "deep search" crawl from seed pages and feeds.
+
+    - Breadth-first from the seeds, following links on the seeds' own sites up
+      to `max_depth`, best query match first within a depth; at most
+      `max_pages` pages and `stage_timeout` seconds per crawl.
+    - RSS/Atom feeds and sitemaps seed their entries as depth-0 pages.
+    - URLs are canonicalized (normalize_url) and fetched once per crawl.
+    - Politeness: robots.txt, at most `per_host_limit` requests in flight per
+      host and `domain_delay` seconds between request starts on a host.
+    - Downloads stream and stop at `max_bytes`; non-HTML responses are skipped.
+    - Text and link extraction run in a process pool (CRAWL_EXTRACT_WORKERS)
+      so parsing doesn't hold the GIL for the fetch threads.
+    - Pages go through the content cache (fresh hit, or 304 revalidation).
+    """
+
+    def __init__(self, cache: ContentCache = None, max_pages: int = None, max_depth: int = None,
+                 max_bytes: int = None, domain_delay: float = None, stage_timeout: float = None,
+                 per_host_limit: int = None):
+        self.cache = cache or ContentCache()
+        self.max_pages = max_pages if max_pages is not None else Config.CRAWL_MAX_PAGES
+        self.max_depth = max_depth if max_depth is not None else Config.CRAWL_MAX_DEPTH
+        self.max_bytes = max_bytes or Config.CRAWL_MAX_PAGE_BYTES
+        self.domain_delay = domain_delay if domain_delay is not None else Config.CRAWL_DOMAIN_DELAY
+        self.stage_timeout = stage_timeout or Config.RESEARCH_STAGE_TIMEOUT
+        self.max_workers = Config.RESEARCH_MAX_WORKERS
+        self.per_host_limit = per_host_limit or Config.RESEARCH_PER_HOST_LIMIT
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+        self._robots: Dict[str, Tuple[Optional[RobotFileParser], float]] = {}
+
+    def crawl(self, seeds: List[str], query: str = "") -> List[Dict]:
+        """Returns [{"source", "content"}] for every page with extracted text, in crawl order."""
+        deadline = time.monotonic() + self.stage_timeout
+        query_terms = set(terms(query))
+        pages = [url for url in seeds if not is_feed(url)]
+        for feed in (url for url in seeds if is_feed(url)):
+            pages.extend(self._feed_entries(feed))
+
+        sites = {self._site(url) for url in pages}
+        seen, frontier, order = set(), [], 0
+        for url in pages:
+            key = normalize_url(url)
+            if key not in seen:
+                seen.add(key)
+                heapq.heappush(frontier, (0, 0.0, order, url))
+                order += 1
+
+        findings: Dict[int, Dict] = {}
+        fetched = 0
+        with telemetry.span("crawl", seeds=len(seeds)) as span:
+            executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="skyscope-crawl")
+            visit = carry_context(self._visit) # Fetch spans nest under the crawl span
+            try:
+                pending = {}
+                while (frontier or pending) and time.monotonic() < deadline:
+                    check_cancel()
+                    while frontier and fetched < self.max_pages and len(pending) < self.max_workers:
+                        depth, _, index, url = heapq.heappop(frontier)
+                        pending[executor.submit(visit, url, depth < self.max_depth)] = (depth, index, url)
+                        fetched += 1
+                    if not pending:
+                        break
+                    done, _ = wait(list(pending), timeout=max(0.0, deadline - time.monotonic()),
+                                   return_when=FIRST_COMPLETED)
+                    for future in done:
+                        depth, index, url = pending.pop(future)
+                        try:
+                            text, links = future.result()
+                        except Exception as e:
+                            print(f"  [Researcher] Crawl failed for {url}: {e}")
+                            continue
+                        if text:
+                            findings[index] = {"source": f"WebScrape ({url})", "content": text}
+                        for link, anchor in links:
+                            key = normalize_url(link)
+                            if key in seen or not self._followable(link, sites):
+                                continue
+                            seen.add(key)
+                            # Within a depth, links whose URL or anchor share words with the query go first
+                            score = len(query_terms & set(terms(f"{anchor} {urlsplit(link).path}")))
+                            heapq.heappush(frontier, (depth + 1, -score, order, link))
+                            order += 1
+                        # The frontier only ever needs what the remaining page budget can take
+                        if len(frontier) > 4 * self.max_pages:
+                            frontier = heapq.nsmallest(4 * self.max_pages, frontier)
+                if pending:
+                    print(f"  [Researcher] Crawl deadline reached; abandoning {len(pending)} page(s).")
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+            span.set(pages=fetched, extracted=len(findings))
+        print(f"  [Researcher] Crawled {fetched} page(s) from {len(seeds)} seed(s); {len(findings)} with text.")
+        return [findings[index] for index in sorted(findings)]
+
+    def page(self, url: str) -> Optional[str]:
+        """Extracted text of a single page (no link following)."""
+        return self._visit(url, want_links=False)[0]
+
+    def _visit(self, url: str, want_links: bool) -> Tuple[Optional[str], List[Tuple[str, str]]]:
+        check_cancel()
+        raw, text, validators = self._fetch(url)
+        if raw is None or (text is not None and not want_links):
+            return text, []
+        args = (raw, url, text is None, want_links)
+        pool = _extraction_pool()
+        try:
+            extracted, links = pool.submit(extract_page, *args).result() if pool else extract_page(*args)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM on a pathological page): start a fresh pool next time
+            _discard_pool(pool)
+            extracted, links = extract_page(*args)
+        if validators is not None:
+            self.cache.put(normalize_url(url), raw, extracted, **validators)
+        return text if text is not None else extracted, links
+
+    def _fetch(self, url: str) -> Tuple[Optional[str], Optional[str], Optional[Dict]]:
+        """
+        (raw, extracted text, validators). Cached pages come with their text and no
+        validators; fresh downloads with no text yet and the validators to cache them under.
+        """
+        key = normalize_url(url)
+        cached = self.cache.get(key)
+        if cached and cached["fresh"]:
+            self.cache.record("hits")
+            return cached["raw"], cached["extracted"], None
+        if not self._allowed(url):
+            print(f"  [Researcher] robots.txt disallows {url}")
+            return None, None, None
+
+        headers = {"User-Agent": USER_AGENT}
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        print(f"  [Researcher] Scraping target: {url}")
+        with self._host_turn(url), telemetry.span("fetch", kind="web", url=url) as span:
+            raw, response = self._download(url, headers)
+            span.set(status=response.status_code, bytes=len(raw or ""))
+        if response.status_code == 304 and cached:
+            self.cache.touch(key)
+            self.cache.record("revalidated")
+            return cached["raw"], cached["extracted"], None
+        if raw is None:
+            return None, None, None
+        self.cache.record("misses")
+        return raw, None, {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+
+    def _download(self, url: str, headers: Dict):
+        with get_session(url).get(url, headers=headers, stream=True, timeout=Config.RESEARCH_SOURCE_TIMEOUT) as response:
+            if response.status_code == 304:
+                return None, response
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "text/html").lower()
+            if not any(kind in content_type for kind in ("html", "xml", "text/plain")):
+                return None, response
+            # The request timeout only bounds each read; a server trickling bytes needs a wall-clock deadline.
+            # read1 (urllib3 >= 2) returns whatever has arrived, so the deadline is checked while data trickles
+            deadline = time.monotonic() + Config.RESEARCH_SOURCE_TIMEOUT
+            read1 = getattr(response.raw, "read1", None)
+            stream = (iter(lambda: read1(64 * 1024, decode_content=True), b"") if read1
+                      else response.iter_content(64 * 1024))
+            chunks, size = [], 0
+            for chunk in stream:
+                check_cancel()
+                chunks.append(chunk)
+                size += len(chunk)
+                if size >= self.max_bytes:
+                    print(f"  [Researcher] Page capped at {self.max_bytes // 1024} KiB: {url}")
+                    break
+                if time.monotonic() >= deadline:
+                    telemetry.incr("fetched_bytes", size, kind="web")
+                    raise TimeoutError(f"page not received within {Config.RESEARCH_SOURCE_TIMEOUT:.0f}s")
+            telemetry.incr("fetched_bytes", size, kind="web")
+            body = b"".join(chunks)[:self.max_bytes]
+            return body.decode(response.encoding or "utf-8", errors="replace"), response
+
+    def _feed_entries(self, url: str) -> List[str]:
+        try:
+            raw, _, _ = self._fetch(url)
+        except Exception as e:
+            print(f"  [Researcher] Feed failed for {url}: {e}")
+            return []
+        entries = parse_feed(raw) if raw else []
+        print(f"  [Researcher] Feed {url}: {len(entries)} entr(ies).")
+        return entries[:self.max_pages]
+
+    def _followable(self, url: str, sites: set) -> bool:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or parts.path.lower().endswith(SKIP_EXTENSIONS):
+            return False
+        return self._site(url) in sites
+
+    @staticmethod
+    def _site(url: str) -> str:
+        host = (urlsplit(url).hostname or "").lower()
+        return host[4:] if host.startswith("www.") else host
+
+    @contextmanager
+    def _host_turn(self, url: str):
+        """Holds a per-host slot and spaces request starts `domain_delay` apart on that host."""
+        host = (urlsplit(url).hostname or url).lower()
+        with self._lock:
+            slot = self._host_slots.setdefault(host, threading.BoundedSemaphore(self.per_host_limit))
+        with slot:
+            with self._lock:
+                start = max(time.monotonic(), self._next_start.get(host, 0.0))
+                self._next_start[host] = start + self.domain_delay
+            time.sleep(max(0.0, start - time.monotonic()))
+            yield
+
+    def _allowed(self, url: str) -> bool:
+        if not Config.CRAWL_RESPECT_ROBOTS:
+            return True
+        site = origin(url)
+        with self._lock:
+            parser, fetched_at = self._robots.get(site, (None, 0.0))
+        if not fetched_at or time.monotonic() - fetched_at > Config.CONTENT_CACHE_TTL:
+            parser = None
+            try:
+                # A request to the host like any other: it takes a per-host turn
+                with self._host_turn(url):
+                    response = get_session(url).get(f"{site}/robots.txt", headers={"User-Agent": USER_AGENT},
+                                                    timeout=Config.RESEARCH_SOURCE_TIMEOUT)
+                if response.status_code == 200:
+                    parser = RobotFileParser()
+                    parser.parse(response.text[:512 * 1024].splitlines())
+            except Exception:
+                pass # No robots.txt, or unreachable: the page fetch reports real failures
+            with self._lock:
+                self._robots[site] = (parser, time.monotonic())
+        return parser is None or parser.can_fetch(USER_AGENT, url)
+
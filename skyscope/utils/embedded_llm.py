@@ -0,0 +1,119 @@
+import importlib.util
+import os
+import queue
+import threading
+import time
+from typing import Iterator, Optional
+
+from .config import Config
+
+
+class EmbeddedLLM:
+    """
+    The bundled Qwen GGUF, run in-process on the CPU with llama.cpp.
+
+    The model is loaded once and kept for the life of the process. Prompt KV
+    states are kept in a RAM prefix cache, so the system prompts (and static
+    instructions) the orchestrator, analyst and simulator open with are only
+    evaluated once; each call then evaluates just its new tokens. llama.cpp
+    contexts are not thread-safe, so calls are serialized. llama-cpp-python
+    is only imported when the model is first loaded.
+    """
+
+    def __init__(self, model_path: str = None):
+        self.model_path = model_path or Config.EMBEDDED_LLM_PATH
+        self.llm = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def installed() -> bool:
+        # Checked without importing: llama_cpp loads its shared library on import
+        return importlib.util.find_spec("llama_cpp") is not None
+
+    def available(self) -> bool:
+        return self.installed() and os.path.exists(self.model_path)
+
+    def load(self):
+        if self.llm is None:
+            with self._lock:
+                if self.llm is None:
+                    self.llm = self._load()
+        return self.llm
+
+    def complete(self, messages: list, temperature: Optional[float] = None) -> str:
+        llm = self.load()
+        with self._lock:
+            result = llm.create_chat_completion(messages=messages, **self._sampling(temperature))
+        return result["choices"][0]["message"]["content"] or ""
+
+    def stream(self, messages: list, temperature: Optional[float] = None) -> Iterator[str]:
+        llm = self.load()
+        tokens = queue.Queue()
+        stop = threading.Event()
+
+        def produce():
+            # Generation runs on its own thread so the lock is never held across a yield:
+            # a consumer that stops reading (or never closes the stream) can't wedge the model
+            try:
+                with self._lock:
+                    for chunk in llm.create_chat_completion(messages=messages, stream=True,
+                                                            **self._sampling(temperature)):
+                        if stop.is_set():
+                            break
+                        content = chunk["choices"][0]["delta"].get("content")
+                        if content:
+                            tokens.put(content)
+            except Exception as e:
+                tokens.put(e)
+            tokens.put(None)
+
+        threading.Thread(target=produce, name="skyscope-embedded-stream", daemon=True).start()
+        try:
+            while True:
+                token = tokens.get()
+                if token is None:
+                    return
+                if isinstance(token, Exception):
+                    raise token
+                yield token
+        finally:
+            stop.set()
+
+    def _sampling(self, temperature: Optional[float]) -> dict:
+        options = {"max_tokens": Config.EMBEDDED_LLM_MAX_TOKENS}
+        if temperature is not None:
+            options["temperature"] = temperature
+        return options
+
+    def _load(self):
+        if not self.available():
+            raise RuntimeError(f"Embedded LLM unavailable (llama-cpp-python installed: {self.installed()}, "
+                               f"model: {self.model_path})")
+        import llama_cpp
+        start = time.perf_counter()
+        llm = llama_cpp.Llama(
+            model_path=self.model_path,
+            n_ctx=Config.EMBEDDED_LLM_CONTEXT,
+            n_batch=Config.EMBEDDED_LLM_BATCH,
+            n_threads=Config.EMBEDDED_LLM_THREADS or None,
+            n_threads_batch=Config.EMBEDDED_LLM_BATCH_THREADS or None,
+            verbose=False,
+        )
+        if Config.EMBEDDED_LLM_PREFIX_CACHE_MB > 0:
+            llm.set_cache(llama_cpp.LlamaRAMCache(capacity_bytes=Config.EMBEDDED_LLM_PREFIX_CACHE_MB * 1024 * 1024))
+        print(f"[Embedded] {os.path.basename(self.model_path)} loaded in {time.perf_counter() - start:.1f}s "
+              f"({llm.n_ctx()} ctx, batch {Config.EMBEDDED_LLM_BATCH}).")
+        return llm
+
+
+_embedded = None
+_embedded_lock = threading.Lock()
+
+
+def get_embedded_llm() -> EmbeddedLLM:
+    """Process-wide embedded model, so it is loaded (and its prefix cache kept) once."""
+    global _embedded
+    with _embedded_lock:
+        if _embedded is None:
+            _embedded = EmbeddedLLM()
+        return _embedded
@@ -0,0 +1,405 @@
+import json
+import math
+import mmap
+import os
+import shutil
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+from .config import Config
+from .context_packer import ContextPacker, terms
+
+RRF_K = 60
+
+
+def hashed_embedding(tokens: List[str], dim: int) -> np.ndarray:
+    """
+    Dense bag-of-features vector (unigrams + bigrams) via signed feature hashing.
+    Needs no model, is stable across processes (crc32) and L2-normalized, so a
+    dot product is the cosine similarity.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+        h = zlib.crc32(feature.encode("utf-8"))
+        vector[h % dim] += 1.0 if h & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def read_document(path: str) -> str:
+    if path.lower().endswith(".pdf"):
+        if not PdfReader:
+            print(f"  [Recall] pypdf not installed; skipping {os.path.basename(path)}")
+            return ""
+        return "\n".join(page.extract_text() or "" for page in PdfReader(path).pages)
+    with open(path, encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+class Segment:
+    """
+    Immutable on-disk index over a batch of documents. Arrays are opened
+    memory-mapped, so opening is instant and only touched pages are read.
+
+    Files: meta.json (doc names, term -> [offset, count] into the postings),
+    postings.npy / freqs.npy (chunk ids and term frequencies, grouped by term),
+    lengths.npy / chunk_doc.npy (per chunk), texts.bin + text_offsets.npy
+    (chunk text), vectors.npy (optional dense vectors).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        self.docs: List[str] = meta["docs"]
+        self.terms: Dict[str, List[int]] = meta["terms"]
+        self.postings = self._load("postings.npy")
+        self.freqs = self._load("freqs.npy")
+        self.lengths = self._load("lengths.npy")
+        self.chunk_doc = self._load("chunk_doc.npy")
+        self.text_offsets = self._load("text_offsets.npy")
+        self.vectors = self._load("vectors.npy") if os.path.exists(os.path.join(path, "vectors.npy")) else None
+        # Mapped for the segment's lifetime, so searches stay valid after a merge removes the files
+        with open(os.path.join(path, "texts.bin"), "rb") as f:
+            self._texts = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(f.fileno()).st_size else b""
+
+    def _load(self, name: str) -> np.ndarray:
+        return np.load(os.path.join(self.path, name), mmap_mode="r")
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self.lengths)
+
+    def df(self, term: str) -> int:
+        entry = self.terms.get(term)
+        return entry[1] if entry else 0
+
+    def text(self, chunk_id: int) -> str:
+        start, end = int(self.text_offsets[chunk_id]), int(self.text_offsets[chunk_id + 1])
+        return self._texts[start:end].decode("utf-8")
+
+    @staticmethod
+    def build(path: str, documents: Dict[str, List[str]], dense_dim: int = 0):
+        """Writes a segment for {entry name: [chunk text]} into `path` (atomically, via a temp dir)."""
+        docs, chunk_doc, lengths, texts, vectors = [], [], [], [], []
+        postings: Dict[str, List] = {}
+        for doc_id, (entry, chunks) in enumerate(documents.items()):
+            docs.append(entry)
+            for text in chunks:
+                chunk_id = len(lengths)
+                tokens = terms(text)
+                for term, tf in Counter(tokens).items():
+                    postings.setdefault(term, []).append((chunk_id, tf))
+                chunk_doc.append(doc_id)
+                lengths.append(len(tokens))
+                texts.append(text.encode("utf-8"))
+                if dense_dim:
+                    vectors.append(hashed_embedding(tokens, dense_dim))
+
+        term_index, flat_ids, flat_freqs = {}, [], []
+        for term in sorted(postings):
+            term_index[term] = [len(flat_ids), len(postings[term])]
+            for chunk_id, tf in postings[term]:
+                flat_ids.append(chunk_id)
+                flat_freqs.append(tf)
+
+        tmp_path = f"{path}.tmp-{uuid.uuid4().hex[:8]}"
+        os.makedirs(tmp_path)
+        np.save(os.path.join(tmp_path, "postings.npy"), np.asarray(flat_ids, dtype=np.int32))
+        np.save(os.path.join(tmp_path, "freqs.npy"), np.asarray(flat_freqs, dtype=np.float32))
+        np.save(os.path.join(tmp_path, "lengths.npy"), np.asarray(lengths, dtype=np.float32))
+        np.save(os.path.join(tmp_path, "chunk_doc.npy"), np.asarray(chunk_doc, dtype=np.int32))
+        np.save(os.path.join(tmp_path, "text_offsets.npy"),
+                np.concatenate([[0], np.cumsum([len(t) for t in texts], dtype=np.int64)]).astype(np.int64))
+        with open(os.path.join(tmp_path, "texts.bin"), "wb") as f:
+            f.write(b"".join(texts))
+        if dense_dim:
+            np.save(os.path.join(tmp_path, "vectors.npy"), np.vstack(vectors).astype(np.float32))
+        with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+            json.dump({"docs": docs, "terms": term_index, "total_length": int(sum(lengths))}, f)
+        os.replace(tmp_path, path)
+
+
+class EmbeddedCollection:
+    """
+    One collection: a list of segments plus tombstones for deleted documents,
+    recorded in collection.json. Uploads add a segment; deletes add a
+    tombstone. Segments that are mostly dead are rewritten on their own;
+    EMBEDDED_RECALL_MERGE_FACTOR similar-sized segments are merged into one
+    (tiered, like an LSM tree), and EMBEDDED_RECALL_MAX_SEGMENTS caps the total.
+    """
+
+    def __init__(self, path: str, dense_dim: int):
+        self.path = path
+        self.dense_dim = dense_dim
+        self.state_path = os.path.join(path, "collection.json")
+        os.makedirs(path, exist_ok=True)
+        state = {"segments": [], "tombstones": {}}
+        if os.path.exists(self.state_path):
+            with open(self.state_path) as f:
+                state = json.load(f)
+        self.segments = [Segment(os.path.join(path, name)) for name in state["segments"]]
+        # segment name -> set of dead doc ids
+        self.tombstones = {name: set(ids) for name, ids in state["tombstones"].items()}
+        self._lock = threading.Lock()
+        if not os.path.exists(self.state_path):
+            self._save()
+
+    # --- Writes -----------------------------------------------------------
+
+    def add(self, entry: str, chunks: List[str]):
+        # Indexing happens outside the lock so parallel uploads build their segments concurrently
+        segment = self._build({entry: chunks}) if chunks else None
+        with self._lock:
+            self._tombstone(entry)
+            if segment:
+                self.segments.append(segment)
+            self._maybe_merge()
+            self._save()
+
+    def _build(self, documents: Dict[str, List[str]]) -> Segment:
+        path = os.path.join(self.path, f"seg-{time.time_ns():x}-{uuid.uuid4().hex[:6]}")
+        Segment.build(path, documents, self.dense_dim)
+        return Segment(path)
+
+    def delete(self, entry: str) -> bool:
+        with self._lock:
+            removed = self._tombstone(entry)
+            self._maybe_merge()
+            self._save()
+        return removed
+
+    def _tombstone(self, entry: str) -> bool:
+        removed = False
+        for segment in self.segments:
+            dead = self.tombstones.setdefault(segment.name, set())
+            for doc_id, name in enumerate(segment.docs):
+                if name == entry and doc_id not in dead:
+                    dead.add(doc_id)
+                    removed = True
+        return removed
+
+    def _maybe_merge(self):
+        # Segments that are mostly tombstones are rewritten (or dropped) on their own
+        for segment in list(self.segments):
+            dead = len(self.tombstones.get(segment.name, ()))
+            if dead and dead >= len(segment.docs) * 0.3:
+                self._merge([segment])
+        # Tiered: segments of similar size (same power of the factor) are merged once the tier
+        # fills up, so each chunk is rewritten O(log N) times rather than on every overflow
+        factor = max(2, Config.EMBEDDED_RECALL_MERGE_FACTOR)
+        while True:
+            tiers: Dict[int, List[Segment]] = {}
+            for segment in self.segments:
+                tiers.setdefault(int(math.log(max(1, segment.chunk_count), factor)), []).append(segment)
+            full = [tier for _, tier in sorted(tiers.items()) if len(tier) >= factor]
+            if full:
+                self._merge(full[0][:factor])
+            elif len(self.segments) > Config.EMBEDDED_RECALL_MAX_SEGMENTS:
+                self._merge(sorted(self.segments, key=lambda segment: segment.chunk_count)[:factor])
+            else:
+                return
+
+    def _merge(self, group: List[Segment]):
+        """Replaces `group` with one segment holding its live documents."""
+        live: Dict[str, List[str]] = {}
+        for segment in group:
+            dead_docs = self.tombstones.get(segment.name, set())
+            for chunk_id, doc_id in enumerate(segment.chunk_doc):
+                if int(doc_id) not in dead_docs:
+                    live.setdefault(segment.docs[doc_id], []).append(segment.text(chunk_id))
+        merged = self._build(live) if live else None
+        position = self.segments.index(group[0])
+        self.segments = [segment for segment in self.segments if segment not in group]
+        if merged:
+            self.segments.insert(min(position, len(self.segments)), merged)
+        for segment in group:
+            self.tombstones.pop(segment.name, None)
+        self._save()
+        for segment in group:
+            shutil.rmtree(segment.path, ignore_errors=True)
+
+    def _save(self):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"segments": [segment.name for segment in self.segments],
+                       "tombstones": {name: sorted(ids) for name, ids in self.tombstones.items() if ids}}, f)
+        os.replace(tmp_path, self.state_path)
+
+    # --- Search -----------------------------------------------------------
+
+    def search(self, query: str, limit: int, mode: str) -> List[Dict]:
+        with self._lock:
+            segments = list(self.segments)
+            tombstones = {name: set(ids) for name, ids in self.tombstones.items()}
+        if not segments:
+            return []
+
+        query_terms = terms(query)
+        rankings = []
+        if mode in ("bm25", "hybrid"):
+            rankings.append(self._bm25(segments, tombstones, query_terms))
+        if mode in ("dense", "hybrid") and self.dense_dim and all(s.vectors is not None for s in segments):
+            rankings.append(self._dense(segments, tombstones, hashed_embedding(query_terms, self.dense_dim)))
+        rankings = [ranking for ranking in rankings if ranking]
+        if not rankings:
+            return []
+
+        if len(rankings) == 1:
+            fused = rankings[0]
+        else:
+            # Reciprocal rank fusion: robust to the very different BM25 and cosine scales
+            scores: Dict = {}
+            for ranking in rankings:
+                for rank, (key, _) in enumerate(ranking):
+                    scores[key] = scores.get(key, 0.0) + 1.0 / (RRF_K + rank + 1)
+            fused = sorted(scores.items(), key=lambda item: -item[1])
+
+        by_name = {segment.name: segment for segment in segments}
+        results = []
+        for (segment_name, chunk_id), score in fused[:limit]:
+            segment = by_name[segment_name]
+            entry = segment.docs[int(segment.chunk_doc[chunk_id])]
+            results.append({"text": segment.text(chunk_id), "file": entry, "score": float(score),
+                            "metadata": {"source": entry}})
+        return results
+
+    def _live_mask(self, segment: Segment, tombstones: Dict) -> Optional[np.ndarray]:
+        dead = tombstones.get(segment.name)
+        if not dead:
+            return None
+        return ~np.isin(segment.chunk_doc, np.fromiter(dead, dtype=np.int32))
+
+    def _bm25(self, segments: List[Segment], tombstones: Dict, query_terms: List[str],
+              k1: float = 1.5, b: float = 0.75, depth: int = 50) -> List:
+        # Collection-wide statistics; dead chunks still count, as in most segment-based engines
+        n = sum(segment.chunk_count for segment in segments)
+        avg_len = max(sum(float(segment.lengths.sum()) for segment in segments) / max(n, 1), 1.0)
+        unique_terms = set(query_terms)
+        idf = {}
+        for term in unique_terms:
+            df = sum(segment.df(term) for segment in segments)
+            if df:
+                idf[term] = np.log(1 + (n - df + 0.5) / (df + 0.5))
+
+        candidates = []
+        for segment in segments:
+            scores = np.zeros(segment.chunk_count, dtype=np.float32)
+            for term, weight in idf.items():
+                entry = segment.terms.get(term)
+                if not entry:
+                    continue
+                offset, count = entry
+                ids = segment.postings[offset:offset + count]
+                tf = segment.freqs[offset:offset + count]
+                norm = k1 * (1 - b + b * segment.lengths[ids] / avg_len)
+                scores[ids] += weight * tf * (k1 + 1) / (tf + norm)
+            mask = self._live_mask(segment, tombstones)
+            if mask is not None:
+                scores[~mask] = 0.0
+            candidates.extend(self._top(segment.name, scores, depth))
+        return sorted(candidates, key=lambda item: -item[1])[:depth]
+
+    def _dense(self, segments: List[Segment], tombstones: Dict, query_vector: np.ndarray, depth: int = 50) -> List:
+        if not query_vector.any():
+            return []
+        candidates = []
+        for segment in segments:
+            scores = np.asarray(segment.vectors @ query_vector, dtype=np.float32)
+            mask = self._live_mask(segment, tombstones)
+            if mask is not None:
+                scores[~mask] = 0.0
+            candidates.extend(self._top(segment.name, scores, depth))
+        return sorted(candidates, key=lambda item: -item[1])[:depth]
+
+    @staticmethod
+    def _top(segment_name: str, scores: np.ndarray, depth: int) -> List:
+        if not len(scores):
+            return []
+        k = min(depth, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        return [((segment_name, int(i)), float(scores[i])) for i in top if scores[i] > 0]
+
+
+class EmbeddedRecallClient:
+    """
+    In-process retrieval engine with the LocalRecallClient interface.
+
+    Documents are chunked with the context packer, indexed with BM25 and
+    (optionally) hashed dense vectors, and stored as memory-mapped segments
+    under EMBEDDED_RECALL_DIR. Search is hybrid (reciprocal rank fusion) by
+    default and needs no running services.
+    """
+
+    backend = "embedded"
+
+    def __init__(self, path: str = None, dense_dim: int = None, mode: str = None):
+        self.path = path or Config.EMBEDDED_RECALL_DIR
+        self.dense_dim = dense_dim if dense_dim is not None else Config.EMBEDDED_RECALL_DENSE_DIM
+        self.mode = mode or Config.EMBEDDED_RECALL_MODE
+        self.packer = ContextPacker(chunk_tokens=Config.EMBEDDED_RECALL_CHUNK_TOKENS)
+        self._collections: Dict[str, EmbeddedCollection] = {}
+        self._lock = threading.Lock()
+
+    def ingest_manifest_path(self, collection_name: str) -> str:
+        # Kept next to the index, so wiping the index also forces a re-ingest
+        return os.path.join(self.path, collection_name, "ingest.json")
+
+    def create_collection(self, name: str) -> bool:
+        self._collection(name)
+        return True
+
+    def upload_file(self, collection_name: str, file_path: str, entry: str = None) -> bool:
+        """Chunks and indexes a file under `entry` (default: its basename); re-uploading an entry replaces it."""
+        try:
+            text = read_document(file_path)
+            if not text.strip():
+                # Not recorded as ingested: a PDF skipped for lack of pypdf is indexed once it is installed
+                print(f"  [Recall] No text extracted from {os.path.basename(file_path)}; not indexed.")
+                return False
+            chunks = self.packer.chunk(text)
+            self._collection(collection_name).add(entry or os.path.basename(file_path), chunks)
+            return True
+        except Exception as e:
+            print(f"EmbeddedRecall Error (Upload File): {e}")
+            return False
+
+    def delete_entry(self, collection_name: str, entry: str) -> bool:
+        try:
+            self._collection(collection_name).delete(entry)
+            return True
+        except Exception as e:
+            print(f"EmbeddedRecall Error (Delete Entry): {e}")
+            return False
+
+    def search(self, collection_name: str, query: str, limit: int = 5) -> list:
+        try:
+            return self._collection(collection_name).search(query, limit, self.mode)
+        except Exception as e:
+            print(f"EmbeddedRecall Error (Search): {e}")
+            return []
+
+    def list_collections(self) -> list:
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(name for name in os.listdir(self.path)
+                      if os.path.exists(os.path.join(self.path, name, "collection.json")))
+
+    def _collection(self, name: str) -> EmbeddedCollection:
+        with self._lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = self._collections[name] = EmbeddedCollection(os.path.join(self.path, name), self.dense_dim)
+            return collection
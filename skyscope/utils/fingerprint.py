@@ -0,0 +1,48 @@
+import hashlib
+from typing import List, Tuple
+
+from .context_packer import SENTENCE_SPLIT, terms
+
+SIMHASH_BITS = 64
+
+
+def _hash64(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def content_hash(text: str) -> str:
+    """Exact fingerprint, insensitive to whitespace and case."""
+    return hashlib.sha256(" ".join(text.lower().split()).encode("utf-8")).hexdigest()
+
+
+def simhash(text: str, shingle: int = 1) -> int:
+    """
+    64-bit SimHash over word shingles. Near-identical texts (a changed
+    timestamp or counter, one reworded clause) land a few bits apart;
+    unrelated ones about 32 bits apart.
+    """
+    words = terms(text)
+    shingles = [" ".join(words[i:i + shingle]) for i in range(max(1, len(words) - shingle + 1))] if words else []
+    weights = [0] * SIMHASH_BITS
+    for token in shingles:
+        h = _hash64(token)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def sentence_fingerprints(text: str) -> List[Tuple[str, int]]:
+    """[(sentence, simhash)] for each sentence of `text`."""
+    sentences = [s.strip() for s in SENTENCE_SPLIT.split(text) if s.strip()]
+    return [(sentence, simhash(sentence)) for sentence in sentences]
+
+
+def novel_sentences(fingerprints: List[Tuple[str, int]], known: List[int], distance: int) -> List[str]:
+    """Sentences with no near-duplicate (within `distance` bits) among the `known` sentence SimHashes."""
+    exact = set(known)
+    return [sentence for sentence, h in fingerprints
+            if h not in exact and all(hamming(h, k) > distance for k in known)]
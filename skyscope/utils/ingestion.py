@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from .config import Config
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.txt', '.md')
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestionManifest:
+    """
+    Records what has already been uploaded to a collection:
+    relative path -> {"size", "mtime", "sha256"}.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.entries = json.load(f).get("files", {})
+            except (OSError, ValueError):
+                # A corrupt manifest only costs a full re-ingest
+                self.entries = {}
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"files": self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class DocumentIngestor:
+    """
+    Incrementally mirrors a docs directory into a LocalRecall collection.
+
+    Only new or changed files (by size/mtime, confirmed by content hash) are
+    uploaded; files deleted from disk are removed from the collection.
+    Uploads run in a bounded pool with retries.
+    """
+
+    def __init__(self, docs_path: str, collection_name: str, recall_client,
+                 manifest_path: str = None, max_workers: int = None, retries: int = None):
+        self.docs_path = docs_path
+        self.collection_name = collection_name
+        self.recall_client = recall_client
+        if not manifest_path and hasattr(recall_client, "ingest_manifest_path"):
+            # Backends with a local index keep the manifest with the index itself
+            manifest_path = recall_client.ingest_manifest_path(collection_name)
+        self.manifest_path = manifest_path or os.path.join(Config.INGEST_MANIFEST_DIR, f"{collection_name}.json")
+        self.max_workers = max_workers or Config.INGEST_MAX_WORKERS
+        self.retries = retries if retries is not None else Config.INGEST_RETRIES
+        self._sync_lock = threading.Lock()
+        self._background: Optional[threading.Thread] = None
+
+    def sync(self) -> Dict:
+        """
+        Brings the collection in line with the docs directory.
+        Returns counts of uploaded, removed, unchanged and failed files.
+        """
+        summary = {"uploaded": 0, "removed": 0, "unchanged": 0, "failed": 0}
+        if not self.docs_path or not os.path.exists(self.docs_path):
+            return summary
+
+        with self._sync_lock:
+            manifest = IngestionManifest(self.manifest_path)
+            on_disk = self._scan()
+
+            to_upload = {}
+            for rel_path, (abs_path, size, mtime) in on_disk.items():
+                known = manifest.entries.get(rel_path)
+                if known and known["size"] == size and known["mtime"] == mtime:
+                    summary["unchanged"] += 1
+                    continue
+                sha256 = file_sha256(abs_path)
+                if known and known["sha256"] == sha256:
+                    # Touched but not modified: refresh the stamp, skip the upload
+                    known["mtime"] = mtime
+                    summary["unchanged"] += 1
+                    continue
+                to_upload[rel_path] = {"path": abs_path, "entry": self._entry(rel_path),
+                                       "size": size, "mtime": mtime,
+                                       "sha256": sha256, "replaces": bool(known)}
+
+            removed = [rel_path for rel_path in manifest.entries if rel_path not in on_disk]
+            if not to_upload and not removed:
+                manifest.save()
+                return summary
+
+            self.recall_client.create_collection(self.collection_name)
+
+            for rel_path in removed:
+                if self.recall_client.delete_entry(self.collection_name, self._entry(rel_path)):
+                    del manifest.entries[rel_path]
+                    summary["removed"] += 1
+
+            if to_upload:
+                print(f"  [Ingest] Uploading {len(to_upload)} new/changed document(s) to '{self.collection_name}'...")
+                workers = min(self.max_workers, len(to_upload))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="skyscope-ingest") as pool:
+                    outcomes = pool.map(self._upload, to_upload.values())
+                    for (rel_path, info), ok in zip(to_upload.items(), outcomes):
+                        if ok:
+                            manifest.entries[rel_path] = {k: info[k] for k in ("size", "mtime", "sha256")}
+                            summary["uploaded"] += 1
+                        else:
+                            summary["failed"] += 1
+
+            manifest.save()
+        print(f"  [Ingest] {summary['uploaded']} uploaded, {summary['removed']} removed, "
+              f"{summary['unchanged']} unchanged, {summary['failed']} failed.")
+        return summary
+
+    def start_background(self) -> threading.Thread:
+        """Runs `sync` on a daemon thread so callers are not blocked."""
+        if self._background and self._background.is_alive():
+            return self._background
+        self._background = threading.Thread(target=self.sync, name="skyscope-ingest", daemon=True)
+        self._background.start()
+        return self._background
+
+    def _scan(self) -> Dict:
+        files = {}
+        for root, _, names in os.walk(self.docs_path):
+            for name in names:
+                if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    abs_path = os.path.join(root, name)
+                    stat = os.stat(abs_path)
+                    rel_path = os.path.relpath(abs_path, self.docs_path)
+                    files[rel_path] = (abs_path, stat.st_size, stat.st_mtime_ns)
+        return files
+
+    @staticmethod
+    def _entry(rel_path: str) -> str:
+        # Documents are keyed by their path under docs/: a/report.txt and b/report.txt stay distinct
+        return rel_path.replace(os.sep, "/")
+
+    def _upload(self, info: Dict) -> bool:
+        # A changed file replaces its previous entry instead of duplicating it
+        if info["replaces"]:
+            self.recall_client.delete_entry(self.collection_name, info["entry"])
+        for attempt in range(self.retries + 1):
+            if self.recall_client.upload_file(self.collection_name, info["path"], entry=info["entry"]):
+                return True
+            if attempt < self.retries:
+                time.sleep(min(2 ** attempt, 10))
+        print(f"  [Ingest] Giving up on {info['path']} after {self.retries + 1} attempt(s).")
+        return False
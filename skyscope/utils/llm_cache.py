@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from .cancellation import check_cancel
+from .config import Config
+from .telemetry import telemetry
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key: the first caller runs the
+    function, everyone else waits for and shares its result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Dict] = {}
+
+    def do(self, key: str, fn: Callable[[], str]):
+        """Returns (result, shared) where `shared` is True for coalesced callers."""
+        call, leader = self.join(key)
+        if not leader:
+            self.wait(call)
+            if call["error"] is not None:
+                raise call["error"]
+            return call["result"], True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self.settle(key, call, error=e)
+            raise
+        self.settle(key, call, result=result)
+        return result, False
+
+    def join(self, key: str) -> Tuple[Dict, bool]:
+        """Registers interest in `key`: returns (call, leader). The leader must `settle` the call."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = {"done": threading.Event(), "result": None, "error": None}
+            return call, True
+
+    def settle(self, key: str, call: Dict, result=None, error: BaseException = None):
+        call["result"], call["error"] = result, error
+        with self._lock:
+            del self._calls[key]
+        call["done"].set()
+
+    @staticmethod
+    def wait(call: Dict):
+        # Polled, so a waiter whose own mission is cancelled stops waiting
+        while not call["done"].wait(0.25):
+            check_cancel()
+
+
+class ResponseCache:
+    """
+    Persistent LLM response cache keyed by (model, messages, temperature).
+
+    Only successful completions are stored. Entries expire after `ttl`
+    seconds and the least recently used ones are evicted beyond `max_entries`.
+    Misses go through a SingleFlight so identical in-flight requests share
+    one upstream call.
+    """
+
+    def __init__(self, path: str = None, ttl: float = None, max_entries: int = None):
+        self.path = path or os.path.join(Config.CONTENT_CACHE_DIR, "llm.sqlite3")
+        self.ttl = ttl if ttl is not None else Config.LLM_CACHE_TTL
+        self.max_entries = max_entries if max_entries is not None else Config.LLM_CACHE_MAX_ENTRIES
+        self.enabled = Config.LLM_CACHE_ENABLED
+        self.flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT,
+                response TEXT,
+                created_at REAL,
+                accessed_at REAL
+            )
+        """)
+        self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, messages: list, temperature: Optional[float]) -> str:
+        payload = json.dumps({"model": model, "messages": messages, "temperature": temperature},
+                             sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, model: str, messages: list, temperature: Optional[float]) -> Optional[str]:
+        if not self.enabled:
+            return None
+        return self._lookup(self.make_key(model, messages, temperature), count=True)
+
+    def _lookup(self, key: str, count: bool) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] >= self.ttl:
+                if count:
+                    self._stats["misses"] += 1
+                    telemetry.incr("cache_requests", cache="llm", outcome="miss")
+                return None
+            self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+            if count:
+                self._stats["hits"] += 1
+                telemetry.incr("cache_requests", cache="llm", outcome="hit")
+        return row[0]
+
+    def put(self, model: str, messages: list, temperature: Optional[float], response: str):
+        if not self.enabled or not response:
+            return
+        key = self.make_key(model, messages, temperature)
+        now = time.time()
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                             (key, model, response, now, now))
+            self._evict(now)
+            self._db.commit()
+
+    def get_or_compute(self, model: str, messages: list, temperature: Optional[float],
+                       compute: Callable[[], str], use_cache: bool = True,
+                       keep: Callable[[], bool] = None) -> str:
+        """
+        Returns a cached response or runs `compute` (coalesced with identical
+        in-flight calls) and stores its result, unless `keep` says otherwise.
+        `compute` must raise on failure so error text is never cached.
+        """
+        if not use_cache or not self.enabled:
+            return compute()
+
+        cached = self.get(model, messages, temperature)
+        if cached is not None:
+            return cached
+
+        key = self.make_key(model, messages, temperature)
+
+        def fetch():
+            # A leader that finished between our miss and this call may have filled the entry
+            response = self._lookup(key, count=False)
+            if response is not None:
+                return response
+            response = compute()
+            if keep is None or keep():
+                self.put(model, messages, temperature, response)
+            return response
+
+        response, shared = self.flight.do(key, fetch)
+        if shared:
+            with self._lock:
+                self._stats["coalesced"] += 1
+            telemetry.incr("cache_requests", cache="llm", outcome="coalesced")
+        return response
+
+    def stream(self, model: str, messages: list, temperature: Optional[float],
+               stream: Callable[[], Iterator[str]], keep: Callable[[], bool] = None) -> Iterator[str]:
+        """
+        Streaming counterpart of `get_or_compute` for a cache miss. The first
+        caller streams `stream()` token by token and stores the complete text
+        (unless `keep` says otherwise); identical concurrent callers wait and
+        receive the leader's final text as one chunk. If the leader fails or
+        its consumer stops early, each waiter streams on its own instead.
+        """
+        key = self.make_key(model, messages, temperature)
+        call, leader = self.flight.join(key)
+        if not leader:
+            self.flight.wait(call)
+            if call["error"] is None and call["result"] is not None:
+                with self._lock:
+                    self._stats["coalesced"] += 1
+                telemetry.incr("cache_requests", cache="llm", outcome="coalesced")
+                yield call["result"]
+                return
+        parts, done = [], False
+        try:
+            for token in stream():
+                parts.append(token)
+                yield token
+            done = True
+        finally:
+            if leader:
+                # An abandoned or failed stream is settled as an error, so waiters don't take a partial text
+                self.flight.settle(key, call, result="".join(parts) if done else None,
+                                   error=None if done else RuntimeError("Leading stream did not complete."))
+        if keep is None or keep():
+            self.put(model, messages, temperature, "".join(parts))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            return dict(self._stats, entries=entries)
+
+    def _evict(self, now: float):
+        removed = self._db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,)).rowcount
+        overflow = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            removed += self._db.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,)
+            ).rowcount
+        self._stats["evictions"] += removed
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide cache so every client shares entries and in-flight coalescing."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache()
+        return _shared_cache
@@ -1,42 +1,65 @@
-import requests
 import os
+import requests
 from .config import Config
+from .transport import get_session
 
 class LocalRecallClient:
+    backend = "localrecall"
+
     def __init__(self):
         self.base_url = Config.LOCALRECALL_BASE_URL.rstrip('/')
         # Ensure base URL points to the API root if not configured that way
         if not self.base_url.endswith("/api"):
             # The config default is ...:8081/api, but if user overrides with base domain
             pass 
+        self.session = get_session(self.base_url)
+
+    def is_available(self) -> bool:
+        """Whether the LocalRecall service answers at all."""
+        try:
+            # One plain attempt: the pooled session would retry a refused connection with backoff
+            requests.get(f"{self.base_url}/collections", timeout=Config.HTTP_CONNECT_TIMEOUT)
+            return True
+        except Exception:
+            return False
 
     def create_collection(self, name: str) -> bool:
         """Creates a new collection in LocalRecall."""
         try:
             url = f"{self.base_url}/collections"
-            response = requests.post(url, json={"name": name})
+            response = self.session.post(url, json={"name": name})
             return response.status_code in [200, 201]
         except Exception as e:
             print(f"LocalRecall Error (Create Collection): {e}")
             return False
 
-    def upload_file(self, collection_name: str, file_path: str) -> bool:
-        """Uploads a file to the specified collection."""
+    def upload_file(self, collection_name: str, file_path: str, entry: str = None) -> bool:
+        """Uploads a file to the specified collection, named `entry` (default: its basename)."""
         try:
             url = f"{self.base_url}/collections/{collection_name}/upload"
             with open(file_path, 'rb') as f:
-                files = {'file': (os.path.basename(file_path), f)}
-                response = requests.post(url, files=files)
+                files = {'file': (entry or os.path.basename(file_path), f)}
+                response = self.session.post(url, files=files)
             return response.status_code == 200
         except Exception as e:
             print(f"LocalRecall Error (Upload File): {e}")
             return False
 
+    def delete_entry(self, collection_name: str, entry: str) -> bool:
+        """Removes a previously uploaded file from the collection."""
+        try:
+            url = f"{self.base_url}/collections/{collection_name}/entry/delete"
+            response = self.session.delete(url, json={"entry": entry})
+            return response.status_code in [200, 204, 404]
+        except Exception as e:
+            print(f"LocalRecall Error (Delete Entry): {e}")
+            return False
+
     def search(self, collection_name: str, query: str, limit: int = 5) -> list:
         """Searches the collection for relevant snippets."""
         try:
             url = f"{self.base_url}/collections/{collection_name}/search"
-            response = requests.post(url, json={"query": query, "max_results": limit})
+            response = self.session.post(url, json={"query": query, "max_results": limit})
             if response.status_code == 200:
                 # Response format depends on LocalRecall version, assuming standard list of results
                 results = response.json()
@@ -50,10 +73,28 @@ class LocalRecallClient:
         """Lists available collections."""
         try:
             url = f"{self.base_url}/collections"
-            response = requests.get(url)
+            response = self.session.get(url)
             if response.status_code == 200:
                 return response.json()
             return []
         except Exception as e:
             # print(f"LocalRecall Error (List config): {e}") # Silent fail often better for logic checks
             return []
+
+
+def get_recall_client():
+    """
+    Builds the retrieval client selected by Config.RECALL_BACKEND. Both
+    backends share the same interface (create_collection, upload_file,
+    delete_entry, search, list_collections).
+    """
+    backend = Config.RECALL_BACKEND.lower()
+    if backend == "localrecall":
+        return LocalRecallClient()
+    if backend == "auto":
+        client = LocalRecallClient()
+        if client.is_available():
+            return client
+        print(f"  [Recall] LocalRecall unreachable at {client.base_url}; using the embedded index.")
+    from .embedded_recall import EmbeddedRecallClient
+    return EmbeddedRecallClient()
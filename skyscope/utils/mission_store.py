@@ -0,0 +1,136 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from .config import Config
+
+PHASES = ("blueprint", "research", "analysis", "simulation", "artifacts")
+
+
+class MissionStore:
+    """
+    Checkpoints of mission state, one JSON file per mission under
+    MISSION_STORE_DIR.
+
+    Each completed phase's output is written as soon as the phase finishes,
+    so a failed or interrupted mission can resume from the first phase that
+    didn't complete. It can also re-run a chosen phase and everything after
+    it, reusing the outputs before that phase unchanged.
+
+    State: {"id", "input_hash", "instruction", "status", "error",
+            "phases": {phase: {"output", "seconds", "completed_at"}},
+            "artifacts": {label: path or None}, "created_at", "updated_at"}
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.MISSION_STORE_DIR
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def input_hash(instruction: str, docs_path: str = None) -> str:
+        payload = json.dumps([" ".join(instruction.split()), docs_path])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def new(self, instruction: str, docs_path: str = None) -> Dict:
+        digest = self.input_hash(instruction, docs_path)
+        now = time.time()
+        state = {
+            # Input hash prefix plus a random suffix: the same instruction can run twice in one second
+            "id": f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}-{digest[:8]}{uuid.uuid4().hex[:4]}",
+            "input_hash": digest,
+            "instruction": instruction,
+            "docs_path": docs_path,
+            "status": "running",
+            "error": None,
+            "phases": {},
+            "artifacts": {},
+            "created_at": now,
+            "updated_at": now,
+        }
+        self.save(state)
+        return state
+
+    def load(self, mission_id: str) -> Optional[Dict]:
+        if mission_id == "latest":
+            missions = self.list()
+            unfinished = [m for m in missions if m["status"] != "complete"]
+            mission_id = (unfinished or missions or [{}])[0].get("id")
+            if not mission_id:
+                return None
+        try:
+            with open(self._file(mission_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, state: Dict):
+        with self._lock:
+            state["updated_at"] = time.time()
+            os.makedirs(self.path, exist_ok=True)
+            tmp_path = f"{self._file(state['id'])}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(state, f, default=str)
+            os.replace(tmp_path, self._file(state["id"]))
+
+    def checkpoint(self, state: Dict, phase: str, output, seconds: float):
+        with self._lock:
+            state["phases"][phase] = {"output": output, "seconds": seconds, "completed_at": time.time()}
+            self.save(state)
+
+    def invalidate(self, state: Dict, from_phase: str):
+        """Drops `from_phase` and every later phase so they run again."""
+        with self._lock:
+            for phase in PHASES[PHASES.index(from_phase):]:
+                state["phases"].pop(phase, None)
+            state["artifacts"] = {}
+            state["status"], state["error"] = "running", None
+            self.save(state)
+
+    def fail(self, state: Dict, phase: str, error):
+        with self._lock:
+            state["status"] = "failed"
+            state["error"] = f"{phase}: {error}"
+            self.save(state)
+
+    def record_artifact(self, state: Dict, label: str, path: Optional[str], expected: int, error=None):
+        """Marks the artifacts phase complete once all `expected` renders have succeeded."""
+        with self._lock:
+            state["artifacts"][label] = path
+            if error or not path:
+                self.fail(state, "artifacts", f"{label} failed: {error or 'no output'}")
+                return
+            if len(state["artifacts"]) == expected and all(state["artifacts"].values()):
+                state["phases"]["artifacts"] = {"output": dict(state["artifacts"]), "seconds": None,
+                                                "completed_at": time.time()}
+                state["status"] = "complete"
+            self.save(state)
+
+    def list(self) -> List[Dict]:
+        """Summaries of stored missions, newest first."""
+        if not os.path.isdir(self.path):
+            return []
+        missions = []
+        for name in os.listdir(self.path):
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.path, name)) as f:
+                    state = json.load(f)
+            except (OSError, ValueError):
+                continue
+            missions.append({
+                "id": state["id"],
+                "instruction": state["instruction"],
+                "status": state["status"],
+                "completed": [phase for phase in PHASES if phase in state["phases"]],
+                "error": state.get("error"),
+                "updated_at": state["updated_at"],
+            })
+        return sorted(missions, key=lambda m: -m["updated_at"])
+
+    def _file(self, mission_id: str) -> str:
+        return os.path.join(self.path, f"{mission_id}.json")
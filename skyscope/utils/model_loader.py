@@ -1,12 +1,21 @@
+import hashlib
 import os
-import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 from rich.console import Console
 
+from .config import Config
+from .ingestion import IngestionManifest
+from .transport import get_session
+
 console = Console()
 
 MODELS_DIR = Path("models")
+STAMP_NAME = ".manifest.json"
 
+# "sha256"/"size" pin a model; without them the values Hugging Face publishes for the
+# LFS object (X-Linked-Etag / X-Linked-Size on the resolve redirect) are used instead.
 MODELS = {
     "qwen": {
         "url": "https://huggingface.co/Qwen/Qwen2.5-0.5B-Instruct-GGUF/resolve/main/qwen2.5-0.5b-instruct-q4_k_m.gguf",
@@ -16,37 +25,192 @@ MODELS = {
     "kokoro": {
         "url": "https://huggingface.co/hexgrad/Kokoro-82M/resolve/main/kokoro.onnx", # Placeholder - usually needs weights + config
         # For simplicity in this demo, accessing specific ONNX file location if available or using kokoro-onnx lib auto-download
-        "filename": "kokoro-v0_19.onnx", 
+        "filename": "kokoro-v0_19.onnx",
         "desc": "Voice Synthesis (Kokoro-82M)"
     }
 }
 
-def ensure_models_exist():
+
+class IntegrityError(Exception):
+    pass
+
+
+def missing_models(models: Dict = None, models_dir: Path = None) -> list:
+    """
+    Models that are absent or changed since they were last verified.
+    Only stats files against the stamp (no hashing, no network), so it is
+    cheap enough for the startup path.
+    """
+    models = models or MODELS
+    models_dir = Path(models_dir or MODELS_DIR)
+    stamp = IngestionManifest(str(models_dir / STAMP_NAME)).entries
+    missing = []
+    for key, model in models.items():
+        path = models_dir / model["filename"]
+        verified = stamp.get(model["filename"])
+        if not path.exists() or not verified or not _matches_stamp(path, verified, model):
+            missing.append(key)
+    return missing
+
+
+def ensure_models_exist(models: Dict = None, models_dir: Path = None, workers: int = None) -> Dict[str, bool]:
     """
     Checks for presence of embedded models and downloads them if missing.
+
+    Downloads run concurrently, resume from `<file>.part` with HTTP Range
+    requests, are verified against the expected size and SHA-256, and are
+    renamed into place only once complete. Verified files are recorded in
+    `models/.manifest.json`, so later checks only stat them.
+    Returns {model key: ok}.
     """
-    if not MODELS_DIR.exists():
-        MODELS_DIR.mkdir(parents=True)
-        
+    models = models or MODELS
+    models_dir = Path(models_dir or MODELS_DIR)
+    models_dir.mkdir(parents=True, exist_ok=True)
+    stamp = IngestionManifest(str(models_dir / STAMP_NAME))
+
     console.print("[dim]Verifying Embedded Neural Array...[/dim]")
-    
-    for key, model in MODELS.items():
-        path = MODELS_DIR / model["filename"]
-        if not path.exists():
-            console.print(f"[yellow]  - Downloading {model['desc']}...[/yellow]")
+    todo = {}
+    for key, model in models.items():
+        path = models_dir / model["filename"]
+        verified = stamp.entries.get(model["filename"])
+        if path.exists() and verified and _matches_stamp(path, verified, model):
+            console.print(f"[dim]  - {model['desc']} Verified.[/dim]")
+        else:
+            todo[key] = model
+    if not todo:
+        return {key: True for key in models}
+
+    results = {key: True for key in models if key not in todo}
+    with ThreadPoolExecutor(max_workers=workers or Config.MODEL_DOWNLOAD_WORKERS,
+                            thread_name_prefix="skyscope-models") as pool:
+        futures = {key: pool.submit(_acquire, model, models_dir) for key, model in todo.items()}
+        for key, future in futures.items():
+            model = todo[key]
             try:
-                # In a real scenario, use huggingface_hub for more robust handling
-                # or requests for direct GGUF
-                response = requests.get(model["url"], stream=True)
-                response.raise_for_status()
-                with open(path, "wb") as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                console.print(f"[green]  - {model['desc']} Online.[/green]")
+                entry = future.result()
             except Exception as e:
                 console.print(f"[red]  - Failed to acquire {model['desc']}: {e}[/red]")
-        else:
-             console.print(f"[dim]  - {model['desc']} Verified.[/dim]")
+                results[key] = False
+                continue
+            results[key] = True
+            if entry:
+                stamp.entries[model["filename"]] = entry
+    stamp.save()
+    return results
+
+
+def _matches_stamp(path: Path, verified: Dict, model: Dict) -> bool:
+    stat = path.stat()
+    return (stat.st_size == verified["size"] and stat.st_mtime_ns == verified["mtime"]
+            and verified.get("url") == model["url"])
+
+
+def _acquire(model: Dict, models_dir: Path) -> Optional[Dict]:
+    """
+    Downloads (or resumes, or just verifies) one model. Returns its stamp
+    entry, or None when an existing file could not be verified (offline).
+    """
+    path = models_dir / model["filename"]
+    part_path = path.with_name(path.name + ".part")
+    session = get_session(model["url"])
+
+    try:
+        expected_size, expected_sha = _expected(model, session)
+    except Exception as e:
+        if path.exists():
+            # Can't reach the origin: keep the file, but don't stamp it as verified
+            console.print(f"[yellow]  - {model['desc']} present but unverified ({e}).[/yellow]")
+            return None
+        raise
+
+    if path.exists():
+        # Present but never verified (older loader, or edited): check it before trusting it
+        sha256 = digest_of(path)
+        if _verify(path, expected_size, expected_sha, sha256):
+            console.print(f"[dim]  - {model['desc']} Verified.[/dim]")
+            return _stamp_entry(path, sha256, model)
+        console.print(f"[yellow]  - {model['desc']} failed verification; re-downloading.[/yellow]")
+        os.replace(path, part_path) # A truncated file is still a valid prefix to resume from
+
+    digest = hashlib.sha256()
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    if expected_size is not None and offset > expected_size:
+        offset = 0
+    if offset:
+        # Resume: hash what is already on disk, then ask for the rest
+        with open(part_path, "rb") as f:
+            for block in iter(lambda: f.read(Config.MODEL_DOWNLOAD_CHUNK), b""):
+                digest.update(block)
+
+    if expected_size is None or offset < expected_size:
+        action = f"Resuming at {offset / 1e6:.1f} MB" if offset else "Downloading"
+        console.print(f"[yellow]  - {action} {model['desc']}...[/yellow]")
+        digest = _fetch(session, model["url"], part_path, offset, digest)
+
+    sha256 = digest.hexdigest()
+    if not _verify(part_path, expected_size, expected_sha, sha256):
+        os.remove(part_path)
+        raise IntegrityError(f"size/sha256 mismatch for {model['filename']} (got {sha256[:12]}...)")
+    os.replace(part_path, path)
+    console.print(f"[green]  - {model['desc']} Online.[/green]")
+    return _stamp_entry(path, sha256, model)
+
+
+def _fetch(session, url: str, part_path: Path, offset: int, digest):
+    """Streams `url` into `part_path` from `offset`, extending `digest`. Returns the digest."""
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+    with session.get(url, headers=headers, stream=True,
+                     timeout=(Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT)) as response:
+        if offset and response.status_code == 416:
+            # Nothing left to fetch (the size wasn't known up front); verification decides
+            return digest
+        response.raise_for_status()
+        if offset and response.status_code != 206:
+            # Range ignored by the server: start over
+            offset, digest = 0, hashlib.sha256()
+        with open(part_path, "ab" if offset else "wb") as f:
+            for chunk in response.iter_content(chunk_size=Config.MODEL_DOWNLOAD_CHUNK):
+                f.write(chunk)
+                digest.update(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+    return digest
+
+
+def _expected(model: Dict, session) -> Tuple[Optional[int], Optional[str]]:
+    """(size, sha256) from the model entry, else from the origin's HEAD response."""
+    if model.get("sha256") and model.get("size"):
+        return model["size"], model["sha256"]
+    response = session.head(model["url"], allow_redirects=False, timeout=Config.HTTP_CONNECT_TIMEOUT)
+    if response.is_redirect and "X-Linked-Size" not in response.headers:
+        response = session.head(model["url"], allow_redirects=True, timeout=Config.HTTP_CONNECT_TIMEOUT)
+    if not response.is_redirect:
+        response.raise_for_status()
+    headers = response.headers
+    # A redirect's Content-Length describes the redirect body, not the model
+    size = headers.get("X-Linked-Size") or (None if response.is_redirect else headers.get("Content-Length"))
+    sha = (headers.get("X-Linked-Etag") or "").strip('"').lower()
+    return (model.get("size") or (int(size) if size else None),
+            model.get("sha256") or (sha if len(sha) == 64 else None))
+
+
+def _verify(path: Path, expected_size: Optional[int], expected_sha: Optional[str], sha256: str) -> bool:
+    if expected_size is not None and path.stat().st_size != expected_size:
+        return False
+    return expected_sha is None or sha256 == expected_sha
+
+
+def _stamp_entry(path: Path, sha256: str, model: Dict) -> Dict:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns, "sha256": sha256, "url": model["url"]}
+
+
+def digest_of(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(Config.MODEL_DOWNLOAD_CHUNK), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
 if __name__ == "__main__":
     ensure_models_exist()
@@ -1,7 +1,21 @@
-import json
-import requests
 import os
+from typing import Callable, Iterator, Optional
+from .cancellation import MissionCancelled, cancellable, check_cancel
 from .config import Config
+from .context_packer import ContextPacker
+from .transport import get_session
+from .llm_cache import get_response_cache
+from .provider_router import get_router
+from .telemetry import telemetry
+
+# chat_completion reports failures as text rather than raising
+FAILURE_PREFIXES = ("Error:", "Reference Code 0x0")
+
+
+def is_failure(text) -> bool:
+    """Whether an LLM reply is unusable: empty, or one of the client's failure texts."""
+    return not text or (isinstance(text, str) and text.startswith(FAILURE_PREFIXES))
+
 
 class OpenRouterClient:
     def __init__(self, model_name: str = "nvidia/nemotron-nano-12b-v2-vl:free"):
@@ -14,48 +28,134 @@ class OpenRouterClient:
             "X-Title": "Skyscope Sentinel Swarm", # Site title for rankings
             "Content-Type": "application/json"
         }
+        self.session = get_session(self.base_url)
+        self.cache = get_response_cache()
+        self.router = get_router()
+        self.tokenizer = ContextPacker(model=model_name) # Token accounting for telemetry
 
-    def chat_completion(self, messages: list, temperature: float = 0.7) -> str:
+    def chat_completion(self, messages: list, temperature: Optional[float] = 0.7,
+                        on_token: Optional[Callable[[str], None]] = None,
+                        use_cache: bool = True) -> str:
         """
-        Sends a chat completion request to OpenRouter.
+        Sends a chat completion request through the provider router
+        (OpenRouter first, then the local fallbacks).
+        With `on_token`, the completion is streamed and each token is passed
+        to the callback as it arrives; the assembled text is still returned.
+        Responses are served from / stored in the shared response cache unless
+        `use_cache` is False; identical concurrent requests share one call.
+        Raises MissionCancelled when the calling mission has been cancelled; inside
+        a cancellable mission every completion streams, so that is checked per token.
         """
-        if not self.api_key:
-            print("[Warning] No OPENROUTER_API_KEY found. Client is disabled.")
-            return "Reference Code 0x0: OpenRouter Uplink Failed."
+        check_cancel()
+        if on_token is None and cancellable():
+            on_token = lambda token: None # The stream itself checks for cancellation
+        if on_token:
+            parts = []
+            for token in self.chat_completion_stream(messages, temperature, use_cache=use_cache):
+                parts.append(token)
+                on_token(token)
+            return "".join(parts)
 
-        payload = {
-            "model": self.model_name,
-            "messages": messages,
-            "temperature": temperature,
-            # Optional: Add tools, response_format, etc. here if needed later
-        }
+        if not self.router.providers:
+            print("[Warning] No LLM providers configured (OPENROUTER_API_KEY / LocalAGI / LocalAI / embedded). Client is disabled.")
+            return "Reference Code 0x0: OpenRouter Uplink Failed."
 
+        served = {}
         try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=self.headers,
-                data=json.dumps(payload),
-                timeout=60
+            return self.cache.get_or_compute(
+                self.model_name, messages, temperature,
+                lambda: self._request_completion(messages, temperature, served),
+                use_cache=use_cache,
+                keep=lambda: self._cacheable(served),
             )
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract content from choices
-            if 'choices' in data and len(data['choices']) > 0:
-                return data['choices'][0]['message']['content']
-            return ""
-            
         except Exception as e:
             print(f"[Error] OpenRouter Request Failed: {e}")
             return f"Error: {str(e)}"
 
+    def chat_completion_stream(self, messages: list, temperature: Optional[float] = 0.7,
+                               use_cache: bool = True) -> Iterator[str]:
+        """
+        Streams a chat completion (SSE, `stream: true`) via the router, yielding
+        content tokens as they arrive. Failures before the first token yield the
+        same fallback strings as `chat_completion`. A cached response is yielded
+        as a single chunk; complete streams are written back to the cache, and
+        identical concurrent streams share one upstream call (followers get the
+        finished text as a single chunk).
+        """
+        if not self.router.providers:
+            print("[Warning] No LLM providers configured (OPENROUTER_API_KEY / LocalAGI / LocalAI / embedded). Client is disabled.")
+            yield "Reference Code 0x0: OpenRouter Uplink Failed."
+            return
+
+        use_cache = use_cache and self.cache.enabled
+        if use_cache:
+            cached = self.cache.get(self.model_name, messages, temperature)
+            if cached is not None:
+                yield cached
+                return
+
+        served = {}
+        tokens = lambda: self._stream_completion(messages, temperature, served)
+        if use_cache:
+            stream = self.cache.stream(self.model_name, messages, temperature, tokens,
+                                       keep=lambda: self._cacheable(served))
+        else:
+            stream = tokens()
+        received = False
+        try:
+            for token in stream:
+                check_cancel() # Closing the stream frees the provider mid-completion
+                received = True
+                yield token
+        except MissionCancelled:
+            raise
+        except Exception as e:
+            print(f"[Error] OpenRouter Stream Failed: {e}")
+            if not received:
+                yield f"Error: {str(e)}"
+        finally:
+            # Deterministically: releases the provider and wakes any coalesced waiters
+            stream.close()
+
+    def _cacheable(self, served: dict) -> bool:
+        # Cache keys name self.model_name, which only the primary provider serves;
+        # a fallback's answer (another model) must not be replayed under that key
+        return bool(self.router.providers) and served.get("provider") == self.router.providers[0].name
+
+    def _request_completion(self, messages: list, temperature: float, served: dict) -> str:
+        # The router picks the healthiest provider and hedges slow calls
+        with telemetry.span("llm.call", model=self.model_name, stream=False) as span:
+            text, provider = self.router.complete(messages, temperature, model=self.model_name)
+            served["provider"] = provider
+            span.set(provider=provider)
+            self._record_tokens(messages, text, provider)
+        return text
+
+    def _stream_completion(self, messages: list, temperature: float, served: dict) -> Iterator[str]:
+        parts = []
+        # The router annotates the span with the provider that streams
+        with telemetry.span("llm.call", model=self.model_name, stream=True) as span:
+            for token in self.router.stream(messages, temperature, model=self.model_name):
+                parts.append(token)
+                yield token
+            served["provider"] = span.attrs.get("provider")
+            self._record_tokens(messages, "".join(parts), served["provider"])
+
+    def _record_tokens(self, messages: list, completion: str, provider: Optional[str]):
+        prompt_tokens = sum(self.tokenizer.count(message.get("content") or "") for message in messages)
+        completion_tokens = self.tokenizer.count(completion) if completion else 0
+        telemetry.annotate(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+        telemetry.incr("llm_tokens", prompt_tokens, direction="prompt", provider=provider or "unknown")
+        telemetry.incr("llm_tokens", completion_tokens, direction="completion", provider=provider or "unknown")
+
     def get_models(self):
         """
         Fetches available models to verify connectivity.
         """
         try:
-            response = requests.get(f"{self.base_url}/models", headers=self.headers)
+            response = self.session.get(f"{self.base_url}/models", headers=self.headers)
             return response.json()
         except Exception as e:
             print(f"[Error] Failed to fetch models: {e}")
             return {}
+
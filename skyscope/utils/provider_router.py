@@ -0,0 +1,370 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .config import Config
+from .embedded_llm import get_embedded_llm
+from .telemetry import carry_context, telemetry
+from .transport import get_session
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+
+def parse_sse_tokens(lines) -> Iterator[str]:
+    """
+    Extracts content deltas from an OpenAI-style SSE stream.
+    Comment lines (": OPENROUTER PROCESSING") and keep-alives are skipped.
+    """
+    for line in lines:
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+        chunk = json.loads(data)
+        if "error" in chunk:
+            raise RuntimeError(chunk["error"].get("message", chunk["error"]))
+        for choice in chunk.get("choices", []):
+            content = (choice.get("delta") or {}).get("content")
+            if content:
+                yield content
+
+
+class Provider:
+    """
+    One OpenAI-compatible chat backend plus its rolling health statistics
+    and circuit breaker.
+    """
+
+    def __init__(self, name: str, base_url: str, api_key: str, model: str,
+                 extra_headers: Dict = None, accepts_model_override: bool = False):
+        self.name = name
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.accepts_model_override = accepts_model_override
+        self.headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+        self.headers.update(extra_headers or {})
+        self.session = get_session(self.base_url)
+        self._init_health()
+
+    def _init_health(self):
+        self._lock = threading.Lock()
+        self.latencies = deque(maxlen=Config.ROUTER_WINDOW)
+        self.outcomes = deque(maxlen=Config.ROUTER_WINDOW)
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    # --- Requests -------------------------------------------------------
+
+    def payload(self, messages: list, temperature: Optional[float], model: Optional[str], stream: bool) -> Dict:
+        payload = {
+            "model": model if (model and self.accepts_model_override) else self.model,
+            "messages": messages,
+        }
+        if temperature is not None:
+            payload["temperature"] = temperature
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    def complete(self, messages: list, temperature: Optional[float], model: Optional[str] = None) -> str:
+        response = self.session.post(
+            f"{self.base_url}/chat/completions",
+            headers=self.headers,
+            data=json.dumps(self.payload(messages, temperature, model, stream=False)),
+            timeout=Config.ROUTER_TIMEOUT
+        )
+        response.raise_for_status()
+        data = response.json()
+        if 'choices' in data and len(data['choices']) > 0:
+            return data['choices'][0]['message']['content']
+        return ""
+
+    def stream(self, messages: list, temperature: Optional[float], model: Optional[str] = None) -> Iterator[str]:
+        response = self.session.post(
+            f"{self.base_url}/chat/completions",
+            headers=self.headers,
+            data=json.dumps(self.payload(messages, temperature, model, stream=True)),
+            timeout=Config.ROUTER_TIMEOUT,
+            stream=True
+        )
+        response.raise_for_status()
+        # text/event-stream carries no charset; requests would otherwise assume latin-1
+        response.encoding = "utf-8"
+        with response:
+            yield from parse_sse_tokens(response.iter_lines(decode_unicode=True))
+
+    def probe(self) -> bool:
+        try:
+            response = self.session.get(f"{self.base_url}/models", headers=self.headers,
+                                        timeout=Config.HTTP_CONNECT_TIMEOUT)
+            return response.status_code < 500
+        except Exception:
+            return False
+
+    # --- Health & circuit breaker ----------------------------------------
+
+    def allow(self) -> bool:
+        """Whether a call may be sent now. An open breaker admits one trial call after the cooldown."""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= Config.ROUTER_BREAKER_COOLDOWN:
+                self.state = HALF_OPEN
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record(self, ok: bool, latency: float = None):
+        with self._lock:
+            self.outcomes.append(ok)
+            self._trial_in_flight = False
+            if ok:
+                if latency is not None:
+                    self.latencies.append(latency)
+                self.consecutive_failures = 0
+                self.state = CLOSED
+            else:
+                self.consecutive_failures += 1
+                if self.state == HALF_OPEN or self.consecutive_failures >= Config.ROUTER_BREAKER_THRESHOLD:
+                    if self.state != OPEN:
+                        print(f"[Router] Circuit open for '{self.name}' after {self.consecutive_failures} failure(s).")
+                    self.state = OPEN
+                    self.opened_at = time.monotonic()
+
+    def release(self):
+        """Frees a half-open trial slot without recording an outcome (the call was abandoned)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_probe(self, ok: bool):
+        with self._lock:
+            if ok and self.state == OPEN:
+                # Reachable again: let the next real call through as a trial
+                self.state = HALF_OPEN
+            elif not ok and self.state != OPEN:
+                self.consecutive_failures += 1
+                if self.consecutive_failures >= Config.ROUTER_BREAKER_THRESHOLD:
+                    self.state = OPEN
+                    self.opened_at = time.monotonic()
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self.latencies)
+        if len(samples) < Config.ROUTER_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(round(pct / 100.0 * (len(samples) - 1))))]
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            outcomes = list(self.outcomes)
+            state = self.state
+        return {
+            "state": state,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "error_rate": (outcomes.count(False) / len(outcomes)) if outcomes else 0.0,
+            "calls": len(outcomes),
+        }
+
+
+class EmbeddedProvider(Provider):
+    """
+    The in-process llama.cpp model (see embedded_llm). No HTTP hop; it shares
+    the health statistics and circuit breaker of the network providers.
+    """
+
+    def __init__(self, name: str = "embedded"):
+        self.name = name
+        self.llm = get_embedded_llm()
+        self.model = os.path.basename(self.llm.model_path)
+        self.accepts_model_override = False
+        self._init_health()
+
+    def complete(self, messages: list, temperature: Optional[float], model: Optional[str] = None) -> str:
+        return self.llm.complete(messages, temperature)
+
+    def stream(self, messages: list, temperature: Optional[float], model: Optional[str] = None) -> Iterator[str]:
+        yield from self.llm.stream(messages, temperature)
+
+    def probe(self) -> bool:
+        return self.llm.available()
+
+
+class ProviderRouter:
+    """
+    Routes chat completions across providers in priority order.
+
+    - Providers with an open circuit breaker are skipped until their cooldown
+      (or a successful health probe) allows a trial call.
+    - Non-streaming calls are hedged: if the primary hasn't answered within
+      its rolling p95 latency, the next provider is raced against it.
+    - Streaming calls fail over to the next provider only before the first token.
+    """
+
+    def __init__(self, providers: List[Provider]):
+        self.providers = providers
+        self._pool = ThreadPoolExecutor(max_workers=Config.ROUTER_MAX_WORKERS, thread_name_prefix="skyscope-router")
+        self._probe_thread = None
+        self._stop = threading.Event()
+
+    def complete(self, messages: list, temperature: Optional[float] = None,
+                 model: Optional[str] = None) -> Tuple[str, str]:
+        """Returns (text, provider name). Raises if every provider fails."""
+        candidates = self._candidates()
+        timed_call = carry_context(self._timed_call) # Workers see the caller's context (its open llm.call span)
+        futures = {}
+        errors = []
+
+        def launch() -> bool:
+            provider = next(candidates, None)
+            if provider is None:
+                return False
+            futures[self._pool.submit(timed_call, provider, messages, temperature, model)] = provider
+            return True
+
+        if not launch():
+            raise RuntimeError("No LLM providers available (all circuits open).")
+
+        while futures:
+            latest = list(futures.values())[-1]
+            hedge_after = latest.percentile(95) or Config.ROUTER_HEDGE_DEFAULT
+            done, _ = wait(list(futures), timeout=hedge_after, return_when=FIRST_COMPLETED)
+
+            if not done:
+                # Slower than this provider's p95: race the next one against it
+                if launch():
+                    print(f"[Router] '{latest.name}' exceeded {hedge_after:.1f}s; hedging to "
+                          f"'{list(futures.values())[-1].name}'.")
+                continue
+
+            for future in done:
+                provider = futures.pop(future)
+                try:
+                    return future.result(), provider.name
+                except Exception as e:
+                    errors.append(f"{provider.name}: {e}")
+            if not futures:
+                launch()
+
+        raise RuntimeError("All providers failed: " + "; ".join(errors))
+
+    def stream(self, messages: list, temperature: Optional[float] = None,
+               model: Optional[str] = None) -> Iterator[str]:
+        """Yields tokens from the first provider that starts streaming."""
+        errors = []
+        for provider in self._candidates():
+            received = False
+            telemetry.annotate(provider=provider.name)
+            try:
+                for token in provider.stream(messages, temperature, model):
+                    received = True
+                    yield token
+                # Stream duration depends on output length, so it stays out of the hedging percentiles
+                provider.record(True)
+                telemetry.incr("llm_calls", provider=provider.name, outcome="ok")
+                return
+            except Exception as e:
+                provider.record(False)
+                telemetry.incr("llm_calls", provider=provider.name, outcome="error")
+                if received:
+                    raise
+                errors.append(f"{provider.name}: {e}")
+                print(f"[Router] '{provider.name}' failed before first token ({e}); failing over.")
+            except BaseException:
+                # The consumer stopped early (closed the generator, cancelled, interrupted):
+                # tokens already flowing count as a success, otherwise just free the trial slot
+                if received:
+                    provider.record(True)
+                    telemetry.incr("llm_calls", provider=provider.name, outcome="ok")
+                else:
+                    provider.release()
+                raise
+        raise RuntimeError("All providers failed: " + ("; ".join(errors) or "all circuits open"))
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {provider.name: provider.snapshot() for provider in self.providers}
+
+    def start_probes(self, interval: float = None):
+        """Starts the background health-probe loop (daemon thread)."""
+        if self._probe_thread and self._probe_thread.is_alive():
+            return
+        interval = interval or Config.ROUTER_PROBE_INTERVAL
+
+        def loop():
+            while not self._stop.wait(interval):
+                for provider in self.providers:
+                    provider.record_probe(provider.probe())
+
+        self._probe_thread = threading.Thread(target=loop, name="skyscope-probes", daemon=True)
+        self._probe_thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _candidates(self) -> Iterator[Provider]:
+        # Lazy, so a half-open provider's single trial slot is only taken when it is actually called
+        return (provider for provider in self.providers if provider.allow())
+
+    def _timed_call(self, provider: Provider, messages: list, temperature: Optional[float], model: Optional[str]) -> str:
+        start = time.monotonic()
+        try:
+            text = provider.complete(messages, temperature, model)
+        except Exception:
+            provider.record(False)
+            telemetry.incr("llm_calls", provider=provider.name, outcome="error")
+            raise
+        provider.record(True, time.monotonic() - start)
+        telemetry.incr("llm_calls", provider=provider.name, outcome="ok")
+        return text
+
+
+def default_providers() -> List[Provider]:
+    """Builds the provider chain from Config.ROUTER_PROVIDERS (priority order)."""
+    available = {}
+    if Config.OPENROUTER_API_KEY:
+        available["openrouter"] = lambda: Provider(
+            "openrouter", "https://openrouter.ai/api/v1", Config.OPENROUTER_API_KEY, Config.MODEL_NAME,
+            extra_headers={
+                "HTTP-Referer": "https://github.com/skyscope-sentinel", # Site URL for rankings
+                "X-Title": "Skyscope Sentinel Swarm", # Site title for rankings
+            },
+            accepts_model_override=True,
+        )
+    if Config.LOCALAGI_BASE_URL:
+        # Assuming OpenAI compat endpoint
+        available["localagi"] = lambda: Provider(
+            "localagi", f"{Config.LOCALAGI_BASE_URL.rstrip('/')}/v1", "sk-localagi", Config.LOCAL_MODEL_NAME)
+    if Config.LOCALAI_BASE_URL:
+        available["localai"] = lambda: Provider(
+            "localai", Config.LOCALAI_BASE_URL, "sk-localai", Config.LOCAL_MODEL_NAME)
+
+    if get_embedded_llm().installed():
+        # Offered even while the GGUF is still downloading: calls fail (and the breaker
+        # opens) until the file lands, then the health probe lets it back in
+        available["embedded"] = EmbeddedProvider
+
+    names = [name.strip() for name in Config.ROUTER_PROVIDERS.split(",") if name.strip()]
+    return [available[name]() for name in names if name in available]
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> ProviderRouter:
+    """Process-wide router shared by every agent, so health statistics accumulate in one place."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ProviderRouter(default_providers())
+            if Config.ROUTER_PROBE_INTERVAL > 0:
+                _router.start_probes()
+        return _router
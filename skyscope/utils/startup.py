@@ -0,0 +1,108 @@
+import builtins
+import importlib.util
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Tuple
+
+
+class StartupProfiler:
+    """
+    Startup timing report: named spans for subsystem initialization plus
+    `-X importtime`-style self time of first imports, grouped per package
+    (skyscope modules are listed individually).
+
+    Enabled by `--startup-report` or SKYSCOPE_STARTUP_REPORT=1; when disabled,
+    spans cost one perf_counter call and imports are not hooked.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, str, float]] = [] # (group, name, seconds)
+        self.imports: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._original_import = None
+
+    @contextmanager
+    def span(self, name: str, group: str = "startup"):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, group)
+
+    def record(self, name: str, seconds: float, group: str = "startup"):
+        with self._lock:
+            self.spans.append((group, name, seconds))
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    # --- Import timing ----------------------------------------------------
+
+    def track_imports(self):
+        if not self.enabled or self._original_import:
+            return
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def stop_tracking_imports(self):
+        if self._original_import:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        try:
+            absolute = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__")) if level else name
+        except (ImportError, ValueError):
+            absolute = name
+        if absolute in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0.0) # time spent in nested imports
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            key = absolute if absolute.startswith("skyscope.") else absolute.split(".")[0]
+            with self._lock:
+                self.imports[key] = self.imports.get(key, 0.0) + elapsed - nested
+
+    # --- Report -----------------------------------------------------------
+
+    def report(self, title: str = "Startup Report", groups: Tuple[str, ...] = ("startup",), top_imports: int = 12):
+        if not self.enabled:
+            return
+        from rich.console import Console
+        from rich.table import Table
+
+        table = Table(title=title, border_style="dim")
+        table.add_column("Subsystem", style="cyan")
+        table.add_column("ms", justify="right")
+        with self._lock:
+            spans = [span for span in self.spans if span[0] in groups]
+            imports = sorted(self.imports.items(), key=lambda item: -item[1])[:top_imports]
+        for _, name, seconds in spans:
+            table.add_row(name, f"{seconds * 1000:.1f}")
+        if imports and "startup" in groups:
+            table.add_section()
+            for module, seconds in imports:
+                table.add_row(f"[dim]import {module}[/dim]", f"[dim]{seconds * 1000:.1f}[/dim]")
+        Console().print(table)
+
+
+startup = StartupProfiler(
+    enabled="--startup-report" in sys.argv or os.getenv("SKYSCOPE_STARTUP_REPORT", "0") not in ("0", "false", "False")
+)
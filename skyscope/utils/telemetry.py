@@ -0,0 +1,245 @@
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+
+from .config import Config
+
+# Span attributes that become Prometheus labels; everything else only goes to the JSONL trace
+LABEL_ATTRS = ("phase", "provider", "kind", "outcome")
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Open spans of the current context, innermost last. Immutable, so a copied context
+# (a pool worker running `carry_context` work) extends its own stack, not the caller's
+_open_spans: contextvars.ContextVar[Tuple] = contextvars.ContextVar("skyscope_spans", default=())
+
+
+def carry_context(fn: Callable) -> Callable:
+    """
+    Wraps `fn` to run in a copy of the caller's context, so work handed to a
+    thread pool nests under the caller's open span (and sees its other context
+    variables). Captured at wrap time; each call gets its own copy, so a
+    wrapped function can be mapped across many workers at once.
+    """
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.copy().run(fn, *args, **kwargs)
+
+
+class Span:
+    def __init__(self, name: str, trace_id: str, parent: Optional[str], attrs: Dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.parent = parent
+        self.attrs = attrs
+        self.start = time.perf_counter()
+        self.duration = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class Telemetry:
+    """
+    Mission tracing and metrics.
+
+    - `span(name, **attrs)` times a block. Spans nest per context (thread,
+      or work submitted through `carry_context`) and share the root's trace id; finished spans feed the `skyscope_span_seconds`
+      summary (rolling p50/p95/p99) and, with TELEMETRY_JSONL_PATH, are
+      appended to a JSON-lines trace.
+    - `incr(name, value, **labels)` counts tokens, bytes, cache outcomes and calls.
+    - `prometheus()` renders everything in the Prometheus text format; it is
+      rewritten to TELEMETRY_PROMETHEUS_PATH after each mission and served
+      on TELEMETRY_PROMETHEUS_PORT when set.
+    """
+
+    def __init__(self, jsonl_path: str = None, window: int = None):
+        self.jsonl_path = jsonl_path if jsonl_path is not None else Config.TELEMETRY_JSONL_PATH
+        self.window = window or Config.TELEMETRY_WINDOW
+        self.counters: Dict[Tuple, float] = {}
+        self.samples: Dict[Tuple, deque] = {}
+        self.totals: Dict[Tuple, list] = {} # series -> [count, sum]
+        self.last: Dict[str, float] = {} # span name -> latest duration
+        self._lock = threading.Lock()
+        self._server = None
+
+    # --- Recording --------------------------------------------------------
+
+    @staticmethod
+    def _current() -> Optional[Span]:
+        # Skips spans that already closed elsewhere (e.g. an abandoned generator finalized on another thread)
+        return next((span for span in reversed(_open_spans.get()) if span.duration is None), None)
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        parent = self._current()
+        span = Span(name, parent.trace_id if parent else uuid.uuid4().hex[:16], parent.name if parent else None, attrs)
+        _open_spans.set(_open_spans.get() + (span,))
+        try:
+            yield span
+        except BaseException as e:
+            span.attrs.setdefault("outcome", "error")
+            span.attrs.setdefault("error", f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            # Not necessarily the top: a span inside an abandoned generator closes late
+            _open_spans.set(tuple(open_span for open_span in _open_spans.get() if open_span is not span))
+            span.duration = time.perf_counter() - span.start
+            self._finish(span)
+
+    def annotate(self, **attrs):
+        """Adds attributes to the innermost open span (e.g. the provider that answered)."""
+        span = self._current()
+        if span:
+            span.set(**attrs)
+
+    def record(self, name: str, seconds: float, **attrs):
+        """Records a span timed elsewhere (e.g. a background render)."""
+        parent = self._current()
+        span = Span(name, parent.trace_id if parent else uuid.uuid4().hex[:16], parent.name if parent else None, attrs)
+        span.duration = seconds
+        self._finish(span)
+
+    def incr(self, name: str, value: float = 1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def _finish(self, span: Span):
+        labels = tuple(sorted((k, str(v)) for k, v in span.attrs.items() if k in LABEL_ATTRS and v is not None))
+        key = (span.name, labels)
+        with self._lock:
+            self.samples.setdefault(key, deque(maxlen=self.window)).append(span.duration)
+            totals = self.totals.setdefault(key, [0, 0.0])
+            totals[0] += 1
+            totals[1] += span.duration
+            self.last[span.name] = span.duration
+            if self.jsonl_path:
+                record = {"ts": time.time(), "trace": span.trace_id, "span": span.name, "parent": span.parent,
+                          "seconds": round(span.duration, 6), **span.attrs}
+                os.makedirs(os.path.dirname(os.path.abspath(self.jsonl_path)), exist_ok=True)
+                with open(self.jsonl_path, "a") as f:
+                    f.write(json.dumps(record, default=str) + "\n")
+
+    # --- Queries ----------------------------------------------------------
+
+    def quantile(self, name: str, q: float) -> Optional[float]:
+        """Rolling quantile of a span's durations across all its label sets."""
+        with self._lock:
+            values = sorted(v for (span, _), samples in self.samples.items() if span == name for v in samples)
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+    def count(self, name: str, **labels) -> float:
+        """Sum of a counter over every series matching `labels`."""
+        wanted = set(labels.items())
+        with self._lock:
+            return sum(value for (counter, series), value in self.counters.items()
+                       if counter == name and wanted <= set(series))
+
+    def snapshot(self) -> Dict:
+        """Headline numbers for the dashboard."""
+        with self._lock:
+            last = dict(self.last)
+            missions = sum(totals[0] for (span, _), totals in self.totals.items() if span == "mission")
+            providers = {}
+            for (counter, series), value in self.counters.items():
+                if counter == "llm_calls" and ("outcome", "ok") in series:
+                    provider = dict(series).get("provider", "?")
+                    providers[provider] = providers.get(provider, 0) + value
+
+        def hit_rate(cache):
+            hits = self.count("cache_requests", cache=cache, outcome="hit")
+            total = hits + self.count("cache_requests", cache=cache, outcome="miss")
+            return hits / total if total else None
+
+        return {
+            "missions": missions,
+            "mission_p50": self.quantile("mission", 0.5),
+            "mission_p95": self.quantile("mission", 0.95),
+            "phases": {phase: last.get(phase) for phase in ("blueprint", "research", "analysis", "simulation")},
+            "tokens_prompt": self.count("llm_tokens", direction="prompt"),
+            "tokens_completion": self.count("llm_tokens", direction="completion"),
+            "bytes_fetched": self.count("fetched_bytes"),
+            "content_hit_rate": hit_rate("content"),
+            "llm_hit_rate": hit_rate("llm"),
+            "providers": providers,
+        }
+
+    # --- Export -----------------------------------------------------------
+
+    def prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+            summaries = sorted((key, sorted(samples), self.totals[key]) for key, samples in self.samples.items())
+
+        declared = set()
+        for (name, series), value in counters:
+            metric = f"skyscope_{name}_total"
+            if metric not in declared:
+                lines.append(f"# TYPE {metric} counter")
+                declared.add(metric)
+            lines.append(f"{metric}{_labels(series)} {value:.15g}")
+
+        lines.append("# TYPE skyscope_span_seconds summary")
+        for (name, series), values, (count, total) in summaries:
+            series = (("span", name),) + series
+            for q in QUANTILES:
+                value = values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+                lines.append(f"skyscope_span_seconds{_labels(series + (('quantile', str(q)),))} {value:.6f}")
+            lines.append(f"skyscope_span_seconds_count{_labels(series)} {count}")
+            lines.append(f"skyscope_span_seconds_sum{_labels(series)} {total:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        """Rewrites the Prometheus textfile (node_exporter textfile-collector style), atomically."""
+        path = Config.TELEMETRY_PROMETHEUS_PATH
+        if not path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.prometheus())
+        os.replace(tmp_path, path)
+
+    def serve(self, port: int = None) -> Optional[int]:
+        """Serves /metrics on localhost from a daemon thread. Returns the bound port."""
+        port = Config.TELEMETRY_PROMETHEUS_PORT if port is None else port
+        if self._server or not port:
+            return self._server.server_address[1] if self._server else None
+        telemetry = self
+
+        class _MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                payload = telemetry.prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="skyscope-metrics", daemon=True).start()
+        return self._server.server_address[1]
+
+
+def _labels(series) -> str:
+    if not series:
+        return ""
+    def escape(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in series) + "}"
+
+
+telemetry = Telemetry()
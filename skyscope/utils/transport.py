@@ -0,0 +1,121 @@
+"""
+Shared HTTP transport for every service client.
+
+One pooled, keep-alive `requests.Session` per base URL (scheme://host:port),
+with default timeouts and retry + jittered backoff on 429/5xx. SDK clients
+(OpenAI, ElevenLabs) share one pooled httpx client and are cached per
+base URL / key so they are built once per process.
+"""
+import threading
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import Config
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_lock = threading.Lock()
+_sessions: Dict[str, requests.Session] = {}
+_sdk_clients: Dict[Tuple, object] = {}
+_httpx_client = None
+
+
+class PooledSession(requests.Session):
+    """requests.Session that applies the configured timeout when a call doesn't set one."""
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", (Config.HTTP_CONNECT_TIMEOUT, Config.HTTP_READ_TIMEOUT))
+        return super().request(method, url, **kwargs)
+
+
+def _retry_policy() -> Retry:
+    options = dict(
+        total=Config.HTTP_RETRIES,
+        connect=Config.HTTP_RETRIES,
+        # A read timeout means the server may already be working on the request (and billing it)
+        read=0,
+        backoff_factor=Config.HTTP_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=None,  # POSTs are replayed only when refused outright: connect errors, 429/5xx
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    try:
+        return Retry(backoff_jitter=Config.HTTP_BACKOFF_JITTER, **options)
+    except TypeError:
+        # urllib3 < 2.0 has no jitter support
+        return Retry(**options)
+
+
+def origin(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def get_session(url: str) -> requests.Session:
+    """Returns the shared keep-alive session for the origin of `url`."""
+    key = origin(url)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = PooledSession()
+            adapter = HTTPAdapter(
+                pool_connections=Config.HTTP_POOL_CONNECTIONS,
+                pool_maxsize=Config.HTTP_POOL_MAXSIZE,
+                max_retries=_retry_policy(),
+            )
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sessions[key] = session
+        return session
+
+
+def get_httpx_client():
+    """Shared pooled httpx client for SDKs built on httpx (OpenAI, ElevenLabs)."""
+    global _httpx_client
+    import httpx
+
+    with _lock:
+        if _httpx_client is None:
+            _httpx_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=Config.HTTP_POOL_MAXSIZE * Config.HTTP_POOL_CONNECTIONS,
+                    max_keepalive_connections=Config.HTTP_POOL_MAXSIZE,
+                ),
+                timeout=httpx.Timeout(Config.HTTP_READ_TIMEOUT, connect=Config.HTTP_CONNECT_TIMEOUT),
+            )
+        return _httpx_client
+
+
+def get_openai_client(base_url: str, api_key: str):
+    """Cached OpenAI-compatible client; the SDK retries 429/5xx with jittered backoff itself."""
+    key = ("openai", base_url, api_key)
+    with _lock:
+        client = _sdk_clients.get(key)
+    if client is None:
+        from openai import OpenAI
+        client = OpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            http_client=get_httpx_client(),
+            max_retries=Config.HTTP_RETRIES,
+        )
+        with _lock:
+            client = _sdk_clients.setdefault(key, client)
+    return client
+
+
+def get_elevenlabs_client(api_key: str):
+    key = ("elevenlabs", api_key)
+    with _lock:
+        client = _sdk_clients.get(key)
+    if client is None:
+        from elevenlabs.client import ElevenLabs
+        client = ElevenLabs(api_key=api_key, httpx_client=get_httpx_client())
+        with _lock:
+            client = _sdk_clients.setdefault(key, client)
+    return client
@@ -1,65 +1,98 @@
 import os
+import tempfile
 import time
-from moviepy.video.VideoClip import ColorClip, TextClip
-from moviepy.video.compositing.CompositeVideoClip import concatenate_videoclips
-from moviepy.audio.io.AudioFileClip import AudioFileClip
-from moviepy.audio.AudioClip import AudioArrayClip
-from elevenlabs.client import ElevenLabs
+import numpy as np
+import soundfile as sf
 from ..utils.config import Config
+from ..utils.transport import get_elevenlabs_client, get_openai_client
 
+from .stills import render_slides, encode_stills
 from .tts_engine import TTSEngine
 
+
+def render_moviepy(audio_path: str, output_path: str) -> str:
+    """Original path: composites and encodes every frame at 24 fps for the full narration."""
+    # Imported here: moviepy is heavy and the default stills path never needs it
+    from moviepy.video.VideoClip import ColorClip, TextClip
+    from moviepy.video.compositing.CompositeVideoClip import concatenate_videoclips
+    from moviepy.audio.io.AudioFileClip import AudioFileClip
+
+    # Create visuals
+    # For this simulated environment, we create a simple text-based video
+    # In a real heavy-compute env, we would generate images or pick stock footage
+
+    # Create a video clip that matches the audio duration
+    audio = AudioFileClip(audio_path)
+    duration = audio.duration
+
+    # Background
+    bg = ColorClip(size=(1280, 720), color=(0, 0, 0), duration=duration)
+
+    # Text overlay (Title)
+    # Note: TextClip requires ImageMagick. If failing, we fallback to just audio or blank video
+    try:
+        txt = TextClip(text="SKYSCOPE CLASSIFIED BRIEFING", font_size=70, color='white', size=(1280, 720))
+        txt = txt.with_duration(duration)
+        video = concatenate_videoclips([bg, txt], method="compose") # Simplification
+    except OSError:
+        # ImageMagick likely missing
+        video = bg
+
+    video = video.with_audio(audio)
+    video.write_videofile(output_path, fps=24)
+    audio.close()
+    return output_path
+
+
 class VideoGenerator:
     def __init__(self, output_dir="."):
         self.tts_engine = TTSEngine()
         self.output_dir = output_dir
         self.el_client = None
         if Config.ELEVENLABS_API_KEY:
-            self.el_client = ElevenLabs(api_key=Config.ELEVENLABS_API_KEY)
-        # Create visuals
-        # For this simulated environment, we create a simple text-based video
-        # In a real heavy-compute env, we would generate images or pick stock footage
-        
+            self.el_client = get_elevenlabs_client(Config.ELEVENLABS_API_KEY)
+
+    def generate(self, filename: str, text: str) -> str:
+        """
+        Renders the video briefing: narrated trajectory over a title card.
+        VIDEO_RENDER_MODE "stills" (default) encodes pre-rendered slides with
+        ffmpeg; "moviepy" uses the original per-frame composite.
+        """
+        # Per-briefing audio file so concurrent renders don't clobber each other
+        audio_path = self._generate_audio(text, os.path.join(self.output_dir, f"{os.path.splitext(filename)[0]}_audio.mp3"))
+        output_path = os.path.join(self.output_dir, filename)
+
         try:
-            # Create a video clip that matches the audio duration
-            audio = AudioFileClip(audio_path)
-            duration = audio.duration
-            
-            # Background
-            bg = ColorClip(size=(1280, 720), color=(0, 0, 0), duration=duration)
-            
-            # Text overlay (Title)
-            # Note: TextClip requires ImageMagick. If failing, we fallback to just audio or blank video
-            try:
-                txt = TextClip(text="SKYSCOPE CLASSIFIED BRIEFING", font_size=70, color='white', size=(1280, 720))
-                txt = txt.with_duration(duration)
-                video = concatenate_videoclips([bg, txt], method="compose") # Simplification
-            except OSError:
-                # ImageMagick likely missing
-                video = bg
-
-            video = video.with_audio(audio)
-            
-            output_path = os.path.join(self.output_dir, filename)
-            video.write_videofile(output_path, fps=24)
+            if Config.VIDEO_RENDER_MODE == "moviepy":
+                render_moviepy(audio_path, output_path)
+            else:
+                with tempfile.TemporaryDirectory(prefix="skyscope-slides-") as slides_dir:
+                    encode_stills(render_slides(text, slides_dir), audio_path, output_path)
             return output_path
 
         except Exception as e:
             print(f"Video generation error: {e}")
             return None
+        finally:
+            # The narration is only an intermediate, whether or not the encode succeeded
+            if os.path.exists(audio_path):
+                os.remove(audio_path)
 
-    def _generate_audio(self, text: str) -> str:
+    def _generate_audio(self, text: str, out_path: str = "temp_audio.mp3") -> str:
         """
-        Generates audio using ElevenLabs, LocalAI, or a mock if all else fails.
+        Generates the full narration using Kokoro (local), ElevenLabs, LocalAI,
+        or a mock if all else fails. Returns the path actually written.
         """
-        snippet = text[:500] # Limit for demo
-        out_path = "temp_audio.mp3"
-        
-        # 1. Try ElevenLabs
+        # 1. Try Kokoro (local, parallel, cached per sentence); writes WAV
+        wav_path = f"{os.path.splitext(out_path)[0]}.wav"
+        if self.tts_engine.generate_audio(text, wav_path):
+            return wav_path
+
+        # 2. Try ElevenLabs
         if self.el_client:
             try:
                 audio = self.el_client.generate(
-                    text=snippet,
+                    text=text,
                     voice="Rachel",
                     model="eleven_multilingual_v2"
                 )
@@ -68,29 +101,27 @@ class VideoGenerator:
             except Exception as e:
                 print(f"ElevenLabs error: {e}. Falling back to LocalAI...")
         
-        # 2. Try LocalAI TTS
+        # 3. Try LocalAI TTS
         if Config.LOCALAI_TTS_URL:
             try:
-                import requests
                 # OpenAI-compatible TTS endpoint usually /v1/audio/speech but user doc mentions http://localhost:8080/v1/audio/speech
                 # Using the config variable which defaults to /tts but let's align with OpenAI standard if possible or use the user provided example.
                 # User example: http://localhost:8080/v1/audio/speech
                 
-                # We'll use the OpenAI client for LocalAI TTS as it's cleaner
-                from openai import OpenAI
-                local_client = OpenAI(base_url=Config.LOCALAI_BASE_URL, api_key="sk-xxx")
+                # We'll use the (shared, pooled) OpenAI client for LocalAI TTS as it's cleaner
+                local_client = get_openai_client(base_url=Config.LOCALAI_BASE_URL, api_key="sk-xxx")
                 
                 response = local_client.audio.speech.create(
                     model="tts-1",
                     voice="alloy",
-                    input=snippet
+                    input=text
                 )
                 response.stream_to_file(out_path)
                 return out_path
             except Exception as e:
                 print(f"LocalAI TTS error: {e}. Falling back to mock...")
 
-        # 3. Fallback to Mock
+        # 4. Fallback to Mock
         return self._mock_audio(out_path)
 
     def _save_audio_stream(self, audio_stream, path):
@@ -99,15 +130,10 @@ class VideoGenerator:
                 f.write(chunk)
 
     def _mock_audio(self, path: str) -> str:
-        # Create a silent or dummy audio file if real TTS is not available
-        # Using moviepy to generate silence
-        from moviepy.audio.AudioClip import AudioArrayClip
-        import numpy as np
-        
-        # 5 seconds of silence/noise
+        # Create a silent audio file if real TTS is not available (a WAV; no moviepy needed)
+        # 5 seconds of silence
         rate = 44100
         duration = 5
-        audio_array = np.zeros((rate * duration, 2))
-        clip = AudioArrayClip(audio_array, fps=rate)
-        clip.write_audiofile(path)
-        return path
+        wav_path = f"{os.path.splitext(path)[0]}.wav"
+        sf.write(wav_path, np.zeros((rate * duration, 2), dtype=np.float32), rate)
+        return wav_path
@@ -0,0 +1,144 @@
+import os
+import re
+import subprocess
+import tempfile
+import textwrap
+import time
+from typing import List, Tuple
+
+from PIL import Image, ImageDraw, ImageFont
+
+try:
+    import imageio_ffmpeg
+except ImportError:
+    imageio_ffmpeg = None
+
+from ..utils.config import Config
+
+SIZE = (1280, 720)
+BACKGROUND = (0, 0, 0)
+FOREGROUND = (235, 235, 235)
+ACCENT = (120, 200, 255)
+WATERMARK = (110, 110, 110)
+FONT_CANDIDATES = ("DejaVuSans.ttf", "Arial.ttf", "Helvetica.ttc")
+# Audio codecs the MP4 container carries as-is, so the narration is muxed without re-encoding
+MP4_AUDIO_COPY = (".mp3", ".m4a", ".aac")
+
+
+def ffmpeg_exe() -> str:
+    # moviepy already depends on imageio-ffmpeg, which bundles a static ffmpeg
+    if imageio_ffmpeg:
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    return "ffmpeg"
+
+
+def load_font(size: int):
+    for name in FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 only has the fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def paginate(text: str, width: int = 70, lines_per_slide: int = 14) -> List[str]:
+    """Wraps text into slide pages, keeping paragraph breaks."""
+    lines = []
+    for paragraph in text.splitlines():
+        paragraph = paragraph.strip().lstrip("#").strip()
+        if not paragraph:
+            if lines and lines[-1]:
+                lines.append("")
+            continue
+        lines.extend(textwrap.wrap(paragraph, width=width) or [""])
+    pages = []
+    for i in range(0, len(lines), lines_per_slide):
+        page = "\n".join(lines[i:i + lines_per_slide]).strip()
+        if page:
+            pages.append(page)
+    return pages
+
+
+def render_slides(text: str, out_dir: str, title: str = "SKYSCOPE CLASSIFIED BRIEFING") -> List[Tuple[str, int]]:
+    """
+    Renders the title card plus paginated narration text as PNGs.
+    Returns [(path, weight)], where weight is the slide's share of the narration.
+    """
+    watermark = f"Skyscope Sentinel Intelligence - Video Briefing - {time.strftime('%Y-%m-%d %H:%M GMT', time.gmtime())}"
+    title_font, body_font, small_font = load_font(64), load_font(30), load_font(18)
+    pages = paginate(text)
+    slides = []
+
+    def save(image: Image.Image, index: int, weight: int):
+        ImageDraw.Draw(image).text((SIZE[0] - 24, 20), watermark, font=small_font, fill=WATERMARK, anchor="ra")
+        path = os.path.join(out_dir, f"slide_{index:03d}.png")
+        image.save(path)
+        slides.append((path, weight))
+
+    card = Image.new("RGB", SIZE, BACKGROUND)
+    draw = ImageDraw.Draw(card)
+    draw.text((SIZE[0] // 2, SIZE[1] // 2), title, font=title_font, fill=FOREGROUND, anchor="mm")
+    draw.line((SIZE[0] // 2 - 300, SIZE[1] // 2 + 60, SIZE[0] // 2 + 300, SIZE[1] // 2 + 60), fill=ACCENT, width=3)
+    # The title card holds roughly as long as one page would
+    save(card, 0, max((len(page) for page in pages), default=1))
+
+    for index, page in enumerate(pages, 1):
+        image = Image.new("RGB", SIZE, BACKGROUND)
+        draw = ImageDraw.Draw(image)
+        draw.text((80, 70), f"TRAJECTORY {index}/{len(pages)}", font=small_font, fill=ACCENT)
+        draw.multiline_text((80, 110), page, font=body_font, fill=FOREGROUND, spacing=10)
+        save(image, index, len(page))
+    return slides
+
+
+def audio_duration(path: str) -> float:
+    """Reads the duration from ffmpeg's stream info (no decoding)."""
+    probe = subprocess.run([ffmpeg_exe(), "-hide_banner", "-i", path], capture_output=True, text=True)
+    match = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", probe.stderr)
+    if not match:
+        raise RuntimeError(f"Could not read audio duration of {path}")
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def encode_stills(slides: List[Tuple[str, int]], audio_path: str, output_path: str, fps: float = None) -> str:
+    """
+    Encodes still slides over the narration with ffmpeg's concat demuxer.
+
+    Each slide is held for its share of the audio at a low frame rate, x264 is
+    tuned for still images, and MP3/AAC narration is stream-copied.
+    """
+    fps = fps or Config.VIDEO_STILL_FPS
+    duration = audio_duration(audio_path)
+    total_weight = sum(weight for _, weight in slides) or 1
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as playlist:
+        for path, weight in slides:
+            playlist.write(f"file '{os.path.abspath(path)}'\n")
+            playlist.write(f"duration {duration * weight / total_weight:.3f}\n")
+        # The concat demuxer ignores the last entry's duration unless the file is repeated
+        playlist.write(f"file '{os.path.abspath(slides[-1][0])}'\n")
+
+    copy_audio = audio_path.lower().endswith(MP4_AUDIO_COPY)
+    command = [
+        ffmpeg_exe(), "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "concat", "-safe", "0", "-i", playlist.name,
+        "-i", audio_path,
+        "-map", "0:v", "-map", "1:a",
+        "-c:v", "libx264", "-tune", "stillimage", "-preset", Config.VIDEO_PRESET,
+        "-r", str(fps), "-pix_fmt", "yuv420p",
+        "-c:a", "copy" if copy_audio else "aac",
+        "-shortest", "-movflags", "+faststart",
+        output_path,
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {result.stderr.strip()[-500:]}")
+    finally:
+        os.remove(playlist.name)
+    return output_path
@@ -1,6 +1,15 @@
+import atexit
+import hashlib
 import os
-import soundfile as sf
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import soundfile as sf
+
+from ..utils.config import Config
 
 # Try importing kokoro-onnx, handle missing dep gracefully
 try:
@@ -8,41 +17,185 @@ try:
 except ImportError:
     Kokoro = None
 
+SENTENCE_END = re.compile(r"(?<=[.!?;:])\s+|\n+")
+PAUSE_SECONDS = 0.12 # Silence between sentences
+
+# One warm Kokoro session per synthesis worker process
+_worker_kokoro = None
+
+
+def split_sentences(text: str, max_chars: int = 300, min_chars: int = 40) -> List[str]:
+    """
+    Splits narration into sentences for synthesis. Fragments shorter than
+    `min_chars` are merged forward; over-long sentences are split on commas,
+    then on word boundaries, to stay under `max_chars`.
+    """
+    sentences, pending = [], ""
+    for part in SENTENCE_END.split(text):
+        part = part.strip().lstrip("#*- ").strip()
+        if not part:
+            continue
+        pending = f"{pending} {part}".strip() if pending else part
+        if len(pending) >= min_chars:
+            sentences.extend(_split_long(pending, max_chars))
+            pending = ""
+    if pending:
+        sentences.extend(_split_long(pending, max_chars))
+    return sentences
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    if len(sentence) <= max_chars:
+        return [sentence]
+    pieces, current = [], ""
+    for word in re.split(r"(?<=,)\s+|\s+", sentence):
+        if current and len(current) + len(word) + 1 > max_chars:
+            pieces.append(current)
+            current = word
+        else:
+            current = f"{current} {word}".strip()
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _load_kokoro(model_path: str, voices_path: str, threads: int = 0):
+    if threads and hasattr(Kokoro, "from_session"):
+        # Cap intra-op threads so parallel workers don't oversubscribe the CPU
+        import onnxruntime
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        session = onnxruntime.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        return Kokoro.from_session(session, voices_path)
+    return Kokoro(model_path, voices_path)
+
+
+def _init_worker(model_path: str, voices_path: str, threads: int):
+    global _worker_kokoro
+    _worker_kokoro = _load_kokoro(model_path, voices_path, threads)
+
+
+def _synthesize(sentence: str, voice: str, speed: float) -> Tuple[np.ndarray, int]:
+    samples, sample_rate = _worker_kokoro.create(sentence, voice=voice, speed=speed)
+    return np.asarray(samples, dtype=np.float32), sample_rate
+
+
+class AudioCache:
+    """Per-sentence synthesized audio on disk, keyed by text, voice and speed."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    @staticmethod
+    def key(sentence: str, voice: str, speed: float) -> str:
+        return hashlib.sha256(f"{voice}|{speed}|{sentence}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[np.ndarray, int]]:
+        try:
+            with np.load(os.path.join(self.path, f"{key}.npz")) as data:
+                return data["samples"], int(data["rate"])
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def put(self, key: str, samples: np.ndarray, sample_rate: int):
+        tmp_path = os.path.join(self.path, f"{key}.{os.getpid()}.tmp.npz")
+        np.savez(tmp_path, samples=samples, rate=sample_rate)
+        os.replace(tmp_path, os.path.join(self.path, f"{key}.npz"))
+
+
 class TTSEngine:
-    def __init__(self, models_dir="models"):
+    """
+    Kokoro-82M narration. Text is split into sentences; cached sentences are
+    reused and the rest are synthesized in parallel, one warm ONNX session per
+    worker process, then concatenated in memory.
+    """
+
+    def __init__(self, models_dir="models", voice: str = None, speed: float = None, workers: int = None):
         self.models_dir = Path(models_dir)
+        self.model_path = self.models_dir / "kokoro-v0_19.onnx"
+        self.voices_path = self.models_dir / "voices.json" # Hypothetical voices config
+        self.voice = voice or Config.TTS_VOICE
+        self.speed = speed or Config.TTS_SPEED
+        self.workers = workers or Config.TTS_WORKERS
+        self.cache = AudioCache(Config.TTS_CACHE_DIR)
         self.kokoro = None
-        self._init_kokoro()
-
-    def _init_kokoro(self):
-        """Initialize Kokoro ONNX session if model exists."""
-        model_path = self.models_dir / "kokoro-v0_19.onnx"
-        voices_path = self.models_dir / "voices.json" # Hypothetical voices config
-        
-        if Kokoro and model_path.exists():
-            try:
-                # In real usage, you'd download voices.json too. 
-                # passing model path. 
-                self.kokoro = Kokoro(str(model_path), str(voices_path)) 
-                print("[TTS] Kokoro-82M High-Fidelity Engine Initialized.")
-            except Exception as e:
-                print(f"[TTS] Kokoro Init Failed (Fallback inactive): {e}")
+        self._pool = None
+
+    @property
+    def available(self) -> bool:
+        # Checked per call: the model may still be downloading when the engine is built
+        return bool(Kokoro) and self.model_path.exists()
+
+    def synthesize(self, text: str) -> Tuple[np.ndarray, int]:
+        """Returns (samples, sample_rate) for the whole narration."""
+        sentences = split_sentences(text)
+        if not sentences:
+            raise ValueError("Nothing to narrate.")
+        keys = [AudioCache.key(sentence, self.voice, self.speed) for sentence in sentences]
+        audio = [self.cache.get(key) for key in keys]
+        missing = [i for i, clip in enumerate(audio) if clip is None]
+        print(f"[TTS] Kokoro: {len(sentences)} sentence(s), {len(sentences) - len(missing)} cached, "
+              f"{len(missing)} to synthesize.")
+
+        if missing:
+            # Repeated sentences are synthesized once
+            todo = {keys[i]: sentences[i] for i in missing}
+            if self.workers > 1 and len(todo) > 1:
+                results = self._get_pool().map(_synthesize, todo.values(),
+                                               [self.voice] * len(todo), [self.speed] * len(todo))
+            else:
+                kokoro = self._get_kokoro()
+                results = (kokoro.create(sentence, voice=self.voice, speed=self.speed) for sentence in todo.values())
+            synthesized = {}
+            for key, (samples, sample_rate) in zip(todo, results):
+                synthesized[key] = (np.asarray(samples, dtype=np.float32), sample_rate)
+                self.cache.put(key, *synthesized[key])
+            for i in missing:
+                audio[i] = synthesized[keys[i]]
+
+        sample_rate = audio[0][1]
+        pause = np.zeros(int(sample_rate * PAUSE_SECONDS), dtype=np.float32)
+        pieces = []
+        for samples, _ in audio:
+            pieces.extend((samples, pause))
+        return np.concatenate(pieces[:-1]), sample_rate
 
     def generate_audio(self, text: str, output_path: str) -> bool:
         """
-        Generates audio using Kokoro if available, otherwise returns False 
+        Generates audio using Kokoro if available, otherwise returns False
         (VideoGenerator should then try ElevenLabs/LocalAI).
         """
-        if self.kokoro:
-            try:
-                # Generate audio (returns numpy array, sample_rate)
-                # Using a default voice style "af_sarah" or similar
-                audio, sample_rate = self.kokoro.create(text, voice="af_sarah", speed=1.0)
-                
-                # Save to file
-                sf.write(output_path, audio, sample_rate)
-                return True
-            except Exception as e:
-                print(f"[TTS] Kokoro Generation Error: {e}")
-                return False
-        return False
+        if not self.available:
+            return False
+        try:
+            samples, sample_rate = self.synthesize(text)
+            sf.write(output_path, samples, sample_rate)
+            return True
+        except Exception as e:
+            print(f"[TTS] Kokoro Generation Error: {e}")
+            return False
+
+    def close(self):
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _get_kokoro(self):
+        if self.kokoro is None:
+            self.kokoro = _load_kokoro(str(self.model_path), str(self.voices_path))
+            print("[TTS] Kokoro-82M High-Fidelity Engine Initialized.")
+        return self.kokoro
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            threads = max(1, (os.cpu_count() or 1) // self.workers)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(str(self.model_path), str(self.voices_path), threads),
+            )
+            # Engines live as long as their (artifact worker) process; stop the synthesis workers with it
+            atexit.register(self.close)
+            print(f"[TTS] Kokoro-82M: {self.workers} synthesis worker(s) warming up.")
+        return self._pool